@@ -1,77 +1,61 @@
-from typing import List
+import sys
+from array import array
+from itertools import accumulate
+from typing import List, Tuple, Optional, Set
 
-from graphics.figures import BaseFigure, AbstractFigure
+from graphics.cache import figure_cache
+from graphics.figures import AbstractFigure
 from graphics.help_functions import avg, cyclic_pare_iter
-from graphics.polygons import RegularPolygon, Triangle, Rectangle, BasePolygon
-from graphics.types import Point3D
+from graphics.memory import MemoryUsage, object_size
+from graphics.mesh import Mesh, VERTEX_TYPECODE
+from graphics.polygons import Rectangle, BasePolygon
+from graphics.occlusion import Occluder
+from graphics.revolution import revolve, cone_profile, cylinder_profile, tiered_profile, inscribed_cylinders
+from graphics.subdivision import midpoint_split, centroid_fan, strip_split
+from graphics.types import Point3D, Matrix
 
+Coords = Tuple[float, float, float]
 
-class Cone(BaseFigure):
-    SIDES_COUNT = 10
-
-    def __init__(self, base_center: Point3D, radius: float, height: float, levels_count: int = 0):
-
-        base = RegularPolygon(base_center, radius, Cone.SIDES_COUNT)
-
-        levels_polygons, current_level = self._get_levels_polygons(
-            base.copy(), base_center.copy(), levels_count, height, radius
-        )
-
-        high = Point3D(base_center.x, base_center.y + height, base_center.z)
-
-        center = ((high.x - base_center.x) / 2, (high.y - base_center.y) / 2, (high.y - base_center.y) / 2,)
 
-        super().__init__(
-            # Треугольники основания
-            self._split_polygon_to_triangles_by_point(base, base_center) +
+class Cone(Mesh):
+    """
+    Конус с закрытым основанием. Боковая поверхность разбита на уровни,
+    на каждом из которых радиус уменьшается вдвое.
+    """
 
-            # Четрырехугольники промежуточных уровней
-            levels_polygons +
-
-            # Треугольники верхушки
-            self._split_polygon_to_triangles_by_point(current_level, high),
-            center
-        )
-
-    @staticmethod
-    def _get_levels_polygons(current_level: RegularPolygon, current_center: Point3D,
-                             levels_count: int, height: float, radius: float) -> List[BasePolygon]:
+    SIDES_COUNT = 10
 
-        levels_polygons = []
+    def __init__(self, base_center: Point3D, radius: float, height: float, levels_count: int = 0,
+                 sides_count: int = SIDES_COUNT):
+        profile = cone_profile(radius, height, levels_count)
+        mesh = revolve(profile, sides_count, base_center)
+        super().__init__(mesh.vertices, mesh.faces, mesh.face_starts, mesh.center)
+        self._occluders = inscribed_cylinders(profile, base_center)
 
-        current_radius = radius
-        height_increment = height / (levels_count + 1)
 
-        for _ in range(levels_count):
-            current_center.y += height_increment
-            current_radius /= 2
-            new_level = RegularPolygon(current_center, current_radius, Cone.SIDES_COUNT)
+class Cylinder(Mesh):
+    """Цилиндр с закрытыми основаниями"""
 
-            for j1, j2 in cyclic_pare_iter(range(Cone.SIDES_COUNT)):
-                levels_polygons.append(BasePolygon([
-                    current_level.points[j1], new_level.points[j1],
-                    new_level.points[j2], current_level.points[j2]
-                ]))
+    SIDES_COUNT = 16
 
-            current_level = new_level
+    def __init__(self, base_center: Point3D, radius: float, height: float, sides_count: int = SIDES_COUNT):
+        profile = cylinder_profile(radius, height)
+        mesh = revolve(profile, sides_count, base_center)
+        super().__init__(mesh.vertices, mesh.faces, mesh.face_starts, mesh.center)
+        self._occluders = inscribed_cylinders(profile, base_center)
 
-        return levels_polygons, current_level
 
-    @staticmethod
-    def _split_polygon_to_triangles_by_point(polygon: BasePolygon, split_point: Point3D) -> List[Triangle]:
-        """
-        Разбивает многоугольник на треугольники по его вершинам. Каждые две соседние
-        вершины многоугольника соединяются с точкой разбиения, образуя треугольник.
+class TieredCone(Mesh):
+    """Ярусная крона: поставленные друг на друга усеченные конусы"""
 
-        :param polygon: Разбиваемый многоугольник.
-        :param split_point: Точка разбиения.
-        :return: Массив треугольников
-        """
+    SIDES_COUNT = 16
 
-        return [
-            Triangle(p_cur, p_next, split_point)
-            for p_cur, p_next in cyclic_pare_iter(polygon.points)
-        ]
+    def __init__(self, base_center: Point3D, radius: float, height: float, tiers_count: int = 3,
+                 sides_count: int = SIDES_COUNT):
+        profile = tiered_profile(radius, height, tiers_count)
+        mesh = revolve(profile, sides_count, base_center)
+        super().__init__(mesh.vertices, mesh.faces, mesh.face_starts, mesh.center)
+        self._occluders = inscribed_cylinders(profile, base_center)
 
 
 class Parrallelepiped(AbstractFigure):
@@ -90,8 +74,8 @@ class Parrallelepiped(AbstractFigure):
             for point in points_bottom
         ]
 
-        self.__top = Rectangle(*points_top)
-        self.__bottom = Rectangle(*points_bottom)
+        self.__top = Rectangle(*points_top, False)
+        self.__bottom = Rectangle(*points_bottom, False)
         self.__side_faces = [
             Rectangle(
                 self.top.points[i_cur], self.top.points[i_next],
@@ -120,133 +104,150 @@ class Parrallelepiped(AbstractFigure):
         return [self.bottom, self.top] + self.side_faces
 
 
-class Leg(AbstractFigure):
-    def __init__(self, center: Point3D, height: float):
+class Leg(Mesh):
+    """
+    Ножка ели из трех сужающихся кверху параллелепипедов.
+    Основание, стенки и переходы между параллелепипедами дополнительно разбиты
+    на мелкие многоугольники.
+    """
+
+    SIDE_STRIPS_COUNT = 12
+    BASE_SPLIT_DEPTH = 3
+
+    def __init__(self, center: Point3D, height: float, detail: int = 0):
+        """
+        :param detail: Количество дополнительных проходов разбиения по серединам ребер
+        всех многоугольников ножки (для крупных планов).
+        """
+
         h_6 = height / 6
         h_3 = height / 3
         h_12 = height / 12
 
-        parrallelepipeds = [
-            Parrallelepiped(center, dx=height, dz=height, height=h_6),
-            Parrallelepiped(
-                Point3D(center.x, center.y + h_6, center.z),
-                dx=h_3, dz=h_3, height=height / 2
-            ),
-            Parrallelepiped(
-                Point3D(center.x, center.y + 2 * height / 3, center.z),
-                dx=h_12, dz=h_12, height=h_3
-            )
+        boxes = [
+            Leg.__box(center, dx=height, dz=height, height=h_6),
+            Leg.__box(Point3D(center.x, center.y + h_6, center.z), dx=h_3, dz=h_3, height=height / 2),
+            Leg.__box(Point3D(center.x, center.y + 2 * height / 3, center.z), dx=h_12, dz=h_12, height=h_3),
         ]
 
-        self.__center = center
-        self.__levels = self.__create_levels(parrallelepipeds)
-
-    @property
-    def center(self) -> Point3D:
-        return self.__center
+        parts = []
 
-    @property
-    def polygons(self) -> List[BasePolygon]:
-        result: List[BasePolygon] = []
+        for i, (bottom, top) in enumerate(boxes):
+            if i > 0:
+                parts.append(Leg.__polygons_mesh(bottom, [[0, 1, 2, 3]]))
 
-        for level in self.__levels:
-            for polygon in level.polygons:
-                result.append(polygon)
+            if i + 1 < len(boxes):
+                parts.append(centroid_fan(Leg.__level_top(top, boxes[i + 1][0])))
+                # Разделить "стенки" на маленькие части
+                parts.append(strip_split(Leg.__side_faces(bottom, top), self.SIDE_STRIPS_COUNT))
+            else:
+                parts.append(Leg.__side_faces(bottom, top))
 
-        return result
+            if i == 0:
+                # Разбиение основания на маленькие квадратики
+                base = Leg.__polygons_mesh(bottom, [[0, 1, 2, 3]])
+                parts.append(midpoint_split(base, self.BASE_SPLIT_DEPTH))
 
-    @staticmethod
-    def __create_levels(parrallelepipeds: List[Parrallelepiped]) -> List[BaseFigure]:
-        levels = []
-
-        for i in range(len(parrallelepipeds) - 1):
-            level_top = Leg.__create_level_top(parrallelepipeds[i].top, parrallelepipeds[i + 1].bottom)
-
-            # Разделить "стенки" основания на маленькие части
-            splitted_side_faces = []
-            for side_face in parrallelepipeds[i].side_faces:
-                for splited_side_face in side_face.split(12):
-                    splitted_side_faces.append(splited_side_face)
-
-            level_polygons = [
-                parrallelepipeds[i].bottom,
-                *level_top,
-                *splitted_side_faces
-            ]
+        mesh = midpoint_split(Mesh.concatenate(parts, center.copy()), detail)
 
-            level_center = avg([parrallelepipeds[i].top.center, parrallelepipeds[i + 1].bottom.center])
-            levels.append(BaseFigure(level_polygons, level_center))
+        super().__init__(mesh.vertices, mesh.faces, mesh.face_starts, center.copy())
+        self._occluders = Leg.inscribed_cylinders(center, height)
 
-        last_level_center = avg([parrallelepipeds[-1].bottom.center, parrallelepipeds[-1].top.center])
-        levels.append(BaseFigure([
-            parrallelepipeds[-1].bottom, *parrallelepipeds[-1].side_faces
-        ], last_level_center))
+    @staticmethod
+    def inscribed_cylinders(center: Point3D, height: float) -> List[Occluder]:
+        """Цилиндры, вписанные в параллелепипеды ножки с центром основания center и высотой height"""
 
-        # Разбиение основания на маленькие квадратики
-        base = levels[0].polygons.pop(0)
-        for rect in Leg._split_square(base):
-            for sub_rect in Leg._split_square(rect):
-                for sub_sub_rect in Leg._split_square(sub_rect):
-                    levels[0].polygons.append(sub_sub_rect)
+        # Высоты оснований и половины ширины параллелепипедов, как в конструкторе
+        boxes = [(0, height / 6, height), (height / 6, 2 * height / 3, height / 3), (2 * height / 3, height, height / 12)]
 
-        return levels
+        return [
+            Occluder(
+                Point3D(center.x, center.y + bottom, center.z),
+                Point3D(center.x, center.y + top, center.z),
+                radius
+            )
+            for bottom, top, radius in boxes
+        ]
 
     @staticmethod
-    def _split_square(square: BasePolygon) -> List[BasePolygon]:
-        l = square.points[0].distance_between(square.points[1]) / 2
-        halfs = [
-            Point3D(square.center.x, square.center.y, square.center.z + l),
-            Point3D(square.center.x + l, square.center.y, square.center.z + l),
-            Point3D(square.center.x + l, square.center.y, square.center.z),
-            Point3D(square.center.x + l, square.center.y, square.center.z - l),
-            Point3D(square.center.x, square.center.y, square.center.z - l),
-            Point3D(square.center.x - l, square.center.y, square.center.z - l),
-            Point3D(square.center.x - l, square.center.y, square.center.z),
-            Point3D(square.center.x - l, square.center.y, square.center.z + l),
+    def __box(center: Point3D, dx: float, height: float, dz: float) -> Tuple[List[Coords], List[Coords]]:
+        """Вершины нижней и верхней граней параллелепипеда в порядке обхода"""
+
+        bottom = [
+            (center.x + dx, center.y, center.z - dz),
+            (center.x - dx, center.y, center.z - dz),
+            (center.x - dx, center.y, center.z + dz),
+            (center.x + dx, center.y, center.z + dz),
         ]
 
-        a = []
+        return bottom, [(x, y + height, z) for x, y, z in bottom]
+
+    @staticmethod
+    def __polygons_mesh(points: List[Coords], faces: List[List[int]]) -> Mesh:
+        vertices = array(VERTEX_TYPECODE)
 
-        for i in range(0, len(halfs), 2):
-            last_i = i + 2 if i != len(halfs) - 2 else 0
-            a.append(BasePolygon([
-                halfs[i], halfs[i + 1], halfs[last_i], square.center
-            ]))
+        for point in points:
+            vertices.extend(point)
 
-        return a
+        return Mesh(vertices, [i for face in faces for i in face], accumulate((len(face) for face in faces), initial=0))
 
     @staticmethod
-    def __create_level_top(top: BasePolygon, bottom: BasePolygon) -> List[Triangle]:
-        polygons = []
-
-        for cur_i, next_i in cyclic_pare_iter(range(len(top.points))):
+    def __side_faces(bottom: List[Coords], top: List[Coords]) -> Mesh:
+        return Leg.__polygons_mesh(bottom + top, [
+            [4 + cur_i, cur_i, next_i, 4 + next_i]
+            for cur_i, next_i in cyclic_pare_iter(range(4))
+        ])
 
-            top_center = (top.points[cur_i] + top.points[next_i]) / 2
+    @staticmethod
+    def __level_top(top: List[Coords], bottom: List[Coords]) -> Mesh:
+        """Переход от верхней грани параллелепипеда к нижней грани следующего"""
 
-            polygons += Triangle(top.points[cur_i], bottom.points[cur_i], top_center).split()
-            polygons += Triangle(bottom.points[cur_i], top_center, bottom.points[next_i]).split()
-            polygons += Triangle(top_center, bottom.points[next_i], top.points[next_i]).split()
+        middles = [
+            tuple((a + b) / 2 for a, b in zip(top[cur_i], top[next_i]))
+            for cur_i, next_i in cyclic_pare_iter(range(4))
+        ]
+        faces = []
+
+        # Вершины: 0-3 - верхняя грань, 4-7 - нижняя грань следующего, 8-11 - середины ребер верхней грани
+        for cur_i, next_i in cyclic_pare_iter(range(4)):
+            faces += [
+                [cur_i, 4 + cur_i, 8 + cur_i],
+                [4 + cur_i, 8 + cur_i, 4 + next_i],
+                [8 + cur_i, 4 + next_i, next_i],
+            ]
 
-        return polygons
+        return Leg.__polygons_mesh(top + bottom + middles, faces)
 
 
 class Spruce(AbstractFigure):
-    def __init__(self, center: Point3D, height: float, radius: float, levels: int):
+    """
+    Ель, состоящая из кроны-конуса и ножки.
+    Геометрия частей берется из общего кэша фигур, поэтому одинаковые ели не строятся заново.
+    """
+
+    def __init__(self, center: Point3D, height: float, radius: float, levels: int,
+                 sides_count: int = Cone.SIDES_COUNT):
         self.__center = center
-        self.__cone = Cone(center, radius, height, levels)
+        self.__cone = figure_cache.get(Cone, center, radius, height, levels, sides_count)
 
         leg_center = center.copy()
         leg_height = height / 4
         leg_center.y -= leg_height
 
-        self.__leg = Leg(leg_center, leg_height)
+        self.__leg = figure_cache.get(Leg, leg_center, leg_height)
+
+        # Сетки из кэша не хранят вписанных цилиндров, поэтому они строятся по параметрам ели
+        self.__occluders = (
+            inscribed_cylinders(cone_profile(radius, height, levels), center),
+            Leg.inscribed_cylinders(leg_center, leg_height)
+        )
 
     @property
-    def cone(self) -> Cone:
+    def cone(self) -> Mesh:
         return self.__cone
 
     @property
-    def leg(self) -> Leg:
+    def leg(self) -> Mesh:
         return self.__leg
 
     @property
@@ -256,3 +257,40 @@ class Spruce(AbstractFigure):
     @property
     def polygons(self) -> List[BasePolygon]:
         return self.__cone.polygons + self.__leg.polygons
+
+    def occluders(self) -> List[Occluder]:
+        return self.__occluders[0] + self.__occluders[1]
+
+    def part_occluders(self) -> Tuple[List[Occluder], List[Occluder]]:
+        """Вписанные цилиндры кроны и ножки по отдельности"""
+
+        return self.__occluders
+
+    def apply_affine(self, affine_matrix: Matrix):
+        self.__cone.apply_affine(affine_matrix)
+        self.__leg.apply_affine(affine_matrix)
+        self.__center = self.__center.apply_modification(affine_matrix)
+        self.__occluders = ([], [])
+
+    def memory_usage(self, seen: Optional[Set[int]] = None) -> MemoryUsage:
+        if seen is None:
+            seen = set()
+
+        own = MemoryUsage(polygons=object_size(self.__center, seen), caches=object_size(self.__occluders, seen))
+
+        if id(self) not in seen:
+            seen.add(id(self))
+            own += MemoryUsage(polygons=sys.getsizeof(self) + sys.getsizeof(self.__dict__))
+
+        return self.__cone.memory_usage(seen) + self.__leg.memory_usage(seen) + own
+
+    def snapshot(self) -> 'Spruce':
+        """Снимок ели из снимков ее частей. Вершины частей не копируются"""
+
+        snapshot = Spruce.__new__(Spruce)
+        snapshot.__center = self.__center.copy()
+        snapshot.__cone = self.__cone.snapshot()
+        snapshot.__leg = self.__leg.snapshot()
+        snapshot.__occluders = (list(self.__occluders[0]), list(self.__occluders[1]))
+
+        return snapshot
@@ -0,0 +1,259 @@
+"""
+Модуль реализующий необязательное ускорение вычислительных ядер.
+
+Если установлен Numba, ядра преобразования координат, центральной проекции,
+вычисления центров многоугольников переменной длины и построения списка ребер
+компилируются JIT-компилятором. Иначе используются реализации на чистом Python
+с теми же результатами. Ядра работают с плоскими массивами array,
+которые Numba принимает через протокол буфера.
+
+Ускорение можно отключить переменной окружения CG4_DISABLE_JIT=1.
+"""
+
+import os
+from array import array
+from typing import Sequence, Optional
+
+from graphics import affine, projections
+from graphics.projections import SCREEN_AXES
+from graphics.types import Matrix, Axle
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+JIT_ENABLED = numba is not None and os.environ.get('CG4_DISABLE_JIT') != '1'
+"""Используются ли JIT-компилированные ядра"""
+
+
+# ---------------------------------------------------------------- Реализации на чистом Python
+
+
+def _face_depths_python(coords: Sequence[float], faces: Sequence[int], face_starts: Sequence[int],
+                        axis: int, out: array) -> array:
+    for i in range(len(face_starts) - 1):
+        start, end = face_starts[i], face_starts[i + 1]
+        s = 0
+
+        for j in range(start, end):
+            s += coords[3 * faces[j] + axis]
+
+        out[i] = s / (end - start)
+
+    return out
+
+
+def _face_centroids_python(coords: Sequence[float], faces: Sequence[int], face_starts: Sequence[int],
+                           out: array) -> array:
+    for i in range(len(face_starts) - 1):
+        start, end = face_starts[i], face_starts[i + 1]
+        sx = sy = sz = 0
+
+        for j in range(start, end):
+            k = 3 * faces[j]
+            sx += coords[k]
+            sy += coords[k + 1]
+            sz += coords[k + 2]
+
+        n = end - start
+        out[3 * i], out[3 * i + 1], out[3 * i + 2] = sx / n, sy / n, sz / n
+
+    return out
+
+
+def _unique_edges_python(faces: Sequence[int], face_starts: Sequence[int]) -> array:
+    edges = array('i')
+    seen = set()
+
+    for i in range(len(face_starts) - 1):
+        start, end = face_starts[i], face_starts[i + 1]
+
+        for j in range(start, end):
+            a = faces[j]
+            b = faces[j + 1] if j + 1 < end else faces[start]
+            key = (a, b) if a < b else (b, a)
+
+            if a != b and key not in seen:
+                seen.add(key)
+                edges.extend(key)
+
+    return edges
+
+
+# ---------------------------------------------------------------- JIT-компилированные ядра
+
+
+if JIT_ENABLED:
+    @numba.njit(cache=True)
+    def _transform_jit(m, coords, out):
+        is_affine = m[12] == 0 and m[13] == 0 and m[14] == 0 and m[15] == 1
+
+        for i in range(0, len(coords), 3):
+            x, y, z = coords[i], coords[i + 1], coords[i + 2]
+            w = 1.0 if is_affine else m[12] * x + m[13] * y + m[14] * z + m[15]
+
+            out[i] = (m[0] * x + m[1] * y + m[2] * z + m[3]) / w
+            out[i + 1] = (m[4] * x + m[5] * y + m[6] * z + m[7]) / w
+            out[i + 2] = (m[8] * x + m[9] * y + m[10] * z + m[11]) / w
+
+    @numba.njit(cache=True)
+    def _central_jit(coords, u, v, depth, k, out):
+        for i in range(len(coords) // 3):
+            w = 1 / (1 + coords[3 * i + depth] * k)
+            out[2 * i] = coords[3 * i + u] * w
+            out[2 * i + 1] = -coords[3 * i + v] * w
+
+    @numba.njit(cache=True)
+    def _face_depths_jit(coords, faces, face_starts, axis, out):
+        for i in range(len(face_starts) - 1):
+            start, end = face_starts[i], face_starts[i + 1]
+            s = 0.0
+
+            for j in range(start, end):
+                s += coords[3 * faces[j] + axis]
+
+            out[i] = s / (end - start)
+
+    @numba.njit(cache=True)
+    def _face_centroids_jit(coords, faces, face_starts, out):
+        for i in range(len(face_starts) - 1):
+            start, end = face_starts[i], face_starts[i + 1]
+            sx = sy = sz = 0.0
+
+            for j in range(start, end):
+                k = 3 * faces[j]
+                sx += coords[k]
+                sy += coords[k + 1]
+                sz += coords[k + 2]
+
+            n = end - start
+            out[3 * i] = sx / n
+            out[3 * i + 1] = sy / n
+            out[3 * i + 2] = sz / n
+
+    @numba.njit(cache=True)
+    def _unique_edges_jit(faces, face_starts, out):
+        """Записывает ребра в out (не менее 2 * len(faces) элементов), возвращает их количество"""
+
+        seen = set()
+        seen.add(numba.int64(-1))
+        count = 0
+
+        for i in range(len(face_starts) - 1):
+            start, end = face_starts[i], face_starts[i + 1]
+
+            for j in range(start, end):
+                a = faces[j]
+                b = faces[j + 1] if j + 1 < end else faces[start]
+
+                if a > b:
+                    a, b = b, a
+
+                key = numba.int64(a) << 32 | numba.int64(b)
+
+                if a != b and key not in seen:
+                    seen.add(key)
+                    out[2 * count] = a
+                    out[2 * count + 1] = b
+                    count += 1
+
+        return count
+
+
+def _as_array(values: Sequence, typecode: str) -> array:
+    """Numba принимает только объекты с протоколом буфера, поэтому списки копируются в array"""
+
+    if isinstance(values, array) and values.typecode == typecode \
+            or isinstance(values, memoryview) and values.format == typecode:
+        return values
+
+    return array(typecode, values)
+
+
+# ---------------------------------------------------------------- Ядра
+
+
+def transform_coords(affine_matrix: Matrix, coords: Sequence[float], out: Optional[array] = None) -> array:
+    """То же, что graphics.affine.transform_coords"""
+
+    if not JIT_ENABLED:
+        return affine.transform_coords(affine_matrix, coords, out)
+
+    if out is None:
+        out = array('d', bytes(8 * len(coords)))
+
+    m = array('d', [affine_matrix[i][j] for i in range(Matrix.N) for j in range(Matrix.N)])
+    _transform_jit(m, _as_array(coords, 'd'), out)
+
+    return out
+
+
+def central_coords(coords: Sequence[float], axle: Axle, distance_from_screen: float,
+                   out: Optional[array] = None) -> array:
+    """То же, что graphics.projections.central_coords"""
+
+    if not JIT_ENABLED:
+        return projections.central_coords(coords, axle, distance_from_screen, out)
+
+    u, v, depth = SCREEN_AXES[axle]
+
+    if out is None:
+        out = array('d', bytes(8 * (len(coords) // 3 * 2)))
+
+    _central_jit(_as_array(coords, 'd'), u, v, depth, 1 / distance_from_screen, out)
+
+    return out
+
+
+def face_depths(coords: Sequence[float], faces: Sequence[int], face_starts: Sequence[int],
+                axis: int, out: Optional[array] = None) -> array:
+    """
+    Координата центров многоугольников вдоль оси axis.
+
+    :param coords: Плоский массив координат вершин.
+    :param faces: Плоский массив индексов вершин многоугольников.
+    :param face_starts: Смещения многоугольников в массиве faces.
+    :param axis: Номер координаты (0 - x, 1 - y, 2 - z).
+    :param out: Массив для записи результата.
+    """
+
+    if out is None:
+        out = array('d', bytes(8 * (len(face_starts) - 1)))
+
+    if not JIT_ENABLED:
+        return _face_depths_python(coords, faces, face_starts, axis, out)
+
+    _face_depths_jit(_as_array(coords, 'd'), _as_array(faces, 'i'), _as_array(face_starts, 'i'), axis, out)
+
+    return out
+
+
+def face_centroids(coords: Sequence[float], faces: Sequence[int], face_starts: Sequence[int],
+                   out: Optional[array] = None) -> array:
+    """Плоский массив центров многоугольников (x0, y0, z0, x1, ...)"""
+
+    if out is None:
+        out = array('d', bytes(8 * 3 * (len(face_starts) - 1)))
+
+    if not JIT_ENABLED:
+        return _face_centroids_python(coords, faces, face_starts, out)
+
+    _face_centroids_jit(_as_array(coords, 'd'), _as_array(faces, 'i'), _as_array(face_starts, 'i'), out)
+
+    return out
+
+
+def unique_edges(faces: Sequence[int], face_starts: Sequence[int]) -> array:
+    """
+    Ребра многоугольников без повторений в виде плоского массива пар индексов
+    (a0, b0, a1, b1, ...), a < b, в порядке первого появления.
+    """
+
+    if not JIT_ENABLED:
+        return _unique_edges_python(faces, face_starts)
+
+    out = array('i', bytes(4 * 2 * len(faces)))
+    count = _unique_edges_jit(_as_array(faces, 'i'), _as_array(face_starts, 'i'), out)
+
+    return out[:2 * count]
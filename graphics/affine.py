@@ -2,8 +2,9 @@
 Модуль содержащий функции аффинных преобразований в пространстве.
 """
 
+from array import array
 from math import sin, radians, cos
-from typing import List
+from typing import List, Tuple, Sequence, Optional
 
 from graphics.types import Matrix, Axle
 
@@ -61,6 +62,32 @@ def reflection(axis: List[Axle]) -> Matrix:
     ])
 
 
+ROTATION_TABLE_RESOLUTION = 4
+"""Количество шагов таблицы синусов и косинусов на один градус"""
+
+_SIN_COS_TABLE: List[Tuple[float, float]] = [
+    (sin(radians(i / ROTATION_TABLE_RESOLUTION)), cos(radians(i / ROTATION_TABLE_RESOLUTION)))
+    for i in range(360 * ROTATION_TABLE_RESOLUTION)
+]
+
+
+def sin_cos(angle_in_degrees: float) -> Tuple[float, float]:
+    """
+    Возвращает синус и косинус угла.
+    Для углов, кратных шагу таблицы (в том числе для целых градусов), значения берутся из таблицы.
+
+    :param angle_in_degrees: угол в градусах
+    """
+
+    steps = angle_in_degrees * ROTATION_TABLE_RESOLUTION
+
+    if float(steps).is_integer():
+        return _SIN_COS_TABLE[int(steps) % len(_SIN_COS_TABLE)]
+
+    angle_in_radians = radians(angle_in_degrees)
+    return sin(angle_in_radians), cos(angle_in_radians)
+
+
 def rotate(angle_in_degrees: float, axle: Axle) -> Matrix:
     """
     Возвращает матрицу поворота
@@ -69,30 +96,84 @@ def rotate(angle_in_degrees: float, axle: Axle) -> Matrix:
     :param axle: ось поворота
     """
 
-    def extend_matrix(arr: List[List[float]], i: int):
-        arr.insert(i, [0, 0])
+    sin_value, cos_value = sin_cos(angle_in_degrees)
+
+    match axle:
+        case 'x':
+            return Matrix([
+                [1, 0, 0, 0],
+                [0, cos_value, -sin_value, 0],
+                [0, sin_value, cos_value, 0],
+                [0, 0, 0, 1]
+            ])
+        case 'y':
+            return Matrix([
+                [cos_value, 0, -sin_value, 0],
+                [0, 1, 0, 0],
+                [sin_value, 0, cos_value, 0],
+                [0, 0, 0, 1]
+            ])
+        case 'z':
+            return Matrix([
+                [cos_value, -sin_value, 0, 0],
+                [sin_value, cos_value, 0, 0],
+                [0, 0, 1, 0],
+                [0, 0, 0, 1]
+            ])
+        case _:
+            raise ValueError(f"Неизвестная ось {axle}!")
+
+
+def rotate_xy_scale(x_angle_in_degrees: float, y_angle_in_degrees: float, k: float = 1) -> Matrix:
+    """
+    Возвращает матрицу rotate(x_angle, 'x') * rotate(y_angle, 'y') * scaling(k, k, k),
+    построенную без перемножения матриц.
 
-        for row in arr:
-            row.insert(i, 0)
+    :param x_angle_in_degrees: угол поворота относительно оси X
+    :param y_angle_in_degrees: угол поворота относительно оси Y
+    :param k: коэффициент масштабирования
+    """
 
-        arr[i][i] = 1
+    sin_x, cos_x = sin_cos(x_angle_in_degrees)
+    sin_y, cos_y = sin_cos(y_angle_in_degrees)
 
-    angle_in_radians = radians(angle_in_degrees)
-    cos_value = cos(angle_in_radians)
-    sin_value = sin(angle_in_radians)
+    return Matrix([
+        [k * cos_y, 0, -k * sin_y, 0],
+        [-k * sin_x * sin_y, k * cos_x, -k * sin_x * cos_y, 0],
+        [k * cos_x * sin_y, k * sin_x, k * cos_x * cos_y, 0],
+        [0, 0, 0, 1]
+    ])
+
+
+def transform_coords(affine_matrix: Matrix, coords: Sequence[float], out: Optional[array] = None) -> array:
+    """
+    Применяет матрицу преобразования к плоскому массиву координат точек (x0, y0, z0, x1, ...).
+
+    :param affine_matrix: матрица преобразования
+    :param coords: координаты точек
+    :param out: массив для записи результата, может совпадать с coords.
+    Если не задан, создается новый массив.
+    """
 
-    a = [
-        [cos_value, -sin_value],
-        [sin_value, cos_value]
-    ]
+    (a00, a01, a02, a03), (a10, a11, a12, a13), (a20, a21, a22, a23), (a30, a31, a32, a33) = \
+        [affine_matrix[i] for i in range(Matrix.N)]
 
-    help_i = 'xyz'.index(axle)
+    if out is None:
+        out = array('d', bytes(8 * len(coords)))
 
-    extend_matrix(a, help_i)
+    is_affine = a30 == 0 and a31 == 0 and a32 == 0 and a33 == 1
 
-    for row in a:
-        row.append(0)
+    for i in range(0, len(coords), 3):
+        x, y, z = coords[i], coords[i + 1], coords[i + 2]
 
-    a.append([0, 0, 0, 1])
+        if is_affine:
+            out[i] = a00 * x + a01 * y + a02 * z + a03
+            out[i + 1] = a10 * x + a11 * y + a12 * z + a13
+            out[i + 2] = a20 * x + a21 * y + a22 * z + a23
+        else:
+            w = a30 * x + a31 * y + a32 * z + a33
+            out[i] = (a00 * x + a01 * y + a02 * z + a03) / w
+            out[i + 1] = (a10 * x + a11 * y + a12 * z + a13) / w
+            out[i + 2] = (a20 * x + a21 * y + a22 * z + a23) / w
 
-    return Matrix(a)
+    return out
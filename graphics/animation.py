@@ -0,0 +1,198 @@
+"""
+Модуль реализующий анимацию преобразований по ключевым кадрам.
+
+Клип заранее вычисляет преобразование и его матрицу для каждого кадра,
+а проигрыватель выбирает кадр по реальному времени, пропуская кадры,
+если отрисовка не успевает за анимацией.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import List, Callable
+
+from graphics.transformation import Transformation
+from graphics.types import Matrix, Axle
+
+
+@dataclass
+class Keyframe:
+    """Ключевой кадр: состояние преобразования в момент времени time (в секундах)"""
+
+    time: float
+    transformation: Transformation
+
+
+class AnimationClip:
+    """Анимационный клип с заранее вычисленными кадрами"""
+
+    def __init__(self, keyframes: List[Keyframe], fps: float = 30, loop: bool = True):
+        """
+        :param keyframes: Ключевые кадры в любом порядке, не менее одного.
+        :param fps: Частота кадров клипа.
+        :param loop: Повторять ли клип. В зацикленном клипе последний ключевой кадр
+        совпадает с первым кадром следующего повтора и отдельно не хранится.
+        """
+
+        if not keyframes:
+            raise ValueError("Клип должен содержать хотя бы один ключевой кадр!")
+
+        if fps <= 0:
+            raise ValueError("Частота кадров должна быть положительной!")
+
+        self.__keyframes = sorted(keyframes, key=lambda keyframe: keyframe.time)
+        self.__fps = fps
+        self.__loop = loop
+
+        frames_count = round(self.duration * fps) + (0 if loop else 1)
+        self.__frames = [self.__evaluate(i / fps) for i in range(max(1, frames_count))]
+        self.__matrices = [frame.to_affine_matrix() for frame in self.__frames]
+
+    @staticmethod
+    def turntable(start: Transformation, duration: float, fps: float = 30,
+                  axle: Axle = 'y', turns: int = 1) -> 'AnimationClip':
+        """
+        Возвращает зацикленный клип равномерного вращения вокруг оси.
+
+        :param start: Начальное преобразование.
+        :param duration: Длительность одного оборота в секундах.
+        :param fps: Частота кадров клипа.
+        :param axle: Ось вращения.
+        :param turns: Количество оборотов (отрицательное - вращение в обратную сторону).
+        """
+
+        # Ключевые кадры через каждые 90 градусов, чтобы интерполяция шла по нужной дуге
+        steps = 4 * abs(turns)
+        step_angle = 90 if turns > 0 else -90
+        keyframes = [Keyframe(0, start.copy())]
+
+        for i in range(1, steps + 1):
+            transformation = keyframes[-1].transformation.copy()
+
+            match axle:
+                case 'x':
+                    transformation.increase_x_rotation(step_angle)
+                case 'y':
+                    transformation.increase_y_rotation(step_angle)
+                case 'z':
+                    transformation.increase_z_rotation(step_angle)
+
+            keyframes.append(Keyframe(duration * abs(turns) * i / steps, transformation))
+
+        return AnimationClip(keyframes, fps, loop=True)
+
+    @property
+    def fps(self) -> float:
+        return self.__fps
+
+    @property
+    def duration(self) -> float:
+        return self.__keyframes[-1].time - self.__keyframes[0].time
+
+    @property
+    def frames_count(self) -> int:
+        return len(self.__frames)
+
+    @property
+    def loop(self) -> bool:
+        return self.__loop
+
+    def frame(self, i: int) -> Transformation:
+        return self.__frames[i]
+
+    def matrix(self, i: int) -> Matrix:
+        return self.__matrices[i]
+
+    def frame_index(self, elapsed: float) -> int:
+        """
+        Возвращает номер кадра, соответствующий времени от начала клипа.
+
+        :param elapsed: Время от начала проигрывания в секундах.
+        """
+
+        i = int(elapsed * self.__fps)
+
+        if self.__loop:
+            return i % len(self.__frames)
+
+        return min(max(i, 0), len(self.__frames) - 1)
+
+    def __evaluate(self, t: float) -> Transformation:
+        keyframes = self.__keyframes
+        t += keyframes[0].time
+
+        for prev, current in zip(keyframes, keyframes[1:]):
+            if t <= current.time:
+                span = current.time - prev.time
+                k = (t - prev.time) / span if span > 0 else 1
+                return Transformation.interpolate(prev.transformation, current.transformation, k)
+
+        return keyframes[-1].transformation.copy()
+
+
+class AnimationPlayer:
+    """
+    Проигрыватель клипа. Номер кадра определяется по реальному времени,
+    поэтому скорость анимации не зависит от затрат на отрисовку.
+    """
+
+    def __init__(self, clip: AnimationClip, clock: Callable[[], float] = time.perf_counter):
+        self.__clip = clip
+        self.__clock = clock
+        self.__started_at = clock()
+        self.__paused_at = None
+        self.__last_index = None
+        self.dropped_frames = 0
+
+    @property
+    def clip(self) -> AnimationClip:
+        return self.__clip
+
+    @property
+    def is_playing(self) -> bool:
+        return self.__paused_at is None
+
+    def restart(self) -> None:
+        self.__started_at = self.__clock()
+        self.__paused_at = None
+        self.__last_index = None
+
+    def pause(self) -> None:
+        if self.__paused_at is None:
+            self.__paused_at = self.__clock()
+
+    def resume(self) -> None:
+        if self.__paused_at is not None:
+            self.__started_at += self.__clock() - self.__paused_at
+            self.__paused_at = None
+
+    @property
+    def elapsed(self) -> float:
+        now = self.__paused_at if self.__paused_at is not None else self.__clock()
+        return now - self.__started_at
+
+    def frame_index(self) -> int:
+        return self.__clip.frame_index(self.elapsed)
+
+    def current_frame(self) -> Transformation:
+        return self.__clip.frame(self.frame_index())
+
+    def apply(self, target: Transformation) -> bool:
+        """
+        Переносит поворот текущего кадра клипа в преобразование target.
+        Масштаб target не изменяется, поэтому его можно менять во время анимации.
+
+        :return: Изменился ли кадр с предыдущего вызова.
+        """
+
+        i = self.frame_index()
+
+        if i == self.__last_index:
+            return False
+
+        if self.__last_index is not None:
+            self.dropped_frames += max(0, (i - self.__last_index) % self.__clip.frames_count - 1)
+
+        self.__last_index = i
+        target.assign_rotation(self.__clip.frame(i))
+
+        return True
@@ -0,0 +1,373 @@
+"""
+Модуль реализующий BSP-дерево (дерево двоичного разбиения пространства) для статических фигур.
+
+Дерево строится один раз по многоугольникам фигуры, при необходимости разрезая их
+плоскостями других многоугольников. Обход дерева для любой точки наблюдения дает
+порядок многоугольников от дальних к ближним (порядок алгоритма художника)
+за линейное время и без сортировки на каждом кадре.
+"""
+
+from array import array
+from math import sqrt
+from typing import List, Sequence, Optional, Tuple, Dict
+
+from graphics.types import Point3D
+
+Plane = Tuple[float, float, float, float]
+
+
+class _Node:
+    __slots__ = ('plane', 'faces', 'front', 'back')
+
+    def __init__(self, plane: Plane, faces: List[int]):
+        self.plane = plane
+        self.faces = faces
+        self.front: Optional['_Node'] = None
+        self.back: Optional['_Node'] = None
+
+
+class BSPTree:
+    """BSP-дерево многоугольников, заданных индексами вершин"""
+
+    CANDIDATES_COUNT = 8
+    """Количество многоугольников, рассматриваемых при выборе разбивающей плоскости"""
+
+    def __init__(self, coords: Sequence[float], faces: Sequence[Sequence[int]], epsilon: float = 1e-6):
+        """
+        :param coords: Плоский массив координат вершин (x0, y0, z0, x1, ...).
+        :param faces: Многоугольники - последовательности индексов вершин.
+        :param epsilon: Допуск, в пределах которого точка считается лежащей на плоскости.
+        """
+
+        self.__vertices = array('d', coords)
+        self.__faces: List[Tuple[int, ...]] = []
+        self.__sources: List[int] = []
+        self.__outlines: List[Tuple[bool, ...]] = []
+        self.__epsilon = epsilon
+
+        for source, face in enumerate(faces):
+            face = tuple(face)
+            self.__add_face(face, source, (True,) * len(face))
+
+        self.__root = self.__build(list(range(len(self.__faces))))
+
+    @property
+    def vertices(self) -> array:
+        """Координаты вершин, включая вершины, появившиеся при разрезании многоугольников"""
+
+        return self.__vertices
+
+    @property
+    def faces(self) -> List[Tuple[int, ...]]:
+        """Многоугольники дерева (исходные и части разрезанных)"""
+
+        return self.__faces
+
+    @property
+    def sources(self) -> List[int]:
+        """Номер исходного многоугольника для каждого многоугольника дерева"""
+
+        return self.__sources
+
+    @property
+    def outlines(self) -> List[Tuple[bool, ...]]:
+        """
+        Для каждого многоугольника дерева - признаки того, что его ребро (от вершины j к j + 1)
+        лежит на границе исходного многоугольника. Ребра, появившиеся при разрезании,
+        лежат внутри исходного многоугольника, и их не нужно обводить.
+        """
+
+        return self.__outlines
+
+    def back_to_front(self, viewer: Point3D, at_infinity: bool = False,
+                      out: Optional[List[int]] = None) -> List[int]:
+        """
+        Возвращает номера многоугольников дерева в порядке от дальних к ближним.
+
+        :param viewer: Положение наблюдателя или, если at_infinity, направление на наблюдателя.
+        :param at_infinity: Находится ли наблюдатель в бесконечности (ортографическая проекция).
+        :param out: Список для записи результата.
+        """
+
+        result = out if out is not None else []
+        result.clear()
+
+        vx, vy, vz = viewer.x, viewer.y, viewer.z
+        w = 0 if at_infinity else 1
+
+        # Элемент стека - узел для обхода или список многоугольников для вывода
+        stack: list = [self.__root]
+
+        while stack:
+            item = stack.pop()
+
+            if item is None:
+                continue
+
+            if isinstance(item, list):
+                result.extend(item)
+                continue
+
+            nx, ny, nz, d = item.plane
+
+            if nx * vx + ny * vy + nz * vz - d * w > 0:
+                # Наблюдатель перед плоскостью: сначала задние, затем лежащие на ней, затем передние
+                stack.extend((item.front, item.faces, item.back))
+            else:
+                stack.extend((item.back, item.faces, item.front))
+
+        return result
+
+    def __add_face(self, face: Tuple[int, ...], source: int, outline: Tuple[bool, ...]) -> None:
+        self.__faces.append(face)
+        self.__sources.append(source)
+        self.__outlines.append(outline)
+
+    def __plane(self, face: Tuple[int, ...]) -> Optional[Plane]:
+        """Плоскость многоугольника (нормаль по методу Ньюэла), None для вырожденного"""
+
+        v = self.__vertices
+        nx = ny = nz = 0
+        cx = cy = cz = 0
+
+        for j in range(len(face)):
+            a, b = 3 * face[j], 3 * face[j + 1 - len(face)]
+
+            nx += (v[a + 1] - v[b + 1]) * (v[a + 2] + v[b + 2])
+            ny += (v[a + 2] - v[b + 2]) * (v[a] + v[b])
+            nz += (v[a] - v[b]) * (v[a + 1] + v[b + 1])
+
+            cx += v[a]
+            cy += v[a + 1]
+            cz += v[a + 2]
+
+        length = sqrt(nx * nx + ny * ny + nz * nz)
+
+        if length == 0:
+            return None
+
+        nx, ny, nz = nx / length, ny / length, nz / length
+        n = len(face)
+
+        return nx, ny, nz, (nx * cx + ny * cy + nz * cz) / n
+
+    def __distances(self, face: Tuple[int, ...], plane: Plane) -> List[float]:
+        v = self.__vertices
+        nx, ny, nz, d = plane
+
+        return [nx * v[3 * i] + ny * v[3 * i + 1] + nz * v[3 * i + 2] - d for i in face]
+
+    def __classify(self, face: Tuple[int, ...], plane: Plane) -> int:
+        """-1 - за плоскостью, 1 - перед плоскостью, 0 - на плоскости, 2 - пересекает плоскость"""
+
+        eps = self.__epsilon
+        has_front = has_back = False
+
+        for distance in self.__distances(face, plane):
+            if distance > eps:
+                has_front = True
+            elif distance < -eps:
+                has_back = True
+
+        if has_front and has_back:
+            return 2
+
+        return 1 if has_front else -1 if has_back else 0
+
+    def __choose_splitter(self, faces: List[int]) -> Tuple[int, Optional[Plane]]:
+        step = max(1, len(faces) // self.CANDIDATES_COUNT)
+        best, best_plane, best_score = faces[0], None, None
+
+        for candidate in faces[::step][:self.CANDIDATES_COUNT]:
+            plane = self.__plane(self.__faces[candidate])
+
+            if plane is None:
+                continue
+
+            splits = front = back = 0
+
+            for other in faces:
+                side = self.__classify(self.__faces[other], plane)
+
+                if side == 2:
+                    splits += 1
+                elif side == 1:
+                    front += 1
+                elif side == -1:
+                    back += 1
+
+            # Разрезания увеличивают число многоугольников, поэтому штрафуются сильнее несбалансированности
+            score = 4 * splits + abs(front - back)
+
+            if best_score is None or score < best_score:
+                best, best_plane, best_score = candidate, plane, score
+
+        if best_plane is None:
+            for candidate in faces:
+                plane = self.__plane(self.__faces[candidate])
+
+                if plane is not None:
+                    return candidate, plane
+
+        return best, best_plane
+
+    def __build(self, faces: List[int]) -> Optional[_Node]:
+        if not faces:
+            return None
+
+        root: Optional[_Node] = None
+        # Элемент стека - (многоугольники, родительский узел, является ли узел передним потомком)
+        stack = [(faces, None, False)]
+
+        while stack:
+            faces, parent, is_front = stack.pop()
+            splitter, plane = self.__choose_splitter(faces)
+
+            if plane is None:
+                # Все многоугольники вырождены - порядок между ними не важен
+                node = _Node((0, 0, 0, 1), faces)
+                front_faces, back_faces = [], []
+            else:
+                node = _Node(plane, [splitter])
+                front_faces, back_faces = [], []
+
+                for face_id in faces:
+                    if face_id == splitter:
+                        continue
+
+                    face = self.__faces[face_id]
+                    side = self.__classify(face, plane)
+
+                    if side == 0:
+                        node.faces.append(face_id)
+                    elif side == 1:
+                        front_faces.append(face_id)
+                    elif side == -1:
+                        back_faces.append(face_id)
+                    else:
+                        (front_part, front_outline), (back_part, back_outline) = \
+                            self.__split(face, self.__outlines[face_id], plane)
+                        source = self.__sources[face_id]
+
+                        # Первая часть занимает место исходного многоугольника
+                        self.__faces[face_id] = front_part
+                        self.__outlines[face_id] = front_outline
+                        front_faces.append(face_id)
+
+                        back_faces.append(len(self.__faces))
+                        self.__add_face(back_part, source, back_outline)
+
+            if parent is None:
+                root = node
+            elif is_front:
+                parent.front = node
+            else:
+                parent.back = node
+
+            if front_faces:
+                stack.append((front_faces, node, True))
+            if back_faces:
+                stack.append((back_faces, node, False))
+
+        return root
+
+    def __split(self, face: Tuple[int, ...], outline: Tuple[bool, ...], plane: Plane) \
+            -> Tuple[Tuple[Tuple[int, ...], Tuple[bool, ...]], Tuple[Tuple[int, ...], Tuple[bool, ...]]]:
+        """
+        Разрезает многоугольник плоскостью на переднюю и заднюю части.
+        Для каждой части возвращаются индексы вершин и признаки ребер на границе исходного многоугольника.
+        """
+
+        eps = self.__epsilon
+        v = self.__vertices
+        distances = self.__distances(face, plane)
+        intersections: Dict[Tuple[int, int], int] = {}
+        front: List[int] = []
+        back: List[int] = []
+        # Номера ребер разрезаемого многоугольника, на которых лежит каждая вершина частей
+        front_edges: List[Tuple[int, ...]] = []
+        back_edges: List[Tuple[int, ...]] = []
+        n = len(face)
+
+        for j in range(n):
+            k = j + 1 - n
+            a, b = face[j], face[k]
+            da, db = distances[j], distances[k]
+
+            if da >= -eps:
+                front.append(a)
+                front_edges.append(((j - 1) % n, j))
+            if da <= eps:
+                back.append(a)
+                back_edges.append(((j - 1) % n, j))
+
+            if (da > eps and db < -eps) or (da < -eps and db > eps):
+                key = (a, b) if a < b else (b, a)
+                index = intersections.get(key)
+
+                if index is None:
+                    t = da / (da - db)
+                    index = intersections[key] = len(v) // 3
+                    v.extend((
+                        v[3 * a] + (v[3 * b] - v[3 * a]) * t,
+                        v[3 * a + 1] + (v[3 * b + 1] - v[3 * a + 1]) * t,
+                        v[3 * a + 2] + (v[3 * b + 2] - v[3 * a + 2]) * t,
+                    ))
+
+                front.append(index)
+                back.append(index)
+                front_edges.append((j,))
+                back_edges.append((j,))
+
+        return (tuple(front), self.__part_outline(front_edges, outline)), \
+            (tuple(back), self.__part_outline(back_edges, outline))
+
+    @staticmethod
+    def __part_outline(edges: List[Tuple[int, ...]], outline: Tuple[bool, ...]) -> Tuple[bool, ...]:
+        """
+        Ребро части лежит на ребре разрезаемого многоугольника, если на нем лежат оба его конца,
+        иначе это линия разреза.
+        """
+
+        n = len(edges)
+
+        return tuple(
+            any(outline[edge] for edge in edges[m] if edge in edges[(m + 1) % n])
+            for m in range(n)
+        )
+
+
+def outline_runs(outline: Sequence[bool]) -> List[Tuple[int, ...]]:
+    """
+    Разбивает обводку многоугольника на ломаные из подряд идущих обводимых ребер.
+
+    :param outline: Признаки обводки ребер (ребро j - от вершины j к j + 1).
+    :return: Номера вершин каждой ломаной. Если обводятся все ребра, возвращается
+    одна замкнутая ломаная, первая вершина которой повторена в конце.
+    """
+
+    n = len(outline)
+
+    if all(outline):
+        return [tuple(range(n)) + (0,)] if n > 0 else []
+
+    # Обход начинается с ребра, перед которым обводка прерывается
+    start = next(j for j in range(n) if not outline[j - 1])
+    runs: List[Tuple[int, ...]] = []
+    run: List[int] = []
+
+    for m in range(n):
+        j = (start + m) % n
+
+        if outline[j]:
+            if not run:
+                run.append(j)
+            run.append((j + 1) % n)
+        elif run:
+            runs.append(tuple(run))
+            run = []
+
+    if run:
+        runs.append(tuple(run))
+
+    return runs
@@ -0,0 +1,129 @@
+"""
+Модуль реализующий регулятор качества отрисовки по бюджету времени кадра.
+
+Регулятор накапливает времена отрисовки последних кадров и, если среднее время
+превышает бюджет, понижает уровень качества: сначала отключает сглаживание,
+затем уменьшает разрешение, в котором рисуется кадр. Когда появляется запас
+времени, качество постепенно восстанавливается.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """Уровень качества отрисовки"""
+
+    resolution_scale: float
+    """Доля разрешения виджета, в которой рисуется кадр"""
+
+    antialiasing: bool
+
+
+DEFAULT_LEVELS = [
+    QualityLevel(1, True),
+    QualityLevel(1, False),
+    QualityLevel(0.75, False),
+    QualityLevel(0.5, False),
+    QualityLevel(0.35, False),
+]
+"""Уровни качества от лучшего к худшему"""
+
+
+class FrameBudget:
+    """Регулятор уровня качества по времени отрисовки кадров"""
+
+    HEADROOM = 0.5
+    """Доля бюджета, при не превышении которой качество повышается"""
+
+    def __init__(self, target: float, window: int = 8, levels: Optional[List[QualityLevel]] = None):
+        """
+        :param target: Бюджет времени на отрисовку кадра в секундах.
+        :param window: Количество последних кадров, по которым принимается решение.
+        :param levels: Уровни качества от лучшего к худшему. По умолчанию DEFAULT_LEVELS.
+        """
+
+        if target <= 0:
+            raise ValueError("Бюджет времени кадра должен быть положительным!")
+
+        if window < 1:
+            raise ValueError("Окно усреднения должно содержать хотя бы один кадр!")
+
+        self.__levels = list(levels) if levels is not None else DEFAULT_LEVELS
+
+        if not self.__levels:
+            raise ValueError("Должен быть задан хотя бы один уровень качества!")
+
+        self.__target = target
+        self.__times = deque(maxlen=window)
+        self.__level = 0
+
+    @property
+    def target(self) -> float:
+        return self.__target
+
+    @property
+    def level(self) -> int:
+        """Номер текущего уровня качества, 0 - наилучший"""
+
+        return self.__level
+
+    @property
+    def quality(self) -> QualityLevel:
+        return self.__levels[self.__level]
+
+    @property
+    def resolution_scale(self) -> float:
+        return self.quality.resolution_scale
+
+    @property
+    def antialiasing(self) -> bool:
+        return self.quality.antialiasing
+
+    @property
+    def average(self) -> Optional[float]:
+        """Среднее время отрисовки последних кадров, None если кадров еще не было"""
+
+        if not self.__times:
+            return None
+
+        return sum(self.__times) / len(self.__times)
+
+    def record(self, frame_time: float) -> bool:
+        """
+        Учитывает время отрисовки очередного кадра.
+
+        Решение об изменении уровня принимается только после заполнения окна,
+        после изменения окно очищается, чтобы оценивать уже новый уровень.
+
+        :param frame_time: Время отрисовки кадра в секундах.
+        :return: Изменился ли уровень качества.
+        """
+
+        self.__times.append(frame_time)
+
+        if len(self.__times) < self.__times.maxlen:
+            return False
+
+        average = self.average
+
+        if average > self.__target and self.__level + 1 < len(self.__levels):
+            self.__set_level(self.__level + 1)
+            return True
+
+        if average < self.__target * self.HEADROOM and self.__level > 0:
+            self.__set_level(self.__level - 1)
+            return True
+
+        return False
+
+    def reset(self) -> None:
+        """Возвращает наилучшее качество и забывает накопленные времена"""
+
+        self.__set_level(0)
+
+    def __set_level(self, level: int) -> None:
+        self.__level = level
+        self.__times.clear()
@@ -0,0 +1,134 @@
+"""
+Модуль реализующий кэш геометрии параметрических фигур.
+
+Фигура строится один раз с центром в начале координат, приводится к сетке Mesh
+и хранится в кэше неизменяемой: ее массивы доступны только для чтения (Mesh.readonly).
+Повторный запрос фигуры того же класса с теми же параметрами возвращает сетку,
+разделяющую с закэшированной массивы индексов многоугольников, а для фигуры
+в начале координат - и массив вершин. Вершины копируются при смещении в требуемый
+центр или при первом изменении сетки, поэтому кэш изменить нельзя.
+Перед помещением в кэш сетка один раз проверяется и исправляется
+(объединение вершин, удаление вырожденных граней, согласование обхода).
+"""
+
+import inspect
+import threading
+from collections import OrderedDict
+from numbers import Real
+from typing import Type, Optional, Tuple, Hashable
+
+from graphics.figures import AbstractFigure
+from graphics.mesh import Mesh, MeshSnapshot
+from graphics.types import Point3D
+from graphics.validation import repair, weld_vertices
+
+
+class FigureCache:
+    """LRU-кэш сеток параметрических фигур"""
+
+    def __init__(self, max_size: int = 64):
+        """
+        :param max_size: Максимальное количество хранимых сеток.
+        """
+
+        if max_size < 1:
+            raise ValueError("Размер кэша должен быть положительным!")
+
+        self.__max_size = max_size
+        self.__meshes: 'OrderedDict[Hashable, MeshSnapshot]' = OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    def __len__(self) -> int:
+        return len(self.__meshes)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__meshes.clear()
+            self.hits = self.misses = 0
+
+    def get(self, figure_class: Type[AbstractFigure], *args, **kwargs) -> Mesh:
+        """
+        Возвращает сетку фигуры figure_class(*args, **kwargs).
+
+        Первый аргумент-точка конструктора считается центром фигуры: фигура
+        строится в начале координат, а результат смещается в этот центр.
+
+        :param figure_class: Класс фигуры.
+        :return: Сетка фигуры, которую можно изменять без влияния на кэш.
+        """
+
+        key, center, origin_args = self.__normalize(figure_class, args, kwargs)
+
+        if key is None:
+            return Mesh.from_figure(figure_class(*args, **kwargs))
+
+        with self.__lock:
+            mesh = self.__meshes.get(key)
+
+            if mesh is not None:
+                self.__meshes.move_to_end(key)
+                self.hits += 1
+
+        if mesh is None:
+            mesh = repair(weld_vertices(
+                Mesh.from_figure(figure_class(*origin_args.args, **origin_args.kwargs))
+            )).readonly()
+
+            with self.__lock:
+                self.misses += 1
+                self.__meshes[key] = mesh
+                self.__meshes.move_to_end(key)
+
+                while len(self.__meshes) > self.__max_size:
+                    self.__meshes.popitem(last=False)
+
+        if center.x == center.y == center.z == 0:
+            return mesh.shared()
+
+        return mesh.translated(center.x, center.y, center.z)
+
+    @staticmethod
+    def __normalize(figure_class: Type[AbstractFigure], args: tuple, kwargs: dict) \
+            -> Tuple[Optional[Hashable], Point3D, Optional[inspect.BoundArguments]]:
+        """
+        Приводит аргументы конструктора к ключу кэша: подставляет значения по умолчанию,
+        числа приводит к float, а центр фигуры заменяет началом координат.
+        """
+
+        bound = inspect.signature(figure_class).bind(*args, **kwargs)
+        bound.apply_defaults()
+
+        center = None
+        key = [figure_class]
+
+        for name, value in bound.arguments.items():
+            if isinstance(value, Point3D):
+                if center is None:
+                    center = value
+                    value = Point3D(0, 0, 0)
+                    bound.arguments[name] = value
+
+                key.append((name, float(value.x), float(value.y), float(value.z)))
+
+            elif isinstance(value, Real) and not isinstance(value, bool):
+                key.append((name, float(value)))
+
+            else:
+                try:
+                    hash(value)
+                except TypeError:
+                    return None, Point3D(0, 0, 0), None
+
+                key.append((name, value))
+
+        return tuple(key), center if center is not None else Point3D(0, 0, 0), bound
+
+
+figure_cache = FigureCache()
+"""Общий кэш геометрии фигур"""
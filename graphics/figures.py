@@ -2,9 +2,13 @@
 Модуль реализующий фигуры в трехмерном пространстве
 """
 
+import sys
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional, Set, Iterable
 
+from graphics.help_functions import avg
+from graphics.memory import MemoryUsage, object_size
+from graphics.occlusion import Occluder
 from graphics.polygons import AbstractPolygon
 from graphics.types import Point3D, Matrix
 
@@ -27,6 +31,46 @@ class AbstractFigure(ABC):
         for polygon in self.polygons:
             polygon.apply_affine(affine_matrix)
 
+    def occluders(self) -> List[Occluder]:
+        """
+        Цилиндры, целиком лежащие внутри фигуры. Используются для проверки того,
+        закрывает ли фигура другие фигуры. По умолчанию фигура ничего не закрывает.
+        """
+
+        return []
+
+    def snapshot(self) -> 'AbstractFigure':
+        """
+        Возвращает неизменяемый снимок текущего состояния фигуры, который можно
+        отрисовывать в другом потоке, пока фигура изменяется.
+
+        По умолчанию геометрия копируется в сетку. Фигуры, хранящие геометрию
+        в сетках, возвращают снимки без копирования вершин.
+        """
+
+        from graphics.mesh import Mesh
+
+        return Mesh.from_figure(self).snapshot()
+
+    def memory_usage(self, seen: Optional[Set[int]] = None) -> MemoryUsage:
+        """
+        Оценивает память, занимаемую фигурой.
+
+        :param seen: Идентификаторы уже учтенных объектов. Чтобы общие объекты нескольких
+        фигур учитывались один раз, всем фигурам передается одно множество.
+        """
+
+        if seen is None:
+            seen = set()
+
+        polygons = self.polygons
+        vertices = sum(object_size(point, seen) for polygon in polygons for point in polygon.points)
+
+        return MemoryUsage(
+            vertices=vertices,
+            polygons=sum(object_size(polygon, seen) for polygon in polygons) + object_size(self, seen)
+        )
+
 
 class BaseFigure(AbstractFigure):
 
@@ -45,3 +89,51 @@ class BaseFigure(AbstractFigure):
     @property
     def center(self) -> Point3D:
         return self.__center
+
+
+class FigureGroup(AbstractFigure):
+    """Несколько фигур, рассматриваемых как одна фигура"""
+
+    def __init__(self, figures: Iterable[AbstractFigure]):
+        self.__figures = list(figures)
+
+        if not self.__figures:
+            raise ValueError("Группа должна содержать хотя бы одну фигуру!")
+
+    @property
+    def figures(self) -> List[AbstractFigure]:
+        return self.__figures
+
+    @property
+    def polygons(self) -> List[AbstractPolygon]:
+        return [polygon for figure in self.__figures for polygon in figure.polygons]
+
+    @property
+    def center(self) -> Point3D:
+        return avg([figure.center for figure in self.__figures])
+
+    def apply_affine(self, affine_matrix: Matrix):
+        for figure in self.__figures:
+            figure.apply_affine(affine_matrix)
+
+    def occluders(self) -> List[Occluder]:
+        return [occluder for figure in self.__figures for occluder in figure.occluders()]
+
+    def snapshot(self) -> 'FigureGroup':
+        return FigureGroup(figure.snapshot() for figure in self.__figures)
+
+    def memory_usage(self, seen: Optional[Set[int]] = None) -> MemoryUsage:
+        if seen is None:
+            seen = set()
+
+        usage = MemoryUsage()
+
+        if id(self) not in seen:
+            seen.update((id(self), id(self.__figures)))
+            usage = MemoryUsage(polygons=sys.getsizeof(self) + sys.getsizeof(self.__dict__)
+                                + sys.getsizeof(self.__figures))
+
+        for figure in self.__figures:
+            usage += figure.memory_usage(seen)
+
+        return usage
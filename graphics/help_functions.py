@@ -1,5 +1,6 @@
 import functools
-from typing import List, Iterable
+from math import pi, cos, sin
+from typing import List, Iterable, Tuple
 
 from graphics.types import Point3D
 
@@ -20,6 +21,52 @@ def avg(points: List[Point3D]) -> Point3D:
     return functools.reduce(lambda x, y: x + y, points) / len(points)
 
 
+@functools.lru_cache(maxsize=64)
+def unit_circle(sides_count: int) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """
+    Возвращает косинусы и синусы углов 2 * pi * i / sides_count
+    вершин правильного многоугольника, вписанного в единичную окружность.
+    Таблицы вычисляются один раз для каждого количества сторон.
+    """
+
+    step = 2 * pi / sides_count
+
+    return (
+        tuple(cos(step * i) for i in range(sides_count)),
+        tuple(sin(step * i) for i in range(sides_count)),
+    )
+
+
+def bounding_box(points: Iterable[Point3D]) -> Tuple[Point3D, Point3D]:
+    """Возвращает противоположные углы ограничивающего параллелепипеда точек"""
+
+    it = iter(points)
+    try:
+        first = next(it)
+    except StopIteration:
+        raise IndexError("Набор точек не должен быть пустым!")
+
+    low, high = first.copy(), first.copy()
+
+    for point in it:
+        low.x, high.x = min(low.x, point.x), max(high.x, point.x)
+        low.y, high.y = min(low.y, point.y), max(high.y, point.y)
+        low.z, high.z = min(low.z, point.z), max(high.z, point.z)
+
+    return low, high
+
+
+def box_corners(low: Point3D, high: Point3D) -> List[Point3D]:
+    """Возвращает вершины параллелепипеда, заданного противоположными углами"""
+
+    return [
+        Point3D(x, y, z)
+        for x in (low.x, high.x)
+        for y in (low.y, high.y)
+        for z in (low.z, high.z)
+    ]
+
+
 def cyclic_pare_iter(container: Iterable):
     it = iter(container)
     try:
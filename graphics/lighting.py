@@ -0,0 +1,128 @@
+"""
+Модуль реализующий плоское затенение многоугольников направленными источниками света.
+
+Нормали многоугольников вычисляются один раз и хранятся в плоском массиве,
+а на каждом кадре все нормали преобразуются и освещаются одним проходом.
+"""
+
+from array import array
+from dataclasses import dataclass
+from math import sqrt
+from typing import List, Iterable, Tuple, Optional
+
+from graphics.polygons import AbstractPolygon
+from graphics.types import Point3D, Matrix
+
+
+@dataclass
+class DirectionalLight:
+    """Направленный источник света"""
+
+    direction: Point3D
+    """Направление распространения света"""
+
+    intensity: float = 1
+
+
+def polygon_normal(points: List[Point3D]) -> Tuple[float, float, float]:
+    """
+    Возвращает единичную нормаль многоугольника, вычисленную методом Ньюэла.
+    Для вырожденного многоугольника возвращается нулевой вектор.
+    """
+
+    nx = ny = nz = 0
+
+    for i in range(len(points)):
+        cur = points[i]
+        nxt = points[i + 1 - len(points)]
+
+        nx += (cur.y - nxt.y) * (cur.z + nxt.z)
+        ny += (cur.z - nxt.z) * (cur.x + nxt.x)
+        nz += (cur.x - nxt.x) * (cur.y + nxt.y)
+
+    length = sqrt(nx * nx + ny * ny + nz * nz)
+
+    if length == 0:
+        return 0, 0, 0
+
+    return nx / length, ny / length, nz / length
+
+
+def face_normals(polygons: Iterable[AbstractPolygon]) -> array:
+    """Возвращает плоский массив нормалей многоугольников (nx0, ny0, nz0, nx1, ...)"""
+
+    normals = array('d')
+
+    for polygon in polygons:
+        normals.extend(polygon_normal(polygon.points))
+
+    return normals
+
+
+class Lighting:
+    """Модель освещения: рассеянный свет и диффузное отражение по Ламберту"""
+
+    def __init__(self, lights: List[DirectionalLight], ambient: float = 0.25, two_sided: bool = True):
+        """
+        :param lights: Направленные источники света. Направления задаются в системе координат экрана.
+        :param ambient: Интенсивность рассеянного света.
+        :param two_sided: Освещать ли обе стороны многоугольников. Необходимо,
+        если обход вершин многоугольников фигуры не согласован.
+        """
+
+        self.__lights = []
+
+        for light in lights:
+            d = light.direction
+            length = sqrt(d.x ** 2 + d.y ** 2 + d.z ** 2)
+
+            if length == 0:
+                raise ValueError("Направление источника света не может быть нулевым вектором!")
+
+            # Храним вектор к источнику света, умноженный на интенсивность
+            k = -light.intensity / length
+            self.__lights.append((d.x * k, d.y * k, d.z * k))
+
+        self.__ambient = ambient
+        self.__two_sided = two_sided
+
+    def shade(self, normals: array, affine_matrix: Matrix, out: Optional[array] = None) -> array:
+        """
+        Вычисляет освещенность многоугольников.
+
+        :param normals: Плоский массив нормалей в системе координат фигуры.
+        :param affine_matrix: Матрица преобразования фигуры (поворот и равномерное масштабирование).
+        :param out: Массив для записи результата. Если не задан, создается новый массив.
+        :return: Освещенность каждого многоугольника от 0 до 1.
+        """
+
+        (a00, a01, a02, _), (a10, a11, a12, _), (a20, a21, a22, _) = \
+            affine_matrix[0], affine_matrix[1], affine_matrix[2]
+
+        # Равномерное масштабирование не меняет направление нормали, учитываем только его длину
+        k = 1 / sqrt(a00 * a00 + a10 * a10 + a20 * a20)
+        ambient = self.__ambient
+        lights = self.__lights
+        two_sided = self.__two_sided
+        result = out if out is not None else array('d', bytes(8 * (len(normals) // 3)))
+
+        for i in range(0, len(normals), 3):
+            x, y, z = normals[i], normals[i + 1], normals[i + 2]
+
+            nx = (a00 * x + a01 * y + a02 * z) * k
+            ny = (a10 * x + a11 * y + a12 * z) * k
+            nz = (a20 * x + a21 * y + a22 * z) * k
+
+            value = ambient
+
+            for lx, ly, lz in lights:
+                diffuse = nx * lx + ny * ly + nz * lz
+
+                if two_sided:
+                    value += abs(diffuse)
+                elif diffuse > 0:
+                    value += diffuse
+
+            result[i // 3] = value if value < 1 else 1
+
+        return result
@@ -0,0 +1,86 @@
+"""
+Модуль реализующий оценку памяти, занимаемой фигурами.
+
+Размер объекта считается как сумма sys.getsizeof самого объекта и всех объектов,
+достижимых из него через контейнеры и атрибуты экземпляров. Каждый объект
+учитывается один раз, поэтому общие для нескольких фигур объекты (например,
+массивы индексов многоугольников, разделяемые копиями из кэша фигур) можно
+учесть однократно, передав всем фигурам общее множество seen.
+"""
+
+import sys
+from dataclasses import dataclass
+from types import ModuleType, FunctionType, BuiltinFunctionType, MethodType
+from typing import Optional, Set, Any
+
+_SKIPPED_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+
+
+@dataclass(frozen=True)
+class MemoryUsage:
+    """
+    Память, занимаемая фигурой, в байтах.
+
+    vertices - координаты вершин (объекты Point3D или массивы координат),
+    polygons - многоугольники, индексы их вершин и структура самой фигуры,
+    caches - данные, которые фигура хранит для ускорения и может построить заново.
+    """
+
+    vertices: int = 0
+    polygons: int = 0
+    caches: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.vertices + self.polygons + self.caches
+
+    def __add__(self, other: 'MemoryUsage') -> 'MemoryUsage':
+        return MemoryUsage(
+            self.vertices + other.vertices,
+            self.polygons + other.polygons,
+            self.caches + other.caches
+        )
+
+    def __str__(self):
+        return f"{self.total} B (вершины {self.vertices}, многоугольники {self.polygons}, кэши {self.caches})"
+
+
+def object_size(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Размер объекта вместе со всеми достижимыми из него объектами.
+
+    :param seen: Идентификаторы уже учтенных объектов. Дополняется учтенными объектами.
+    """
+
+    if seen is None:
+        seen = set()
+
+    size = 0
+    stack = [obj]
+
+    while stack:
+        current = stack.pop()
+
+        if current is None or isinstance(current, _SKIPPED_TYPES) or id(current) in seen:
+            continue
+
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif isinstance(current, memoryview):
+            # Представление не владеет данными, они учитываются по исходному объекту
+            stack.append(current.obj)
+
+        attributes = getattr(current, '__dict__', None)
+        if isinstance(attributes, dict):
+            stack.append(attributes)
+
+        for slot in getattr(type(current), '__slots__', ()):
+            stack.append(getattr(current, slot, None))
+
+    return size
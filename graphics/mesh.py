@@ -0,0 +1,336 @@
+"""
+Модуль реализующий полигональную сетку, хранящую геометрию в плоских массивах.
+"""
+
+from array import array
+import sys
+from typing import List, Iterable, Iterator, Optional, Dict, Tuple, Set, Union
+
+from graphics.accel import unique_edges, transform_coords
+from graphics.figures import AbstractFigure
+from graphics.memory import MemoryUsage, object_size
+from graphics.occlusion import Occluder
+from graphics.polygons import BasePolygon
+from graphics.types import Point3D, Matrix
+
+VERTEX_TYPECODE = 'd'
+INDEX_TYPECODE = 'i'
+
+
+class Mesh(AbstractFigure):
+    """
+    Полигональная сетка.
+
+    Координаты вершин хранятся в плоском массиве (x0, y0, z0, x1, y1, z1, ...),
+    многоугольники - в плоском массиве индексов вершин. Так как многоугольники
+    могут иметь разное количество вершин, для каждого многоугольника хранится
+    смещение его первого индекса: индексы i-го многоугольника лежат в
+    faces[face_starts[i]:face_starts[i + 1]].
+
+    Снимки сетки (snapshot) разделяют с ней массивы без копирования. Сетка,
+    у которой есть снимки, перед первым изменением копирует массив вершин,
+    поэтому снимки не меняются (копирование при записи).
+
+    Вместо массивов сетка может хранить их представления только для чтения
+    (см. readonly), разделяемые несколькими сетками. Такие вершины тоже
+    копируются перед первым изменением.
+    """
+
+    def __init__(self,
+                 vertices: Iterable[float],
+                 faces: Iterable[int],
+                 face_starts: Iterable[int],
+                 center: Optional[Point3D] = None):
+        """
+        :param vertices: Плоский массив координат вершин.
+        :param faces: Плоский массив индексов вершин многоугольников.
+        :param face_starts: Смещения многоугольников в массиве faces (на один больше числа многоугольников).
+        :param center: Центр фигуры. Если не задан, вычисляется как центр ограничивающего параллелепипеда.
+        """
+
+        self._vertices = vertices if isinstance(vertices, (array, memoryview)) \
+            else array(VERTEX_TYPECODE, vertices)
+        self._faces = faces if isinstance(faces, (array, memoryview)) else array(INDEX_TYPECODE, faces)
+        self._face_starts = face_starts if isinstance(face_starts, (array, memoryview)) \
+            else array(INDEX_TYPECODE, face_starts)
+
+        if len(self._vertices) % 3 != 0:
+            raise ValueError("Количество координат вершин должно быть кратно 3!")
+
+        if len(self._face_starts) == 0 or self._face_starts[0] != 0 \
+                or self._face_starts[-1] != len(self._faces):
+            raise ValueError("Смещения многоугольников не согласованы с массивом индексов!")
+
+        self._center = center
+        self._polygons: Optional[List[BasePolygon]] = None
+
+        self._version = 0
+        self._snapshot: Optional[MeshSnapshot] = None
+        self._occluders: List[Occluder] = []
+
+    @staticmethod
+    def from_figure(figure: AbstractFigure) -> 'Mesh':
+        """
+        Строит сетку по произвольной фигуре. Совпадающие вершины объединяются.
+
+        :param figure: Исходная фигура.
+        :return: Сетка с той же геометрией.
+        """
+
+        if isinstance(figure, Mesh):
+            return figure.copy()
+
+        vertices = array(VERTEX_TYPECODE)
+        faces = array(INDEX_TYPECODE)
+        face_starts = array(INDEX_TYPECODE, [0])
+        indices: Dict[Tuple[float, float, float], int] = {}
+
+        for polygon in figure.polygons:
+            for point in polygon.points:
+                key = (point.x, point.y, point.z)
+                index = indices.get(key)
+
+                if index is None:
+                    index = indices[key] = len(indices)
+                    vertices.extend(key)
+
+                faces.append(index)
+
+            face_starts.append(len(faces))
+
+        return Mesh(vertices, faces, face_starts, figure.center)
+
+    @staticmethod
+    def concatenate(meshes: Iterable['Mesh'], center: Optional[Point3D] = None) -> 'Mesh':
+        """
+        Объединяет сетки в одну. Многоугольники идут в порядке сеток,
+        вершины разных сеток не объединяются.
+
+        :param center: Центр результата. Если не задан, вычисляется по вершинам.
+        """
+
+        vertices = array(VERTEX_TYPECODE)
+        faces = array(INDEX_TYPECODE)
+        face_starts = array(INDEX_TYPECODE, [0])
+
+        for mesh in meshes:
+            vertex_offset = len(vertices) // 3
+            face_offset = len(faces)
+
+            vertices.extend(mesh.vertices)
+            faces.extend(mesh.faces if vertex_offset == 0 else [i + vertex_offset for i in mesh.faces])
+            face_starts.extend(start + face_offset for start in mesh.face_starts[1:])
+
+        return Mesh(vertices, faces, face_starts, center)
+
+    def readonly(self) -> 'MeshSnapshot':
+        """
+        Возвращает неизменяемую сетку, массивы которой доступны только для чтения.
+        Массивы не копируются, поэтому исходную сетку после вызова изменять нельзя.
+        """
+
+        mesh = Mesh(
+            memoryview(self._vertices).toreadonly(),
+            memoryview(self._faces).toreadonly(),
+            memoryview(self._face_starts).toreadonly(),
+            self.center
+        )
+        mesh._occluders = self._occluders
+
+        return mesh.snapshot()
+
+    def shared(self) -> 'Mesh':
+        """
+        Возвращает изменяемую сетку, разделяющую с этой сеткой все массивы.
+        Для сетки с массивами только для чтения (readonly) вершины копируются при первом изменении.
+        """
+
+        mesh = Mesh(self._vertices, self._faces, self._face_starts, self.center.copy())
+        mesh._occluders = list(self._occluders)
+
+        return mesh
+
+    @property
+    def vertices(self) -> Union[array, memoryview]:
+        return self._vertices
+
+    @property
+    def faces(self) -> Union[array, memoryview]:
+        return self._faces
+
+    @property
+    def face_starts(self) -> Union[array, memoryview]:
+        return self._face_starts
+
+    @property
+    def vertices_count(self) -> int:
+        return len(self._vertices) // 3
+
+    @property
+    def faces_count(self) -> int:
+        return len(self._face_starts) - 1
+
+    @property
+    def version(self) -> int:
+        """Номер изменения сетки. Увеличивается при каждом изменении геометрии"""
+
+        return self._version
+
+    def vertex(self, i: int) -> Point3D:
+        return Point3D(self._vertices[3 * i], self._vertices[3 * i + 1], self._vertices[3 * i + 2])
+
+    def face(self, i: int) -> Union[array, memoryview]:
+        """Возвращает индексы вершин i-го многоугольника"""
+
+        return self._faces[self._face_starts[i]:self._face_starts[i + 1]]
+
+    def iter_faces(self) -> Iterator[array]:
+        for i in range(self.faces_count):
+            yield self.face(i)
+
+    def edges(self) -> array:
+        """
+        Возвращает ребра сетки без повторений в виде плоского массива
+        пар индексов вершин (a0, b0, a1, b1, ...). Ребро, общее для нескольких
+        многоугольников, входит в массив один раз.
+        """
+
+        return unique_edges(self._faces, self._face_starts)
+
+    @property
+    def polygons(self) -> List[BasePolygon]:
+        """
+        Многоугольники сетки. Создаются при первом обращении,
+        многоугольники с общей вершиной разделяют один объект Point3D.
+        """
+
+        if self._polygons is None:
+            points = [self.vertex(i) for i in range(self.vertices_count)]
+            self._polygons = [
+                BasePolygon([points[j] for j in face])
+                for face in self.iter_faces()
+            ]
+
+        return self._polygons
+
+    @property
+    def center(self) -> Point3D:
+        if self._center is None:
+            v = self._vertices
+
+            if len(v) == 0:
+                return Point3D(0, 0, 0)
+
+            self._center = Point3D(*[
+                (min(v[axle::3]) + max(v[axle::3])) / 2
+                for axle in range(3)
+            ])
+
+        return self._center
+
+    def occluders(self) -> List[Occluder]:
+        """Вписанные цилиндры, заданные при построении сетки. Сбрасываются при ее изменении"""
+
+        return self._occluders
+
+    def memory_usage(self, seen: Optional[Set[int]] = None) -> MemoryUsage:
+        """
+        Оценивает память, занимаемую сеткой. Многоугольники, созданные
+        свойством polygons, и снимок сетки учитываются как кэши.
+        """
+
+        if seen is None:
+            seen = set()
+
+        vertices = object_size(self._vertices, seen)
+        polygons = object_size(self._faces, seen) + object_size(self._face_starts, seen) \
+            + object_size(self._center, seen)
+
+        if id(self) not in seen:
+            seen.add(id(self))
+            polygons += sys.getsizeof(self) + sys.getsizeof(self.__dict__)
+
+        caches = object_size(self._polygons, seen) + object_size(self._occluders, seen)
+
+        if self._snapshot is not None and self._snapshot is not self:
+            caches += self._snapshot.memory_usage(seen).total
+
+        return MemoryUsage(vertices, polygons, caches)
+
+    def snapshot(self) -> 'MeshSnapshot':
+        """
+        Возвращает неизменяемый снимок текущего состояния сетки.
+        Массивы не копируются; пока сетка не изменится, возвращается один и тот же снимок.
+        """
+
+        if self._snapshot is None:
+            self._snapshot = MeshSnapshot(self)
+
+        return self._snapshot
+
+    def apply_affine(self, affine_matrix: Matrix):
+        if self._snapshot is None and isinstance(self._vertices, array):
+            transform_coords(affine_matrix, self._vertices, self._vertices)
+        else:
+            # Массив вершин принадлежит снимку или доступен только для чтения,
+            # результат записывается в новый массив
+            self._vertices = transform_coords(affine_matrix, self._vertices)
+            self._snapshot = None
+
+        if self._center is not None:
+            self._center = self._center.apply_modification(affine_matrix)
+
+        self._polygons = None
+        self._occluders = []
+        self._version += 1
+
+    def translated(self, dx: float, dy: float, dz: float) -> 'Mesh':
+        """
+        Возвращает сетку, смещенную на вектор (dx, dy, dz).
+        Массивы индексов многоугольников не копируются, а разделяются с исходной сеткой.
+        """
+
+        vertices = array(VERTEX_TYPECODE, self._vertices)
+
+        for i, delta in enumerate((dx, dy, dz)):
+            if delta != 0:
+                vertices[i::3] = array(VERTEX_TYPECODE, [coord + delta for coord in vertices[i::3]])
+
+        center = self.center
+        mesh = Mesh(vertices, self._faces, self._face_starts, Point3D(center.x + dx, center.y + dy, center.z + dz))
+        mesh._occluders = [occluder.translated(dx, dy, dz) for occluder in self._occluders]
+
+        return mesh
+
+    def copy(self) -> 'Mesh':
+        mesh = Mesh(
+            array(VERTEX_TYPECODE, self._vertices),
+            array(INDEX_TYPECODE, self._faces),
+            array(INDEX_TYPECODE, self._face_starts),
+            None if self._center is None else self._center.copy()
+        )
+        mesh._occluders = list(self._occluders)
+
+        return mesh
+
+
+class MeshSnapshot(Mesh):
+    """
+    Неизменяемый снимок сетки. Разделяет массивы с сеткой, с которой снят,
+    и может безопасно читаться из других потоков, пока сетка изменяется.
+    """
+
+    def __init__(self, mesh: Mesh):
+        super().__init__(mesh.vertices, mesh.faces, mesh.face_starts, mesh.center.copy())
+
+        self._version = mesh.version
+        self._snapshot = self
+        self._occluders = list(mesh.occluders())
+
+    @property
+    def center(self) -> Point3D:
+        # Центр копируется, чтобы его изменение не затронуло снимок
+        return self._center.copy()
+
+    def apply_affine(self, affine_matrix: Matrix):
+        raise TypeError("Снимок сетки нельзя изменять!")
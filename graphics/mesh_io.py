@@ -0,0 +1,441 @@
+"""
+Модуль реализующий потоковое чтение и запись фигур в форматах Wavefront OBJ и PLY.
+
+Файлы читаются блоками фиксированного размера, а координаты и индексы
+сразу складываются в плоские массивы сетки Mesh, поэтому объем
+промежуточных данных не зависит от размера файла.
+"""
+
+import os
+import struct
+from array import array
+from typing import BinaryIO, Dict, Iterator, List, Tuple, Optional, TextIO
+
+from graphics.figures import AbstractFigure
+from graphics.mesh import Mesh, VERTEX_TYPECODE, INDEX_TYPECODE
+from graphics.validation import repair
+
+CHUNK_SIZE = 1 << 20
+
+
+def _iter_lines(file: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Построчно читает файл блоками размера chunk_size"""
+
+    tail = ''
+
+    while True:
+        chunk = file.read(chunk_size)
+
+        if not chunk:
+            break
+
+        lines = (tail + chunk).split('\n')
+        tail = lines.pop()
+
+        yield from lines
+
+    if tail:
+        yield tail
+
+
+# ---------------------------------------------------------------- OBJ
+
+
+def load_obj(path: str, chunk_size: int = CHUNK_SIZE) -> Mesh:
+    """
+    Загружает сетку из файла Wavefront OBJ.
+    Учитываются только вершины (v) и грани (f), текстурные координаты и нормали пропускаются.
+
+    :param path: Путь к файлу.
+    :param chunk_size: Размер блока чтения в символах.
+    """
+
+    vertices = array(VERTEX_TYPECODE)
+    faces = array(INDEX_TYPECODE)
+    face_starts = array(INDEX_TYPECODE, [0])
+
+    with open(path, 'r', encoding='utf-8') as file:
+        for line_number, line in enumerate(_iter_lines(file, chunk_size), 1):
+            words = line.split()
+
+            if not words:
+                continue
+
+            match words[0]:
+                case 'v':
+                    if len(words) < 4:
+                        raise ValueError(f"Строка {line_number}: у вершины должно быть три координаты!")
+
+                    vertices.extend(map(float, words[1:4]))
+
+                case 'f':
+                    vertices_count = len(vertices) // 3
+
+                    for token in words[1:]:
+                        index = int(token.partition('/')[0])
+                        # В OBJ индексы начинаются с 1, отрицательные индексы отсчитываются от конца
+                        index = index - 1 if index > 0 else vertices_count + index
+
+                        if not 0 <= index < vertices_count:
+                            raise IndexError(f"Строка {line_number}: индекс вершины {token} вне диапазона!")
+
+                        faces.append(index)
+
+                    face_starts.append(len(faces))
+
+    return Mesh(vertices, faces, face_starts)
+
+
+def save_obj(figure: AbstractFigure, path: str) -> None:
+    """
+    Сохраняет фигуру в файл Wavefront OBJ.
+    Многоугольники записываются по мере обхода фигуры, совпадающие вершины объединяются.
+
+    :param figure: Сохраняемая фигура.
+    :param path: Путь к файлу.
+    """
+
+    with open(path, 'w', encoding='utf-8') as file:
+        if isinstance(figure, Mesh):
+            v = figure.vertices
+
+            for i in range(0, len(v), 3):
+                file.write(f'v {v[i]!r} {v[i + 1]!r} {v[i + 2]!r}\n')
+
+            for face in figure.iter_faces():
+                file.write('f ' + ' '.join([str(index + 1) for index in face]) + '\n')
+
+            return
+
+        indices: Dict[Tuple[float, float, float], int] = {}
+
+        for polygon in figure.polygons:
+            face = []
+
+            for point in polygon.points:
+                key = (point.x, point.y, point.z)
+                index = indices.get(key)
+
+                if index is None:
+                    index = indices[key] = len(indices) + 1
+                    file.write(f'v {point.x!r} {point.y!r} {point.z!r}\n')
+
+                face.append(str(index))
+
+            file.write('f ' + ' '.join(face) + '\n')
+
+
+# ---------------------------------------------------------------- PLY
+
+_PLY_TYPES = {
+    'char': 'b', 'int8': 'b',
+    'uchar': 'B', 'uint8': 'B',
+    'short': 'h', 'int16': 'h',
+    'ushort': 'H', 'uint16': 'H',
+    'int': 'i', 'int32': 'i',
+    'uint': 'I', 'uint32': 'I',
+    'float': 'f', 'float32': 'f',
+    'double': 'd', 'float64': 'd',
+}
+
+_PLY_BYTE_ORDER = {
+    'binary_little_endian': '<',
+    'binary_big_endian': '>',
+}
+
+
+class _PlyElement:
+    def __init__(self, name: str, count: int):
+        self.name = name
+        self.count = count
+        # (имя, тип, тип длины списка или None)
+        self.properties: List[Tuple[str, str, Optional[str]]] = []
+
+    def property_index(self, name: str) -> int:
+        for i, (property_name, _, _) in enumerate(self.properties):
+            if property_name == name:
+                return i
+
+        raise ValueError(f"Элемент {self.name} не содержит свойство {name}!")
+
+    @property
+    def is_fixed_size(self) -> bool:
+        return all(list_type is None for _, _, list_type in self.properties)
+
+
+def _read_ply_header(file: BinaryIO) -> Tuple[str, List[_PlyElement]]:
+    if file.readline().strip() != b'ply':
+        raise ValueError("Файл не является PLY файлом!")
+
+    ply_format = None
+    elements: List[_PlyElement] = []
+
+    while True:
+        line = file.readline()
+
+        if not line:
+            raise ValueError("Неожиданный конец заголовка PLY!")
+
+        words = line.decode('ascii').split()
+
+        if not words or words[0] in ('comment', 'obj_info'):
+            continue
+
+        match words[0]:
+            case 'format':
+                ply_format = words[1]
+            case 'element':
+                elements.append(_PlyElement(words[1], int(words[2])))
+            case 'property':
+                if words[1] == 'list':
+                    elements[-1].properties.append((words[4], _PLY_TYPES[words[3]], _PLY_TYPES[words[2]]))
+                else:
+                    elements[-1].properties.append((words[2], _PLY_TYPES[words[1]], None))
+            case 'end_header':
+                break
+
+    if ply_format != 'ascii' and ply_format not in _PLY_BYTE_ORDER:
+        raise ValueError(f"Неподдерживаемый формат PLY {ply_format}!")
+
+    return ply_format, elements
+
+
+def _face_property_index(element: _PlyElement) -> int:
+    for name in ('vertex_indices', 'vertex_index'):
+        try:
+            return element.property_index(name)
+        except ValueError:
+            pass
+
+    raise ValueError("Элемент face не содержит индексов вершин!")
+
+
+class _ChunkReader:
+    """Буфер двоичного чтения, подгружающий файл блоками"""
+
+    def __init__(self, file: BinaryIO, chunk_size: int):
+        self.__file = file
+        self.__chunk_size = chunk_size
+        self.__buffer = b''
+        self.__offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        if self.__offset + fmt.size > len(self.__buffer):
+            self.__fill(fmt.size)
+
+        values = fmt.unpack_from(self.__buffer, self.__offset)
+        self.__offset += fmt.size
+        return values
+
+    def iter_unpack(self, fmt: struct.Struct, count: int) -> Iterator[tuple]:
+        """Распаковывает count записей фиксированного размера, обрабатывая их целыми блоками"""
+
+        per_chunk = max(1, self.__chunk_size // fmt.size)
+
+        while count > 0:
+            n = min(per_chunk, count)
+            self.__fill(n * fmt.size)
+
+            end = self.__offset + n * fmt.size
+            yield from fmt.iter_unpack(self.__buffer[self.__offset:end])
+
+            self.__offset = end
+            count -= n
+
+    def __fill(self, size: int):
+        rest = self.__buffer[self.__offset:]
+        data = self.__file.read(max(self.__chunk_size, size - len(rest)))
+        self.__buffer = rest + data
+        self.__offset = 0
+
+        if len(self.__buffer) < size:
+            raise ValueError("Неожиданный конец данных PLY!")
+
+
+def load_ply(path: str, chunk_size: int = CHUNK_SIZE) -> Mesh:
+    """
+    Загружает сетку из файла PLY (ascii, binary_little_endian или binary_big_endian).
+    Используются элементы vertex (свойства x, y, z) и face, остальные элементы пропускаются.
+
+    :param path: Путь к файлу.
+    :param chunk_size: Размер блока чтения в байтах.
+    """
+
+    vertices = array(VERTEX_TYPECODE)
+    faces = array(INDEX_TYPECODE)
+    face_starts = array(INDEX_TYPECODE, [0])
+
+    with open(path, 'rb') as file:
+        ply_format, elements = _read_ply_header(file)
+
+        if ply_format == 'ascii':
+            lines = _iter_lines(_AsciiStream(file), chunk_size)
+
+            for element in elements:
+                _read_ascii_element(element, lines, vertices, faces, face_starts)
+        else:
+            reader = _ChunkReader(file, chunk_size)
+
+            for element in elements:
+                _read_binary_element(element, reader, _PLY_BYTE_ORDER[ply_format], vertices, faces, face_starts)
+
+    # Элемент face может предшествовать элементу vertex, поэтому индексы проверяются после чтения
+    _check_face_indices(faces, face_starts, len(vertices) // 3)
+
+    return Mesh(vertices, faces, face_starts)
+
+
+def _check_face_indices(faces: array, face_starts: array, vertices_count: int) -> None:
+    if not faces or 0 <= min(faces) and max(faces) < vertices_count:
+        return
+
+    for i in range(len(face_starts) - 1):
+        for index in faces[face_starts[i]:face_starts[i + 1]]:
+            if not 0 <= index < vertices_count:
+                raise IndexError(f"Грань {i}: индекс вершины {index} вне диапазона (вершин {vertices_count})!")
+
+
+class _AsciiStream:
+    """Текстовая обертка над двоичным файлом для построчного чтения блоками"""
+
+    def __init__(self, file: BinaryIO):
+        self.__file = file
+
+    def read(self, size: int) -> str:
+        return self.__file.read(size).decode('ascii')
+
+
+def _read_ascii_element(element: _PlyElement, lines: Iterator[str],
+                        vertices: array, faces: array, face_starts: array) -> None:
+    if element.name == 'vertex':
+        ix, iy, iz = [element.property_index(axle) for axle in 'xyz']
+
+        for _ in range(element.count):
+            values = next(lines).split()
+            vertices.extend((float(values[ix]), float(values[iy]), float(values[iz])))
+
+    elif element.name == 'face':
+        if _face_property_index(element) != 0:
+            raise ValueError("Индексы вершин должны быть первым свойством элемента face!")
+
+        for _ in range(element.count):
+            values = next(lines).split()
+            faces.extend(map(int, values[1:1 + int(values[0])]))
+            face_starts.append(len(faces))
+
+    else:
+        for _ in range(element.count):
+            next(lines)
+
+
+def _read_binary_element(element: _PlyElement, reader: _ChunkReader, byte_order: str,
+                         vertices: array, faces: array, face_starts: array) -> None:
+    if element.is_fixed_size:
+        record = struct.Struct(byte_order + ''.join(t for _, t, _ in element.properties))
+
+        if element.name == 'vertex':
+            ix, iy, iz = [element.property_index(axle) for axle in 'xyz']
+
+            for values in reader.iter_unpack(record, element.count):
+                vertices.extend((values[ix], values[iy], values[iz]))
+        else:
+            for _ in reader.iter_unpack(record, element.count):
+                pass
+
+        return
+
+    if element.name != 'face' or len(element.properties) != 1:
+        raise ValueError(f"Неподдерживаемая структура элемента {element.name}!")
+
+    _, index_type, length_type = element.properties[_face_property_index(element)]
+    length_struct = struct.Struct(byte_order + length_type)
+    index_structs: Dict[int, struct.Struct] = {}
+
+    for _ in range(element.count):
+        n, = reader.unpack(length_struct)
+
+        index_struct = index_structs.get(n)
+        if index_struct is None:
+            index_struct = index_structs[n] = struct.Struct(byte_order + index_type * n)
+
+        faces.extend(reader.unpack(index_struct))
+        face_starts.append(len(faces))
+
+
+def save_ply(figure: AbstractFigure, path: str, binary: bool = True) -> None:
+    """
+    Сохраняет фигуру в файл PLY.
+
+    :param figure: Сохраняемая фигура.
+    :param path: Путь к файлу.
+    :param binary: Записывать ли данные в формате binary_little_endian (иначе ascii).
+    """
+
+    # Заголовок PLY содержит количество вершин и граней, поэтому фигура сначала приводится к сетке
+    mesh = figure if isinstance(figure, Mesh) else Mesh.from_figure(figure)
+
+    header = '\n'.join([
+        'ply',
+        f"format {'binary_little_endian' if binary else 'ascii'} 1.0",
+        f'element vertex {mesh.vertices_count}',
+        'property double x',
+        'property double y',
+        'property double z',
+        f'element face {mesh.faces_count}',
+        'property list uchar int vertex_indices',
+        'end_header',
+    ]) + '\n'
+
+    with open(path, 'wb') as file:
+        file.write(header.encode('ascii'))
+
+        v = mesh.vertices
+
+        if binary:
+            vertices = array(VERTEX_TYPECODE, v)
+            if struct.pack('=H', 1) != struct.pack('<H', 1):
+                vertices.byteswap()
+
+            file.write(vertices.tobytes())
+
+            for face in mesh.iter_faces():
+                file.write(struct.pack(f'<B{len(face)}i', len(face), *face))
+        else:
+            for i in range(0, len(v), 3):
+                file.write(f'{v[i]!r} {v[i + 1]!r} {v[i + 2]!r}\n'.encode('ascii'))
+
+            for face in mesh.iter_faces():
+                file.write((f'{len(face)} ' + ' '.join(map(str, face)) + '\n').encode('ascii'))
+
+
+# ---------------------------------------------------------------- Общий интерфейс
+
+
+def load_mesh(path: str, repair_mesh: bool = False) -> Mesh:
+    """
+    Загружает сетку из файла OBJ или PLY в зависимости от расширения.
+
+    :param repair_mesh: Исправить ли сетку после загрузки (см. graphics.validation.repair).
+    """
+
+    match os.path.splitext(path)[1].lower():
+        case '.obj':
+            mesh = load_obj(path)
+        case '.ply':
+            mesh = load_ply(path)
+        case extension:
+            raise ValueError(f"Неизвестный формат файла {extension}!")
+
+    return repair(mesh) if repair_mesh else mesh
+
+
+def save_mesh(figure: AbstractFigure, path: str) -> None:
+    """Сохраняет фигуру в файл OBJ или PLY в зависимости от расширения"""
+
+    match os.path.splitext(path)[1].lower():
+        case '.obj':
+            save_obj(figure, path)
+        case '.ply':
+            save_ply(figure, path)
+        case extension:
+            raise ValueError(f"Неизвестный формат файла {extension}!")
@@ -0,0 +1,167 @@
+"""
+Модуль реализующий грубую проверку перекрытия фигур.
+
+Буфер перекрытия - сетка из небольшого числа ячеек, покрывающая область вывода.
+В ячейке хранится глубина ближайшего заслоняющего объекта, полностью закрывающего
+ячейку. Заслоняющими объектами служат вписанные в фигуры цилиндры: каждое сечение
+цилиндра содержит диаметр, перпендикулярный направлению взгляда, поэтому проекция
+цилиндра содержит полосу шириной в проекцию диаметра вдоль проекции его оси,
+закрытую фигурой не дальше оси цилиндра.
+
+Фигура считается закрытой, если во всех ячейках, которых касается прямоугольник,
+ограничивающий ее проекцию, хранится глубина меньшая, чем глубина ближайшей точки фигуры.
+Для быстрого ответа над сеткой строится пирамида: ячейка следующего уровня хранит
+наибольшую глубину четырех ячеек предыдущего. Большая глубина соответствует
+более удаленной точке, как и при сортировке многоугольников.
+"""
+
+from array import array
+from dataclasses import dataclass
+from math import floor, ceil, inf
+from typing import List
+
+from graphics.types import Point3D
+
+
+@dataclass(frozen=True)
+class Occluder:
+    """Цилиндр, целиком лежащий внутри фигуры и используемый для проверки перекрытия"""
+
+    bottom: Point3D
+    """Центр нижнего основания"""
+    top: Point3D
+    """Центр верхнего основания"""
+    radius: float
+
+    def translated(self, dx: float, dy: float, dz: float) -> 'Occluder':
+        delta = Point3D(dx, dy, dz)
+        return Occluder(self.bottom + delta, self.top + delta, self.radius)
+
+
+class OcclusionBuffer:
+    """Иерархический буфер глубины заслоняющих объектов низкого разрешения"""
+
+    CELLS = 64
+
+    def __init__(self, left: float, top: float, width: float, height: float, cells: int = CELLS):
+        """
+        :param left, top, width, height: Область экрана, покрываемая буфером.
+        :param cells: Количество ячеек по каждой стороне, степень двойки.
+        """
+
+        if cells < 1 or cells & (cells - 1) != 0:
+            raise ValueError("Количество ячеек должно быть степенью двойки!")
+
+        if width <= 0 or height <= 0:
+            raise ValueError("Размеры области буфера должны быть положительными!")
+
+        self.__left = left
+        self.__top = top
+        self.__cell_width = width / cells
+        self.__cell_height = height / cells
+        self.__cells = cells
+
+        self.__levels: List[array] = []
+        size = cells
+        while size >= 1:
+            self.__levels.append(array('d', [inf]) * (size * size))
+            size //= 2
+
+        self.__is_pyramid_valid = True
+
+    @property
+    def cells(self) -> int:
+        return self.__cells
+
+    def clear(self) -> None:
+        self.__levels = [array('d', [inf]) * len(level) for level in self.__levels]
+        self.__is_pyramid_valid = True
+
+    def add_occluder(self, left: float, top: float, right: float, bottom: float, depth: float) -> None:
+        """
+        Добавляет заслоняющий объект.
+
+        :param left, top, right, bottom: Прямоугольник экрана, полностью закрытый объектом.
+        Учитываются только ячейки, целиком лежащие в прямоугольнике.
+        :param depth: Наибольшая глубина объекта в пределах прямоугольника.
+        """
+
+        first_column, last_column = self.__inner_range(left, right, self.__left, self.__cell_width)
+        first_row, last_row = self.__inner_range(top, bottom, self.__top, self.__cell_height)
+
+        cells, level = self.__cells, self.__levels[0]
+
+        for row in range(first_row, last_row + 1):
+            for i in range(row * cells + first_column, row * cells + last_column + 1):
+                if depth < level[i]:
+                    level[i] = depth
+                    self.__is_pyramid_valid = False
+
+    def is_occluded(self, left: float, top: float, right: float, bottom: float, depth: float) -> bool:
+        """
+        Проверяет, закрыт ли объект уже добавленными заслоняющими объектами.
+
+        :param left, top, right, bottom: Прямоугольник, ограничивающий проекцию объекта.
+        :param depth: Глубина ближайшей точки объекта.
+        """
+
+        first_column, last_column = self.__outer_range(left, right, self.__left, self.__cell_width)
+        first_row, last_row = self.__outer_range(top, bottom, self.__top, self.__cell_height)
+
+        if first_column > last_column or first_row > last_row:
+            # Объект целиком вне области буфера
+            return True
+
+        if not self.__is_pyramid_valid:
+            self.__build_pyramid()
+
+        # Уровень, на котором прямоугольник занимает не более 2x2 ячеек
+        level = 0
+        while level + 1 < len(self.__levels) and \
+                max(last_column - first_column, last_row - first_row) >> level > 1:
+            level += 1
+
+        if self.__is_covered(level, first_column >> level, last_column >> level,
+                             first_row >> level, last_row >> level, depth):
+            return True
+
+        return level > 0 and self.__is_covered(0, first_column, last_column, first_row, last_row, depth)
+
+    def __is_covered(self, level: int, first_column: int, last_column: int,
+                     first_row: int, last_row: int, depth: float) -> bool:
+        cells, values = self.__cells >> level, self.__levels[level]
+
+        for row in range(first_row, last_row + 1):
+            for i in range(row * cells + first_column, row * cells + last_column + 1):
+                if values[i] >= depth:
+                    return False
+
+        return True
+
+    def __build_pyramid(self) -> None:
+        cells = self.__cells
+
+        for level in range(1, len(self.__levels)):
+            source, target = self.__levels[level - 1], self.__levels[level]
+            source_cells, cells = cells, cells // 2
+
+            for row in range(cells):
+                for column in range(cells):
+                    i = 2 * row * source_cells + 2 * column
+                    target[row * cells + column] = max(
+                        source[i], source[i + 1], source[i + source_cells], source[i + source_cells + 1]
+                    )
+
+        self.__is_pyramid_valid = True
+
+    def __inner_range(self, low: float, high: float, origin: float, cell_size: float):
+        """Номера первой и последней ячеек, целиком лежащих в отрезке [low, high]"""
+
+        return max(ceil((low - origin) / cell_size), 0), \
+            min(floor((high - origin) / cell_size) - 1, self.__cells - 1)
+
+    def __outer_range(self, low: float, high: float, origin: float, cell_size: float):
+        """Номера первой и последней ячеек, пересекающихся с отрезком [low, high]"""
+
+        return max(floor((low - origin) / cell_size), 0), \
+            min(floor((high - origin) / cell_size), self.__cells - 1)
@@ -0,0 +1,372 @@
+"""
+Модуль реализующий вывод проекций фигур без Qt.
+
+Холст (Canvas) принимает многоугольники и отрезки в экранных координатах
+с началом в центре изображения (ось y направлена вниз, как на экране).
+SvgCanvas сразу записывает каждый многоугольник в файл, поэтому память
+не зависит от размера сетки, RasterCanvas закрашивает буфер RGBA.
+MeshRenderer проецирует фигуры и передает их многоугольники холсту
+в порядке алгоритма художника.
+"""
+
+import struct
+import zlib
+from abc import ABC, abstractmethod
+from array import array
+from dataclasses import dataclass, replace
+from math import floor, ceil
+from typing import Optional, Sequence, Tuple, TextIO, BinaryIO, List, Union
+
+from graphics.accel import transform_coords, central_coords, face_depths
+from graphics.figures import AbstractFigure
+from graphics.lighting import Lighting, face_normals
+from graphics.mesh import Mesh
+from graphics.projections import orthographic_coords, SCREEN_AXES
+from graphics.transformation import Transformation
+from graphics.types import Axle
+
+Color = Tuple[int, int, int, int]
+"""Цвет (r, g, b, a), компоненты от 0 до 255"""
+
+
+@dataclass(frozen=True)
+class Style:
+    """Стиль отрисовки многоугольников: обводка и заливка"""
+
+    stroke: Optional[Color] = (0, 0, 0, 255)
+    stroke_width: float = 1
+    fill: Optional[Color] = None
+
+    def shaded(self, intensity: float) -> 'Style':
+        """Стиль с заливкой, затемненной до освещенности intensity от 0 до 1"""
+
+        if self.fill is None:
+            return self
+
+        r, g, b, a = self.fill
+        return replace(self, fill=(round(r * intensity), round(g * intensity), round(b * intensity), a))
+
+
+class Canvas(ABC):
+    """Холст, принимающий примитивы в экранных координатах с началом в центре"""
+
+    def __init__(self, width: int, height: int):
+        if width <= 0 or height <= 0:
+            raise ValueError("Размеры холста должны быть положительными!")
+
+        self._width = width
+        self._height = height
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @abstractmethod
+    def set_style(self, style: Style) -> None:
+        pass
+
+    @abstractmethod
+    def polygon(self, points: Sequence[float]) -> None:
+        """Многоугольник, заданный плоской последовательностью координат (x0, y0, x1, y1, ...)"""
+
+        pass
+
+    @abstractmethod
+    def lines(self, segments: Sequence[float]) -> None:
+        """Отрезки, заданные плоской последовательностью (x0, y0, x1, y1, ...) по два конца на отрезок"""
+
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'Canvas':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _svg_color(color: Optional[Color]) -> str:
+    if color is None:
+        return 'none'
+
+    r, g, b, _ = color
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+class SvgCanvas(Canvas):
+    """Холст, потоково записывающий примитивы в файл SVG"""
+
+    def __init__(self, file: Union[str, TextIO], width: int, height: int, precision: int = 2):
+        """
+        :param file: Путь к файлу или открытый текстовый поток.
+        :param precision: Количество знаков после запятой в координатах.
+        """
+
+        super().__init__(width, height)
+
+        self.__owns_file = isinstance(file, str)
+        self.__file: TextIO = open(file, 'w', encoding='utf-8') if self.__owns_file else file
+        self.__format = f'{{:.{precision}f}}'
+        self.__has_group = False
+
+        self.__file.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}">\n'
+            f'<g transform="translate({width / 2} {height / 2})" stroke-linejoin="round">\n'
+        )
+
+    def set_style(self, style: Style) -> None:
+        if self.__has_group:
+            self.__file.write('</g>\n')
+
+        attributes = [f'stroke="{_svg_color(style.stroke)}"', f'fill="{_svg_color(style.fill)}"']
+
+        if style.stroke is not None:
+            attributes.append(f'stroke-width="{style.stroke_width}"')
+            if style.stroke[3] != 255:
+                attributes.append(f'stroke-opacity="{style.stroke[3] / 255:.3f}"')
+
+        if style.fill is not None and style.fill[3] != 255:
+            attributes.append(f'fill-opacity="{style.fill[3] / 255:.3f}"')
+
+        self.__file.write(f'<g {" ".join(attributes)}>\n')
+        self.__has_group = True
+
+    def polygon(self, points: Sequence[float]) -> None:
+        f = self.__format.format
+        coords = ' '.join(f'{f(points[i])},{f(points[i + 1])}' for i in range(0, len(points), 2))
+        self.__file.write(f'<polygon points="{coords}"/>\n')
+
+    def lines(self, segments: Sequence[float]) -> None:
+        f = self.__format.format
+        path = ''.join(
+            f'M{f(segments[i])} {f(segments[i + 1])}L{f(segments[i + 2])} {f(segments[i + 3])}'
+            for i in range(0, len(segments), 4)
+        )
+        self.__file.write(f'<path fill="none" d="{path}"/>\n')
+
+    def close(self) -> None:
+        if self.__file is None:
+            return
+
+        if self.__has_group:
+            self.__file.write('</g>\n')
+
+        self.__file.write('</g>\n</svg>\n')
+
+        if self.__owns_file:
+            self.__file.close()
+
+        self.__file = None
+
+
+class RasterCanvas(Canvas):
+    """
+    Холст, закрашивающий буфер RGBA (по 4 байта на пиксель, строки сверху вниз).
+    Многоугольники заливаются построчно по правилу четности, цвета смешиваются
+    по альфа-каналу. Сглаживание не выполняется.
+    """
+
+    def __init__(self, width: int, height: int, background: Color = (0, 0, 0, 0)):
+        super().__init__(width, height)
+
+        self.__pixels = bytearray(bytes(background) * (width * height))
+        self.__style = Style()
+
+    @property
+    def pixels(self) -> bytearray:
+        return self.__pixels
+
+    def set_style(self, style: Style) -> None:
+        self.__style = style
+
+    def polygon(self, points: Sequence[float]) -> None:
+        cx, cy = self._width / 2, self._height / 2
+        xs = [points[i] + cx for i in range(0, len(points), 2)]
+        ys = [points[i] + cy for i in range(1, len(points), 2)]
+
+        if self.__style.fill is not None:
+            self.__fill_polygon(xs, ys, self.__style.fill)
+
+        if self.__style.stroke is not None:
+            n = len(xs)
+            for j in range(n):
+                k = j + 1 - n
+                self.__draw_line(xs[j], ys[j], xs[k], ys[k])
+
+    def lines(self, segments: Sequence[float]) -> None:
+        if self.__style.stroke is None:
+            return
+
+        cx, cy = self._width / 2, self._height / 2
+
+        for i in range(0, len(segments), 4):
+            self.__draw_line(segments[i] + cx, segments[i + 1] + cy, segments[i + 2] + cx, segments[i + 3] + cy)
+
+    def write_png(self, file: Union[str, BinaryIO]) -> None:
+        """Записывает буфер в файл PNG (RGBA, 8 бит на канал)"""
+
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+        stride = 4 * self._width
+        raw = b''.join(
+            b'\x00' + bytes(self.__pixels[row * stride:(row + 1) * stride])
+            for row in range(self._height)
+        )
+        data = b'\x89PNG\r\n\x1a\n' + \
+            chunk(b'IHDR', struct.pack('>IIBBBBB', self._width, self._height, 8, 6, 0, 0, 0)) + \
+            chunk(b'IDAT', zlib.compress(raw)) + \
+            chunk(b'IEND', b'')
+
+        if isinstance(file, str):
+            with open(file, 'wb') as stream:
+                stream.write(data)
+        else:
+            file.write(data)
+
+    def __blend(self, x: int, y: int, color: Color) -> None:
+        r, g, b, a = color
+        i = 4 * (y * self._width + x)
+        p = self.__pixels
+
+        if a == 255:
+            p[i:i + 4] = bytes(color)
+            return
+
+        # Наложение "source over" для непремультиплицированных цветов
+        da = p[i + 3]
+        out_a = a + da * (255 - a) / 255
+
+        if out_a == 0:
+            return
+
+        k_src = a / out_a
+        k_dst = da * (255 - a) / 255 / out_a
+        p[i] = round(r * k_src + p[i] * k_dst)
+        p[i + 1] = round(g * k_src + p[i + 1] * k_dst)
+        p[i + 2] = round(b * k_src + p[i + 2] * k_dst)
+        p[i + 3] = round(out_a)
+
+    def __fill_polygon(self, xs: List[float], ys: List[float], color: Color) -> None:
+        n = len(xs)
+        y_from = max(0, ceil(min(ys) - 0.5))
+        y_to = min(self._height - 1, floor(max(ys) - 0.5))
+
+        for y in range(y_from, y_to + 1):
+            # Пересечения строки по центрам пикселей с ребрами многоугольника
+            sy = y + 0.5
+            crossings = []
+
+            for j in range(n):
+                k = j + 1 - n
+                y0, y1 = ys[j], ys[k]
+
+                if (y0 <= sy) != (y1 <= sy):
+                    crossings.append(xs[j] + (sy - y0) * (xs[k] - xs[j]) / (y1 - y0))
+
+            crossings.sort()
+
+            for i in range(0, len(crossings) - 1, 2):
+                x_from = max(0, ceil(crossings[i] - 0.5))
+                x_to = min(self._width - 1, floor(crossings[i + 1] - 0.5))
+
+                for x in range(x_from, x_to + 1):
+                    self.__blend(x, y, color)
+
+    def __draw_line(self, x0: float, y0: float, x1: float, y1: float) -> None:
+        color = self.__style.stroke
+        half = max(0, round(self.__style.stroke_width) - 1) // 2
+        steps = max(1, ceil(max(abs(x1 - x0), abs(y1 - y0))))
+
+        for s in range(steps + 1):
+            t = s / steps
+            x = floor(x0 + (x1 - x0) * t)
+            y = floor(y0 + (y1 - y0) * t)
+
+            for py in range(max(0, y - half), min(self._height, y + half + 1)):
+                for px in range(max(0, x - half), min(self._width, x + half + 1)):
+                    self.__blend(px, py, color)
+
+
+class MeshRenderer:
+    """
+    Вывод фигур на холст. Вершины всех фигур хранятся в плоских буферах,
+    многоугольники передаются холсту по одному от дальних к ближним,
+    без построения списка команд отрисовки.
+    """
+
+    SHADE_LEVELS = 32
+    """Количество уровней освещенности: соседние многоугольники с одним уровнем не меняют стиль холста"""
+
+    def __init__(self, parts: Sequence[Tuple[AbstractFigure, Style]], axle: Axle = 'z',
+                 distance: Optional[float] = None, lighting: Optional[Lighting] = None):
+        """
+        :param parts: Фигуры и стили их многоугольников.
+        :param axle: Ось, вдоль которой выполняется проекция.
+        :param distance: Расстояние от центра проекции до экрана. Если не задано, проекция ортографическая.
+        :param lighting: Модель освещения заливки.
+        """
+
+        if axle not in SCREEN_AXES:
+            raise ValueError(f"Неизвестная ось {axle}!")
+
+        self.__axle = axle
+        self.__distance = distance
+        self.__lighting = lighting
+
+        self.__coords = array('d')
+        self.__faces = array('i')
+        self.__face_starts = array('i', [0])
+        self.__styles: List[Style] = []
+        self.__normals = array('d')
+
+        for figure, style in parts:
+            mesh = figure if isinstance(figure, Mesh) else Mesh.from_figure(figure)
+            offset = len(self.__coords) // 3
+            faces_offset = len(self.__faces)
+
+            self.__coords.extend(mesh.vertices)
+            self.__faces.extend(i + offset for i in mesh.faces)
+            self.__face_starts.extend(start + faces_offset for start in mesh.face_starts[1:])
+            self.__styles += [style] * mesh.faces_count
+
+            if lighting is not None:
+                self.__normals.extend(face_normals(mesh.polygons))
+
+        self.__transformed = array('d', self.__coords)
+        self.__screen = array('d', bytes(8 * 2 * (len(self.__coords) // 3)))
+        self.__depths = array('d', bytes(8 * len(self.__styles)))
+
+    def draw(self, canvas: Canvas, transformation: Transformation) -> None:
+        matrix = transformation.to_affine_matrix()
+        transform_coords(matrix, self.__coords, self.__transformed)
+
+        if self.__distance is None:
+            orthographic_coords(self.__transformed, self.__axle, self.__screen)
+        else:
+            central_coords(self.__transformed, self.__axle, self.__distance, self.__screen)
+
+        intensities = None
+        if self.__lighting is not None:
+            levels = self.SHADE_LEVELS
+            intensities = [round(value * levels) / levels for value in self.__lighting.shade(self.__normals, matrix)]
+
+        faces, starts, coords, screen = self.__faces, self.__face_starts, self.__transformed, self.__screen
+        depths = face_depths(coords, faces, starts, SCREEN_AXES[self.__axle][2], self.__depths)
+
+        style = None
+        for i in sorted(range(len(depths)), key=depths.__getitem__, reverse=True):
+            current = self.__styles[i] if intensities is None else self.__styles[i].shaded(intensities[i])
+
+            if current != style:
+                style = current
+                canvas.set_style(style)
+
+            canvas.polygon([screen[2 * faces[j] + k] for j in range(starts[i], starts[i + 1]) for k in (0, 1)])
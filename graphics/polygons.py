@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
-from math import pi, cos, sin
+from math import isclose
 from typing import List
 
-from graphics.help_functions import avg, cyclic_pare_iter
+from graphics.help_functions import avg, cyclic_pare_iter, unit_circle
 from graphics.types import Point3D, Matrix
 
 
@@ -62,6 +62,7 @@ class Triangle(AbstractPolygon):
 
 
 class Rectangle(AbstractPolygon):
+    TOLERANCE = 1e-9
 
     def __init__(self,
                  top_left: Point3D, top_right: Point3D,
@@ -77,7 +78,11 @@ class Rectangle(AbstractPolygon):
         self.__bottom_right = bottom_right
 
     def copy(self) -> 'Rectangle':
-        return Rectangle(self.__top_left, self.__top_right, self.__bottom_left, self.__bottom_right, False)
+        return Rectangle(
+            self.__top_left.copy(), self.__top_right.copy(),
+            self.__bottom_left.copy(), self.__bottom_right.copy(),
+            False
+        )
 
     @property
     def points(self) -> List[Point3D]:
@@ -94,7 +99,8 @@ class Rectangle(AbstractPolygon):
             cur_top = prev_top + step
             cur_bottom = prev_bottom + step
 
-            res.append(Rectangle(prev_top, cur_top, prev_bottom, cur_bottom))
+            # Части прямоугольника - прямоугольники, повторная проверка не нужна
+            res.append(Rectangle(prev_top, cur_top, prev_bottom, cur_bottom, False))
 
             prev_top = cur_top
             prev_bottom = cur_bottom
@@ -103,13 +109,15 @@ class Rectangle(AbstractPolygon):
 
     @staticmethod
     def _is_rectangle(tl: Point3D, tr: Point3D, bl: Point3D, br: Point3D) -> bool:
-        if tl.distance_between(tr) != bl.distance_between(br):
+        """Сравнивает противоположные стороны и диагонали с относительным допуском TOLERANCE"""
+
+        if not isclose(tl.distance_between(tr), bl.distance_between(br), rel_tol=Rectangle.TOLERANCE):
             return False
 
-        if tl.distance_between(bl) != tr.distance_between(br):
+        if not isclose(tl.distance_between(bl), tr.distance_between(br), rel_tol=Rectangle.TOLERANCE):
             return False
 
-        if tl.distance_between(br) != tr.distance_between(bl):
+        if not isclose(tl.distance_between(br), tr.distance_between(bl), rel_tol=Rectangle.TOLERANCE):
             return False
 
         return True
@@ -117,12 +125,9 @@ class Rectangle(AbstractPolygon):
 
 class RegularPolygon(BasePolygon):
     def __init__(self, center: Point3D, radius: float, sides_count: int):
-        val = 2 * pi / sides_count
+        cos_table, sin_table = unit_circle(sides_count)
 
         super().__init__([
-            Point3D(
-                center.x + radius * cos(val * i),
-                center.y,
-                center.z + radius * sin(val * i),
-            ) for i in range(sides_count)
+            Point3D(center.x + radius * c, center.y, center.z + radius * s)
+            for c, s in zip(cos_table, sin_table)
         ])
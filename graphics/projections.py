@@ -2,6 +2,9 @@
 Модуль содержащий функции проектирования.
 """
 
+from array import array
+from typing import Sequence, Optional
+
 from graphics.types import Matrix, Axle
 
 
@@ -28,3 +31,67 @@ def central(axle: Axle, distance_from_screen: float) -> Matrix:
     matrix[-1][i] = 1 / distance_from_screen
 
     return matrix
+
+
+SCREEN_AXES = {
+    'x': (2, 1, 0),
+    'y': (0, 2, 1),
+    'z': (0, 1, 2),
+}
+"""
+Для каждой плоскости проекции - индексы координат, отображаемых
+на горизонтальную и вертикальную оси экрана, и индекс координаты глубины.
+Вертикальная ось экрана направлена вниз, поэтому ее координата берется с обратным знаком.
+"""
+
+
+def orthographic_coords(coords: Sequence[float], axle: Axle, out: Optional[array] = None) -> array:
+    """
+    Ортографическая проекция массива точек без умножения на матрицу:
+    выбор двух координат и смена знака вертикальной.
+    Результат записывается в out без создания промежуточных массивов.
+
+    :param coords: Плоский массив координат точек (x0, y0, z0, x1, ...).
+    :param axle: Плоскость проекции.
+    :param out: Массив для записи результата. Если не задан, создается новый массив.
+    :return: Плоский массив экранных координат (u0, v0, u1, v1, ...).
+    """
+
+    u, v, _ = SCREEN_AXES[axle]
+    result = out if out is not None else array('d', bytes(8 * (len(coords) // 3 * 2)))
+
+    j = 0
+    for i in range(0, len(coords), 3):
+        result[j] = coords[i + u]
+        result[j + 1] = -coords[i + v]
+        j += 2
+
+    return result
+
+
+def central_coords(coords: Sequence[float], axle: Axle, distance_from_screen: float,
+                   out: Optional[array] = None) -> array:
+    """
+    Центральная проекция массива точек. Умножение на матрицу central
+    и деление на однородную координату выполняются за один проход
+    без создания промежуточных массивов.
+
+    :param coords: Плоский массив координат точек (x0, y0, z0, x1, ...).
+    :param axle: Плоскость проекции.
+    :param distance_from_screen: Расстояние от центра проекции до экрана.
+    :param out: Массив для записи результата. Если не задан, создается новый массив.
+    :return: Плоский массив экранных координат (u0, v0, u1, v1, ...).
+    """
+
+    u, v, depth = SCREEN_AXES[axle]
+    k = 1 / distance_from_screen
+    result = out if out is not None else array('d', bytes(8 * (len(coords) // 3 * 2)))
+
+    j = 0
+    for i in range(0, len(coords), 3):
+        w = 1 / (1 + coords[i + depth] * k)
+        result[j] = coords[i + u] * w
+        result[j + 1] = -coords[i + v] * w
+        j += 2
+
+    return result
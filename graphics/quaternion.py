@@ -0,0 +1,152 @@
+"""
+Модуль реализующий кватернионы для представления ориентации в пространстве.
+"""
+
+from dataclasses import dataclass
+from math import sqrt, acos, sin
+
+from graphics.affine import sin_cos
+from graphics.types import Point3D, Matrix, Axle
+
+
+@dataclass(frozen=True)
+class Quaternion:
+    """Кватернион w + xi + yj + zk"""
+
+    w: float
+    x: float
+    y: float
+    z: float
+
+    @staticmethod
+    def identity() -> 'Quaternion':
+        """Возвращает кватернион, не выполняющий поворота"""
+
+        return Quaternion(1, 0, 0, 0)
+
+    @staticmethod
+    def from_axis_angle(axis: Point3D, angle_in_degrees: float) -> 'Quaternion':
+        """
+        Возвращает единичный кватернион поворота вокруг произвольной оси
+        (против часовой стрелки, если смотреть с конца оси).
+
+        :param axis: направление оси поворота
+        :param angle_in_degrees: угол поворота
+        """
+
+        length = sqrt(axis.x ** 2 + axis.y ** 2 + axis.z ** 2)
+
+        if length == 0:
+            raise ValueError("Ось поворота не может быть нулевым вектором!")
+
+        sin_value, cos_value = sin_cos(angle_in_degrees / 2)
+        k = sin_value / length
+
+        return Quaternion(cos_value, axis.x * k, axis.y * k, axis.z * k)
+
+    @staticmethod
+    def from_axle(angle_in_degrees: float, axle: Axle) -> 'Quaternion':
+        """
+        Возвращает кватернион поворота вокруг оси координат,
+        матрица которого совпадает с affine.rotate(angle_in_degrees, axle).
+        """
+
+        sin_value, cos_value = sin_cos(angle_in_degrees / 2)
+
+        match axle:
+            case 'x':
+                return Quaternion(cos_value, sin_value, 0, 0)
+            case 'y':
+                # affine.rotate поворачивает вокруг оси Y в противоположном направлении
+                return Quaternion(cos_value, 0, -sin_value, 0)
+            case 'z':
+                return Quaternion(cos_value, 0, 0, sin_value)
+            case _:
+                raise ValueError(f"Неизвестная ось {axle}!")
+
+    def __mul__(self, other: 'Quaternion') -> 'Quaternion':
+        """Композиция поворотов: сначала выполняется other, затем self"""
+
+        return Quaternion(
+            self.w * other.w - self.x * other.x - self.y * other.y - self.z * other.z,
+            self.w * other.x + self.x * other.w + self.y * other.z - self.z * other.y,
+            self.w * other.y - self.x * other.z + self.y * other.w + self.z * other.x,
+            self.w * other.z + self.x * other.y - self.y * other.x + self.z * other.w,
+        )
+
+    def dot(self, other: 'Quaternion') -> float:
+        return self.w * other.w + self.x * other.x + self.y * other.y + self.z * other.z
+
+    def norm(self) -> float:
+        return sqrt(self.dot(self))
+
+    def normalized(self) -> 'Quaternion':
+        n = self.norm()
+        return Quaternion(self.w / n, self.x / n, self.y / n, self.z / n)
+
+    def conjugate(self) -> 'Quaternion':
+        """Для единичного кватерниона - обратный поворот"""
+
+        return Quaternion(self.w, -self.x, -self.y, -self.z)
+
+    def rotate(self, point: Point3D) -> Point3D:
+        """Поворачивает точку единичным кватернионом"""
+
+        p = self * Quaternion(0, point.x, point.y, point.z) * self.conjugate()
+        return Point3D(p.x, p.y, p.z)
+
+    def to_matrix(self, scale: float = 1) -> Matrix:
+        """
+        Возвращает матрицу поворота единичного кватерниона,
+        совмещенную с равномерным масштабированием.
+
+        :param scale: коэффициент масштабирования
+        """
+
+        w, x, y, z = self.w, self.x, self.y, self.z
+        k = 2 * scale
+
+        return Matrix([
+            [scale - k * (y * y + z * z), k * (x * y - w * z), k * (x * z + w * y), 0],
+            [k * (x * y + w * z), scale - k * (x * x + z * z), k * (y * z - w * x), 0],
+            [k * (x * z - w * y), k * (y * z + w * x), scale - k * (x * x + y * y), 0],
+            [0, 0, 0, 1]
+        ])
+
+    @staticmethod
+    def slerp(a: 'Quaternion', b: 'Quaternion', t: float) -> 'Quaternion':
+        """
+        Сферическая линейная интерполяция единичных кватернионов.
+
+        :param a: ориентация при t = 0
+        :param b: ориентация при t = 1
+        :param t: параметр интерполяции от 0 до 1
+        """
+
+        cos_theta = a.dot(b)
+
+        # Поворот по кратчайшей дуге
+        if cos_theta < 0:
+            b = Quaternion(-b.w, -b.x, -b.y, -b.z)
+            cos_theta = -cos_theta
+
+        # Для близких ориентаций достаточно нормированной линейной интерполяции
+        if cos_theta > 0.9995:
+            return Quaternion(
+                a.w + (b.w - a.w) * t,
+                a.x + (b.x - a.x) * t,
+                a.y + (b.y - a.y) * t,
+                a.z + (b.z - a.z) * t,
+            ).normalized()
+
+        theta = acos(cos_theta)
+        sin_theta = sin(theta)
+        ka = sin((1 - t) * theta) / sin_theta
+        kb = sin(t * theta) / sin_theta
+
+        return Quaternion(
+            ka * a.w + kb * b.w,
+            ka * a.x + kb * b.x,
+            ka * a.y + kb * b.y,
+            ka * a.z + kb * b.z,
+        )
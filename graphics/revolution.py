@@ -0,0 +1,209 @@
+"""
+Модуль реализующий построение поверхностей вращения.
+
+Поверхность задается профилем - ломаной в полуплоскости (радиус, высота),
+которая вращается вокруг вертикальной оси. Каждая точка профиля с ненулевым
+радиусом дает кольцо вершин, точка с нулевым радиусом - одну вершину на оси (полюс).
+Вершины и индексы многоугольников каждого кольца заполняются срезами плоских
+массивов, без создания объектов точек и многоугольников.
+"""
+
+from array import array
+from typing import Sequence, Tuple, List
+
+from graphics.help_functions import unit_circle
+from graphics.mesh import Mesh, VERTEX_TYPECODE, INDEX_TYPECODE
+from graphics.occlusion import Occluder
+from graphics.types import Point3D
+
+ProfilePoint = Tuple[float, float]
+"""Точка профиля: (радиус, высота над центром основания)"""
+
+
+def revolve(profile: Sequence[ProfilePoint], segments: int, base_center: Point3D) -> Mesh:
+    """
+    Строит сетку поверхности вращения профиля вокруг вертикальной оси,
+    проходящей через base_center.
+
+    Вершины кольца идут по углу 2 * pi * j / segments от оси x к оси z.
+    Между соседними кольцами строятся четырехугольники, между кольцом и
+    полюсом - треугольники. Если профиль задан снизу вверх, а радиусы
+    неотрицательны, обход всех многоугольников согласован (нормали наружу).
+
+    :param profile: Точки профиля, не менее двух.
+    :param segments: Количество сегментов по окружности, не менее трех.
+    :param base_center: Точка оси, от которой отсчитывается высота профиля.
+    :return: Сетка поверхности с центром в середине оси между крайними точками профиля.
+    """
+
+    if len(profile) < 2:
+        raise ValueError("Профиль должен содержать не менее двух точек!")
+
+    if segments < 3:
+        raise ValueError("Количество сегментов должно быть не менее 3!")
+
+    cos_table, sin_table = unit_circle(segments)
+    cx, cy, cz = base_center.x, base_center.y, base_center.z
+
+    vertices = array(VERTEX_TYPECODE)
+    # Индекс первой вершины каждой точки профиля и является ли она полюсом
+    rings = []
+
+    for radius, height in profile:
+        if radius < 0:
+            raise ValueError("Радиус профиля не может быть отрицательным!")
+
+        start = len(vertices) // 3
+
+        if radius == 0:
+            vertices.extend((cx, cy + height, cz))
+            rings.append((start, True))
+            continue
+
+        ring = array(VERTEX_TYPECODE, bytes(24 * segments))
+        ring[0::3] = array(VERTEX_TYPECODE, [cx + radius * c for c in cos_table])
+        ring[1::3] = array(VERTEX_TYPECODE, [cy + height] * segments)
+        ring[2::3] = array(VERTEX_TYPECODE, [cz + radius * s for s in sin_table])
+        vertices.extend(ring)
+        rings.append((start, False))
+
+    faces = array(INDEX_TYPECODE)
+    face_starts = array(INDEX_TYPECODE, [0])
+    ring_offsets = range(segments)
+    # Номера следующих вершин кольца с переходом через начало
+    next_offsets = list(range(1, segments)) + [0]
+
+    for (a, a_is_pole), (b, b_is_pole) in zip(rings, rings[1:]):
+        if a_is_pole and b_is_pole:
+            continue
+
+        offset = len(faces)
+
+        if a_is_pole:
+            # Треугольники (полюс, b[j], b[j + 1])
+            block = array(INDEX_TYPECODE, bytes(12 * segments))
+            block[0::3] = array(INDEX_TYPECODE, [a]) * segments
+            block[1::3] = array(INDEX_TYPECODE, [b + j for j in ring_offsets])
+            block[2::3] = array(INDEX_TYPECODE, [b + j for j in next_offsets])
+            size = 3
+        elif b_is_pole:
+            # Треугольники (a[j], полюс, a[j + 1])
+            block = array(INDEX_TYPECODE, bytes(12 * segments))
+            block[0::3] = array(INDEX_TYPECODE, [a + j for j in ring_offsets])
+            block[1::3] = array(INDEX_TYPECODE, [b]) * segments
+            block[2::3] = array(INDEX_TYPECODE, [a + j for j in next_offsets])
+            size = 3
+        else:
+            # Четырехугольники (a[j], b[j], b[j + 1], a[j + 1])
+            block = array(INDEX_TYPECODE, bytes(16 * segments))
+            block[0::4] = array(INDEX_TYPECODE, [a + j for j in ring_offsets])
+            block[1::4] = array(INDEX_TYPECODE, [b + j for j in ring_offsets])
+            block[2::4] = array(INDEX_TYPECODE, [b + j for j in next_offsets])
+            block[3::4] = array(INDEX_TYPECODE, [a + j for j in next_offsets])
+            size = 4
+
+        faces.extend(block)
+        face_starts.extend(range(offset + size, offset + size * segments + 1, size))
+
+    heights = [height for _, height in profile]
+    center = Point3D(cx, cy + (min(heights) + max(heights)) / 2, cz)
+
+    return Mesh(vertices, faces, face_starts, center)
+
+
+def inscribed_cylinders(profile: Sequence[ProfilePoint], base_center: Point3D, count: int = 6) -> List[Occluder]:
+    """
+    Цилиндры с осью на оси вращения, лежащие внутри тела вращения профиля.
+
+    Высота профиля делится на count равных слоев. Каждый цилиндр занимает свой слой
+    и по половине соседних, чтобы проекции соседних цилиндров перекрывались,
+    а его радиус равен наименьшему радиусу профиля в пределах занятой высоты.
+    Цилиндры нулевого радиуса отбрасываются.
+    """
+
+    heights = [height for _, height in profile]
+    low, high = min(heights), max(heights)
+    step = (high - low) / count
+    cylinders = []
+
+    for i in range(count):
+        bottom, top = max(low, low + step * (i - 0.5)), min(high, low + step * (i + 1.5))
+        radius = _min_radius(profile, bottom, top)
+
+        if 0 < radius < float('inf'):
+            cylinders.append(Occluder(
+                Point3D(base_center.x, base_center.y + bottom, base_center.z),
+                Point3D(base_center.x, base_center.y + top, base_center.z),
+                radius
+            ))
+
+    return cylinders
+
+
+def _min_radius(profile: Sequence[ProfilePoint], low: float, high: float) -> float:
+    """Наименьший радиус отрезков профиля, проходящих в полосе высот (low, high)"""
+
+    result = float('inf')
+
+    for (r1, h1), (r2, h2) in zip(profile, profile[1:]):
+        if max(h1, h2) <= low or min(h1, h2) >= high:
+            continue
+
+        if h1 == h2:
+            result = min(result, r1, r2)
+            continue
+
+        # Радиусы в точках пересечения отрезка с границами полосы
+        for height in (max(min(h1, h2), low), min(max(h1, h2), high)):
+            result = min(result, r1 + (r2 - r1) * (height - h1) / (h2 - h1))
+
+    return result
+
+
+def cone_profile(radius: float, height: float, levels_count: int = 0) -> Sequence[ProfilePoint]:
+    """
+    Профиль конуса с закрытым основанием и промежуточными уровнями,
+    на каждом из которых радиус уменьшается вдвое.
+    """
+
+    step = height / (levels_count + 1)
+
+    return [(0, 0), (radius, 0)] + \
+        [(radius / 2 ** i, step * i) for i in range(1, levels_count + 1)] + \
+        [(0, height)]
+
+
+def cylinder_profile(radius: float, height: float) -> Sequence[ProfilePoint]:
+    """Профиль цилиндра с закрытыми основаниями"""
+
+    return [(0, 0), (radius, 0), (radius, height), (0, height)]
+
+
+def tiered_profile(radius: float, height: float, tiers_count: int,
+                   shrink: float = 0.7, overhang: float = 0.4) -> Sequence[ProfilePoint]:
+    """
+    Профиль ярусной кроны: поставленные друг на друга усеченные конусы,
+    каждый следующий уже предыдущего.
+
+    :param tiers_count: Количество ярусов, не менее одного.
+    :param shrink: Отношение радиуса основания яруса к радиусу основания предыдущего яруса.
+    :param overhang: Доля радиуса основания яруса, на которую он выступает над верхом нижнего яруса.
+    """
+
+    if tiers_count < 1:
+        raise ValueError("Количество ярусов должно быть не менее одного!")
+
+    step = height / tiers_count
+    profile = [(0, 0)]
+    tier_radius = radius
+
+    for i in range(tiers_count):
+        profile.append((tier_radius, step * i))
+        tier_radius *= shrink
+
+        if i + 1 < tiers_count:
+            profile.append((tier_radius * (1 - overhang), step * (i + 1)))
+
+    profile.append((0, height))
+
+    return profile
@@ -0,0 +1,184 @@
+"""
+Модуль реализующий разбиение многоугольников полигональной сетки.
+
+Операторы разбиения обрабатывают все выбранные многоугольники сетки за один вызов
+и на любую глубину. Новые вершины на ребрах создаются один раз и разделяются
+соседними многоугольниками, поэтому разбиение не порождает трещин между ними.
+Вершины хранятся в плоском массиве координат, объекты точек не создаются.
+"""
+
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from graphics.mesh import Mesh, VERTEX_TYPECODE, INDEX_TYPECODE
+
+Face = Sequence[int]
+
+
+class _Refinement:
+    """Состояние одного прохода разбиения: новые вершины и многоугольники"""
+
+    def __init__(self, vertices: array):
+        self.vertices = array(VERTEX_TYPECODE, vertices)
+        self.faces = array(INDEX_TYPECODE)
+        self.face_starts = array(INDEX_TYPECODE, [0])
+        self.__edge_points: Dict[Tuple[int, int, int, int], int] = {}
+
+    def add_face(self, face: Iterable[int]) -> None:
+        self.faces.extend(face)
+        self.face_starts.append(len(self.faces))
+
+    def edge_point(self, a: int, b: int, k: int, n: int) -> int:
+        """
+        Вершина, делящая ребро (a, b) в отношении k : (n - k).
+        Для ребра, общего для нескольких многоугольников, вершина создается один раз.
+        """
+
+        if k == 0:
+            return a
+
+        if k == n:
+            return b
+
+        key = (a, b, k, n) if a < b else (b, a, n - k, n)
+        index = self.__edge_points.get(key)
+
+        if index is None:
+            v = self.vertices
+            t = k / n
+            index = self.__edge_points[key] = len(v) // 3
+            v.extend((
+                v[3 * a] + (v[3 * b] - v[3 * a]) * t,
+                v[3 * a + 1] + (v[3 * b + 1] - v[3 * a + 1]) * t,
+                v[3 * a + 2] + (v[3 * b + 2] - v[3 * a + 2]) * t,
+            ))
+
+        return index
+
+    def centroid(self, face: Face) -> int:
+        """Новая вершина в среднем арифметическом вершин многоугольника"""
+
+        v = self.vertices
+        n = len(face)
+        index = len(v) // 3
+
+        v.extend((
+            sum(v[3 * i] for i in face) / n,
+            sum(v[3 * i + 1] for i in face) / n,
+            sum(v[3 * i + 2] for i in face) / n,
+        ))
+
+        return index
+
+
+Splitter = Callable[[_Refinement, Face], List[List[int]]]
+
+
+def _refine(mesh: Mesh, splitter: Splitter, depth: int, selection: Optional[Iterable[int]]) -> Mesh:
+    """
+    Применяет разбиение к выбранным многоугольникам depth раз.
+    Части разбитого многоугольника занимают его место в порядке многоугольников
+    и разбиваются на следующих проходах.
+    """
+
+    if depth < 0:
+        raise ValueError("Глубина разбиения не может быть отрицательной!")
+
+    selected = None if selection is None else set(selection)
+    vertices, faces, starts = mesh.vertices, mesh.faces, mesh.face_starts
+
+    for _ in range(depth):
+        refinement = _Refinement(vertices)
+        next_selected = None if selected is None else set()
+
+        for i in range(len(starts) - 1):
+            face = faces[starts[i]:starts[i + 1]]
+
+            if selected is not None and i not in selected:
+                refinement.add_face(face)
+                continue
+
+            for child in splitter(refinement, face):
+                if next_selected is not None:
+                    next_selected.add(len(refinement.face_starts) - 1)
+
+                refinement.add_face(child)
+
+        vertices, faces, starts = refinement.vertices, refinement.faces, refinement.face_starts
+        selected = next_selected
+
+    return Mesh(vertices, faces, starts, mesh.center.copy())
+
+
+def _midpoint_split(refinement: _Refinement, face: Face) -> List[List[int]]:
+    n = len(face)
+    middles = [refinement.edge_point(face[j], face[j + 1 - n], 1, 2) for j in range(n)]
+
+    if n == 3:
+        return [
+            [face[0], middles[0], middles[2]],
+            [middles[0], face[1], middles[1]],
+            [middles[2], middles[1], face[2]],
+            middles,
+        ]
+
+    center = refinement.centroid(face)
+
+    return [[face[j], middles[j], center, middles[j - 1]] for j in range(n)]
+
+
+def _centroid_fan(refinement: _Refinement, face: Face) -> List[List[int]]:
+    n = len(face)
+    center = refinement.centroid(face)
+
+    return [[face[j], face[j + 1 - n], center] for j in range(n)]
+
+
+def midpoint_split(mesh: Mesh, depth: int = 1, selection: Optional[Iterable[int]] = None) -> Mesh:
+    """
+    Разбиение по серединам ребер. Треугольник делится на четыре треугольника,
+    многоугольник с n > 3 вершинами - на n четырехугольников с общей вершиной
+    в его центре (квадрат - на четыре квадрата).
+
+    :param depth: Количество проходов разбиения.
+    :param selection: Номера разбиваемых многоугольников. По умолчанию разбиваются все.
+    """
+
+    return _refine(mesh, _midpoint_split, depth, selection)
+
+
+def centroid_fan(mesh: Mesh, depth: int = 1, selection: Optional[Iterable[int]] = None) -> Mesh:
+    """
+    Веерное разбиение: каждое ребро многоугольника соединяется с его центром,
+    многоугольник с n вершинами делится на n треугольников.
+
+    :param depth: Количество проходов разбиения.
+    :param selection: Номера разбиваемых многоугольников. По умолчанию разбиваются все.
+    """
+
+    return _refine(mesh, _centroid_fan, depth, selection)
+
+
+def strip_split(mesh: Mesh, count: int, selection: Optional[Iterable[int]] = None) -> Mesh:
+    """
+    Разбиение четырехугольников (a, b, c, d) на count полос вдоль ребер a-d и b-c.
+    Многоугольники с другим количеством вершин не изменяются.
+
+    :param count: Количество полос.
+    :param selection: Номера разбиваемых многоугольников. По умолчанию разбиваются все.
+    """
+
+    if count < 1:
+        raise ValueError("Количество полос должно быть не менее одной!")
+
+    def split(refinement: _Refinement, face: Face) -> List[List[int]]:
+        if len(face) != 4:
+            return [list(face)]
+
+        a, b, c, d = face
+        top = [refinement.edge_point(a, d, k, count) for k in range(count + 1)]
+        bottom = [refinement.edge_point(b, c, k, count) for k in range(count + 1)]
+
+        return [[top[k], bottom[k], bottom[k + 1], top[k + 1]] for k in range(count)]
+
+    return _refine(mesh, split, 1, selection)
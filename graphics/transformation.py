@@ -1,33 +1,143 @@
-from graphics import affine
+from graphics.quaternion import Quaternion
 from graphics.types import Matrix, Point3D
 from .help_functions import increase_angle
 
 
 class Transformation:
+    """
+    Преобразование фигуры: поворот и равномерное масштабирование.
+
+    Ориентация хранится единичным кватернионом. Приращения поворота
+    накапливаются в нем без пересчета тригонометрии по полному углу,
+    а матрица строится один раз после каждого изменения.
+    Углы x_rotation и y_rotation хранят накопленные повороты вокруг осей X и Y;
+    их явная установка задает ориентацию rotate(x, 'x') * rotate(y, 'y').
+    """
+
     def __init__(self,
                  x_rotation: float,
                  y_rotation: float,
                  scale: float):
+        self.__matrix = None
+        self.__orientation = Quaternion.identity()
+        self.__x_rotation = x_rotation
+        self.__y_rotation = y_rotation
+
         # Инициализация свойсв преобразования
         self.x_rotation = x_rotation
         self.y_rotation = y_rotation
         self.scale = scale
 
+    @staticmethod
+    def from_orientation(orientation: Quaternion, scale: float) -> 'Transformation':
+        transformation = Transformation(0, 0, scale)
+        transformation.orientation = orientation
+        return transformation
+
+    @staticmethod
+    def interpolate(a: 'Transformation', b: 'Transformation', t: float) -> 'Transformation':
+        """
+        Возвращает промежуточное преобразование между a (t = 0) и b (t = 1).
+        Ориентация интерполируется сферически, масштаб и углы - линейно.
+        """
+
+        result = Transformation.from_orientation(
+            Quaternion.slerp(a.orientation, b.orientation, t),
+            a.scale + (b.scale - a.scale) * t
+        )
+        result.__x_rotation = a.x_rotation + (b.x_rotation - a.x_rotation) * t
+        result.__y_rotation = a.y_rotation + (b.y_rotation - a.y_rotation) * t
+
+        return result
+
+    def assign(self, other: 'Transformation') -> None:
+        """
+        Копирует состояние другого преобразования, включая уже вычисленную матрицу.
+        """
+
+        self.__orientation = other.__orientation
+        self.__x_rotation = other.__x_rotation
+        self.__y_rotation = other.__y_rotation
+        self.__scale = other.__scale
+        self.__matrix = other.__matrix
+
+    def assign_rotation(self, other: 'Transformation') -> None:
+        """
+        Копирует поворот другого преобразования, сохраняя собственный масштаб.
+        Вычисленная матрица переносится, только если масштабы совпадают.
+        """
+
+        self.__orientation = other.__orientation
+        self.__x_rotation = other.__x_rotation
+        self.__y_rotation = other.__y_rotation
+        self.__matrix = other.__matrix if other.__scale == self.__scale else None
+
+    def copy(self) -> 'Transformation':
+        """Возвращает независимую копию преобразования, включая уже вычисленную матрицу"""
+
+        result = Transformation.__new__(Transformation)
+        result.assign(self)
+        return result
+
     def to_affine_matrix(self) -> Matrix:
-        return \
-            affine.rotate(self.x_rotation, 'x') * \
-            affine.rotate(self.y_rotation, 'y') * \
-            affine.scaling(ky=self.scale, kx=self.scale, kz=self.scale)
+        """
+        Возвращает матрицу преобразования. Матрица вычисляется заново
+        только после изменения свойств преобразования.
+        """
+
+        if self.__matrix is None:
+            self.__matrix = self.__orientation.to_matrix(self.scale)
+
+        return self.__matrix
 
     def increase_x_rotation(self, rotation_in_degrees: float) -> None:
-        self.x_rotation = increase_angle(self.x_rotation, rotation_in_degrees)
+        self.__x_rotation = increase_angle(self.__x_rotation, rotation_in_degrees)
+        self.__compose(Quaternion.from_axle(rotation_in_degrees, 'x'), self.__orientation)
 
     def increase_y_rotation(self, rotation_in_degrees: float) -> None:
-        self.y_rotation = increase_angle(self.y_rotation, rotation_in_degrees)
+        self.__y_rotation = increase_angle(self.__y_rotation, rotation_in_degrees)
+        self.__compose(self.__orientation, Quaternion.from_axle(rotation_in_degrees, 'y'))
+
+    def increase_z_rotation(self, rotation_in_degrees: float) -> None:
+        self.__compose(Quaternion.from_axle(rotation_in_degrees, 'z'), self.__orientation)
+
+    def rotate(self, axis: Point3D, rotation_in_degrees: float) -> None:
+        """
+        Поворачивает фигуру вокруг произвольной оси, проходящей через начало координат.
+
+        :param axis: направление оси поворота
+        :param rotation_in_degrees: угол поворота
+        """
+
+        self.__compose(Quaternion.from_axis_angle(axis, rotation_in_degrees), self.__orientation)
+
+    def __compose(self, first: Quaternion, second: Quaternion) -> None:
+        self.__orientation = (first * second).normalized()
+        self.__matrix = None
 
     def __call__(self, point: Point3D) -> Point3D:
         return point.apply_modification(self.to_affine_matrix())
 
+    def inverse(self, point: Point3D, is_direction: bool = False) -> Point3D:
+        """
+        Выполняет обратное преобразование точки.
+
+        :param point: преобразованная точка
+        :param is_direction: является ли точка направлением (масштабирование не учитывается)
+        """
+
+        result = self.__orientation.conjugate().rotate(point)
+        return result if is_direction else result / self.scale
+
+    @property
+    def orientation(self) -> Quaternion:
+        return self.__orientation
+
+    @orientation.setter
+    def orientation(self, value: Quaternion):
+        self.__orientation = value.normalized()
+        self.__matrix = None
+
     @property
     def scale(self) -> float:
         return self.__scale
@@ -35,6 +145,7 @@ class Transformation:
     @scale.setter
     def scale(self, value: float):
         self.__scale = value
+        self.__matrix = None
 
     @property
     def x_rotation(self) -> float:
@@ -43,6 +154,8 @@ class Transformation:
     @x_rotation.setter
     def x_rotation(self, value: float):
         self.__x_rotation = value
+        self.__orientation = Quaternion.from_axle(value, 'x') * Quaternion.from_axle(self.__y_rotation, 'y')
+        self.__matrix = None
 
     @property
     def y_rotation(self) -> float:
@@ -51,3 +164,5 @@ class Transformation:
     @y_rotation.setter
     def y_rotation(self, value: float):
         self.__y_rotation = value
+        self.__orientation = Quaternion.from_axle(self.__x_rotation, 'x') * Quaternion.from_axle(value, 'y')
+        self.__matrix = None
@@ -0,0 +1,283 @@
+"""
+Модуль реализующий проверку и исправление полигональных сеток.
+
+Проверки выполняются одним проходом по плоским массивам сетки после ее построения
+или загрузки, а не при создании каждого многоугольника. Все сравнения длин
+и расстояний выполняются с допуском относительно размера многоугольника.
+"""
+
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from math import sqrt, isclose
+from typing import List, Dict, Tuple, Optional
+
+from graphics.mesh import Mesh, VERTEX_TYPECODE, INDEX_TYPECODE
+
+TOLERANCE = 1e-6
+"""Допуск по умолчанию относительно размера многоугольника"""
+
+
+@dataclass
+class ValidationReport:
+    """Результат проверки сетки: номера многоугольников с найденными дефектами"""
+
+    degenerate_faces: List[int] = field(default_factory=list)
+    """Многоугольники нулевой площади или с менее чем тремя различными вершинами"""
+
+    non_planar_faces: List[int] = field(default_factory=list)
+
+    non_rectangular_faces: List[int] = field(default_factory=list)
+    """Четырехугольники, не являющиеся прямоугольниками (если проверка включена)"""
+
+    duplicate_faces: List[int] = field(default_factory=list)
+    """Многоугольники, повторяющие набор вершин одного из предыдущих"""
+
+    misoriented_faces: List[int] = field(default_factory=list)
+    """Многоугольники, обход которых не согласован с соседями или направлен внутрь фигуры"""
+
+    @property
+    def is_valid(self) -> bool:
+        return not (self.degenerate_faces or self.non_planar_faces or self.non_rectangular_faces
+                    or self.duplicate_faces or self.misoriented_faces)
+
+
+def _face_geometry(v: array, face) -> Tuple[float, float, float, float, float, float, float, float]:
+    """
+    Возвращает ненормированную нормаль по методу Ньюэла, центр многоугольника,
+    длину его наибольшего ребра и количество вершин.
+    """
+
+    nx = ny = nz = 0
+    cx = cy = cz = 0
+    longest = 0
+    n = len(face)
+
+    for j in range(n):
+        a, b = 3 * face[j], 3 * face[j + 1 - n]
+        ax, ay, az = v[a], v[a + 1], v[a + 2]
+        bx, by, bz = v[b], v[b + 1], v[b + 2]
+
+        nx += (ay - by) * (az + bz)
+        ny += (az - bz) * (ax + bx)
+        nz += (ax - bx) * (ay + by)
+
+        cx += ax
+        cy += ay
+        cz += az
+
+        longest = max(longest, (ax - bx) ** 2 + (ay - by) ** 2 + (az - bz) ** 2)
+
+    return nx, ny, nz, cx / n, cy / n, cz / n, sqrt(longest), n
+
+
+def _is_rectangle(v: array, face, tolerance: float) -> bool:
+    def distance(i: int, j: int) -> float:
+        a, b = 3 * face[i], 3 * face[j]
+        return sqrt((v[a] - v[b]) ** 2 + (v[a + 1] - v[b + 1]) ** 2 + (v[a + 2] - v[b + 2]) ** 2)
+
+    return isclose(distance(0, 1), distance(2, 3), rel_tol=tolerance) \
+        and isclose(distance(1, 2), distance(3, 0), rel_tol=tolerance) \
+        and isclose(distance(0, 2), distance(1, 3), rel_tol=tolerance)
+
+
+def _orientation(mesh: Mesh, usable: List[bool]) -> List[bool]:
+    """
+    Определяет, какие многоугольники нужно развернуть, чтобы обход был согласован.
+
+    Многоугольники, соединенные ребрами, общими ровно для двух многоугольников,
+    образуют компоненты связности. Внутри компоненты обход согласуется обходом в ширину
+    (общее ребро должно проходиться соседями в противоположных направлениях),
+    затем компонента целиком разворачивается, если ее нормали в среднем направлены
+    к центру сетки.
+    """
+
+    v, faces, starts = mesh.vertices, mesh.faces, mesh.face_starts
+    count = mesh.faces_count
+
+    # Ребро -> список (многоугольник, проходится ли ребро от меньшего индекса к большему)
+    edges: Dict[Tuple[int, int], List[Tuple[int, bool]]] = {}
+
+    for i in range(count):
+        if not usable[i]:
+            continue
+
+        start, end = starts[i], starts[i + 1]
+
+        for j in range(start, end):
+            a = faces[j]
+            b = faces[j + 1] if j + 1 < end else faces[start]
+
+            if a != b:
+                edges.setdefault((a, b) if a < b else (b, a), []).append((i, a < b))
+
+    neighbours: List[List[Tuple[int, bool]]] = [[] for _ in range(count)]
+
+    for sharing in edges.values():
+        if len(sharing) == 2:
+            (f, f_forward), (g, g_forward) = sharing
+            # Обход согласован, если соседи проходят общее ребро в разных направлениях
+            neighbours[f].append((g, f_forward == g_forward))
+            neighbours[g].append((f, f_forward == g_forward))
+
+    vs = [v[axle::3] for axle in range(3)]
+    center = [(min(coords) + max(coords)) / 2 if coords else 0 for coords in vs]
+
+    flip = [False] * count
+    visited = [False] * count
+
+    for seed in range(count):
+        if visited[seed] or not usable[seed]:
+            continue
+
+        component = [seed]
+        visited[seed] = True
+        queue = deque(component)
+
+        while queue:
+            f = queue.popleft()
+
+            for g, must_differ in neighbours[f]:
+                if not visited[g]:
+                    visited[g] = True
+                    flip[g] = flip[f] != must_differ
+                    component.append(g)
+                    queue.append(g)
+
+        outwardness = 0
+
+        for f in component:
+            nx, ny, nz, cx, cy, cz, _, _ = _face_geometry(v, faces[starts[f]:starts[f + 1]])
+            dot = nx * (cx - center[0]) + ny * (cy - center[1]) + nz * (cz - center[2])
+            outwardness += -dot if flip[f] else dot
+
+        if outwardness < 0:
+            for f in component:
+                flip[f] = not flip[f]
+
+    return flip
+
+
+def validate(mesh: Mesh, tolerance: float = TOLERANCE, check_rectangles: bool = False) -> ValidationReport:
+    """
+    Проверяет сетку.
+
+    :param tolerance: Допуск относительно длины наибольшего ребра многоугольника.
+    :param check_rectangles: Проверять ли, что все четырехугольники - прямоугольники.
+    """
+
+    report = ValidationReport()
+    v, faces, starts = mesh.vertices, mesh.faces, mesh.face_starts
+    seen = set()
+    usable = [True] * mesh.faces_count
+
+    for i in range(mesh.faces_count):
+        face = faces[starts[i]:starts[i + 1]]
+        nx, ny, nz, cx, cy, cz, longest, n = _face_geometry(v, face)
+        area2 = sqrt(nx * nx + ny * ny + nz * nz)
+
+        if len(set(face)) < 3 or area2 <= tolerance * longest * longest:
+            report.degenerate_faces.append(i)
+            usable[i] = False
+            continue
+
+        key = tuple(sorted(face))
+
+        if key in seen:
+            report.duplicate_faces.append(i)
+            usable[i] = False
+            continue
+
+        seen.add(key)
+
+        if n > 3:
+            ux, uy, uz = nx / area2, ny / area2, nz / area2
+
+            if any(
+                    abs(ux * (v[3 * j] - cx) + uy * (v[3 * j + 1] - cy) + uz * (v[3 * j + 2] - cz))
+                    > tolerance * longest
+                    for j in face
+            ):
+                report.non_planar_faces.append(i)
+
+        if check_rectangles and n == 4 and not _is_rectangle(v, face, tolerance):
+            report.non_rectangular_faces.append(i)
+
+    report.misoriented_faces = [i for i, flip in enumerate(_orientation(mesh, usable)) if flip]
+
+    return report
+
+
+def weld_vertices(mesh: Mesh, tolerance: float = TOLERANCE) -> Mesh:
+    """
+    Объединяет вершины, совпадающие с точностью до tolerance относительно
+    размера сетки. Нужно, например, после Mesh.concatenate, чтобы части
+    сетки стали связными для согласования обхода.
+    """
+
+    v = mesh.vertices
+
+    if len(v) == 0:
+        return mesh.copy()
+
+    size = max(max(v[axle::3]) - min(v[axle::3]) for axle in range(3)) or 1
+    step = size * tolerance
+
+    vertices = array(VERTEX_TYPECODE)
+    indices: Dict[Tuple[int, int, int], int] = {}
+    remap = array(INDEX_TYPECODE, bytes(4 * mesh.vertices_count))
+
+    for i in range(mesh.vertices_count):
+        x, y, z = v[3 * i], v[3 * i + 1], v[3 * i + 2]
+        key = (round(x / step), round(y / step), round(z / step))
+        index = indices.get(key)
+
+        if index is None:
+            index = indices[key] = len(indices)
+            vertices.extend((x, y, z))
+
+        remap[i] = index
+
+    return Mesh(
+        vertices, array(INDEX_TYPECODE, [remap[i] for i in mesh.faces]),
+        array(INDEX_TYPECODE, mesh.face_starts), mesh.center.copy()
+    )
+
+
+def repair(mesh: Mesh, tolerance: float = TOLERANCE, report: Optional[ValidationReport] = None) -> Mesh:
+    """
+    Возвращает исправленную сетку: без вырожденных и повторяющихся многоугольников
+    и с согласованным обходом, направленным наружу. Порядок оставшихся
+    многоугольников сохраняется, массив вершин разделяется с исходной сеткой.
+    Если исправлять нечего, возвращается исходная сетка.
+
+    :param report: Результат validate для этой сетки, если он уже получен.
+    """
+
+    if report is None:
+        report = validate(mesh, tolerance)
+
+    removed = set(report.degenerate_faces) | set(report.duplicate_faces)
+    flipped = set(report.misoriented_faces)
+
+    if not removed and not flipped:
+        return mesh
+
+    faces, starts = mesh.faces, mesh.face_starts
+    new_faces = array(INDEX_TYPECODE)
+    new_starts = array(INDEX_TYPECODE, [0])
+
+    for i in range(mesh.faces_count):
+        if i in removed:
+            continue
+
+        face = faces[starts[i]:starts[i + 1]]
+
+        if i in flipped:
+            # Разворот с сохранением первой вершины
+            face = face[:1] + face[:0:-1]
+
+        new_faces.extend(face)
+        new_starts.append(len(new_faces))
+
+    return Mesh(mesh.vertices, new_faces, new_starts, mesh.center.copy())
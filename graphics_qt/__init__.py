@@ -1 +1,31 @@
-"""Пакет связывающий graphics c qt"""
+"""
+Пакет связывающий graphics c qt.
+
+Основные классы пакета доступны как его атрибуты, но модули с ними
+(и сам PyQt5) импортируются только при первом обращении к атрибуту.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'Projection': 'graphics_qt.projections',
+    'OrthographicProjection': 'graphics_qt.projections',
+    'CentralProjection': 'graphics_qt.projections',
+    'Wireframe': 'graphics_qt.images',
+    'AbstractFigureImage': 'graphics_qt.images',
+    'FigureFrameworkImage': 'graphics_qt.images',
+    'SpruceImage': 'graphics_qt.images',
+    'SceneImage': 'graphics_qt.images',
+    'QPainterCanvas': 'graphics_qt.images',
+    'RenderWorker': 'graphics_qt.rendering',
+    'render_frame': 'graphics_qt.rendering',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"Модуль {__name__} не содержит атрибута {name}")
+
+    return getattr(importlib.import_module(_EXPORTS[name]), name)
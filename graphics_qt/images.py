@@ -3,19 +3,33 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
-
-from PyQt5.QtCore import QPointF, Qt
-from PyQt5.QtGui import QPainter, QPen, QBrush, QPainterPath, QColor
-
-from figures import Spruce
-
-from graphics.figures import AbstractFigure
-from graphics.help_functions import cyclic_pare_iter
+from array import array
+from itertools import accumulate
+from math import sqrt
+from typing import Optional, List, Sequence, Tuple, Set, TYPE_CHECKING
+
+from PyQt5.QtCore import QPointF, QLineF, QRectF, Qt
+from PyQt5.QtGui import QPainter, QPen, QBrush, QPainterPath, QColor, QPolygonF
+
+from graphics.accel import transform_coords, face_depths
+from graphics.bsp import BSPTree, outline_runs
+from graphics.figures import AbstractFigure, FigureGroup
+from graphics.help_functions import cyclic_pare_iter, bounding_box, box_corners
+from graphics.lighting import Lighting, face_normals
+from graphics.mesh import Mesh
+from graphics.occlusion import OcclusionBuffer
+from graphics.output import Canvas, Style, Color
 from graphics.polygons import BasePolygon
+from graphics.projections import SCREEN_AXES
 from graphics.transformation import Transformation
+from graphics.types import Point3D
 from graphics_qt.projections import Projection
 
+if TYPE_CHECKING:
+    # Модуль фигур нужен только для аннотаций: образ работает с любой елью,
+    # а построение геометрии не должно происходить при импорте модуля
+    from figures import Spruce
+
 
 def connect_points(points: List[QPointF],
                    painter: QPainter,
@@ -38,6 +52,75 @@ def connect_points(points: List[QPointF],
         painter.fillPath(path, brush)
 
 
+def projected_bounds(points: List[Point3D], projection: Projection,
+                     transformation: Optional[Transformation] = None) -> QRectF:
+    """
+    Возвращает прямоугольник, ограничивающий проекции точек.
+    Для вершин ограничивающего параллелепипеда фигуры это оценка сверху
+    области, которую займет отрисованная фигура.
+    """
+
+    if transformation is not None:
+        points = [transformation(point) for point in points]
+
+    projected = [projection(point) for point in points]
+    xs = [point.x() for point in projected]
+    ys = [point.y() for point in projected]
+
+    return QRectF(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+
+
+class Wireframe:
+    """
+    Каркас фигуры. Хранит вершины и ребра фигуры без повторений:
+    все вершины преобразуются и проецируются одним проходом по плоскому массиву,
+    а все ребра отрисовываются одним вызовом QPainter.drawLines
+    из заранее созданного буфера отрезков.
+    Каркас строится по геометрии фигуры на момент создания.
+    """
+
+    def __init__(self, figure: AbstractFigure):
+        # Снимок сетки разделяет с ней вершины без копирования
+        mesh = figure.snapshot() if isinstance(figure, Mesh) else Mesh.from_figure(figure)
+
+        self.__coords = mesh.vertices
+        self.__corners = box_corners(*bounding_box(mesh.vertex(i) for i in range(mesh.vertices_count)))
+        self.__edges = mesh.edges()
+        self.__lines = [QLineF() for _ in range(len(self.__edges) // 2)]
+
+        # Буферы, перезаписываемые на каждом кадре
+        self.__transformed = array('d', self.__coords)
+        self.__screen = array('d', bytes(8 * 2 * mesh.vertices_count))
+
+    def bounds(self, projection: Projection, transformation: Optional[Transformation] = None) -> QRectF:
+        """Оценка области, которую займет каркас при отрисовке"""
+
+        return projected_bounds(self.__corners, projection, transformation)
+
+    @property
+    def lines(self) -> List[QLineF]:
+        """Отрезки, полученные при последней отрисовке"""
+
+        return self.__lines
+
+    def draw(self, painter: QPainter, projection: Projection,
+             transformation: Optional[Transformation] = None) -> None:
+        coords = self.__coords
+
+        if transformation is not None:
+            coords = transform_coords(transformation.to_affine_matrix(), coords, self.__transformed)
+
+        screen = projection.project_coords(coords, self.__screen)
+        edges = self.__edges
+
+        for i, line in enumerate(self.__lines):
+            a = 2 * edges[2 * i]
+            b = 2 * edges[2 * i + 1]
+            line.setLine(screen[a], screen[a + 1], screen[b], screen[b + 1])
+
+        painter.drawLines(self.__lines)
+
+
 class AbstractFigureImage(ABC):
     """
     Образ фигуры.
@@ -48,11 +131,30 @@ class AbstractFigureImage(ABC):
     def __init__(self, projection: Projection, transformation: Transformation):
         self.__projection = projection
         self.__transformation = transformation
+        self.__corners: Optional[List[Point3D]] = None
+        self.draft = False
+        """
+        Черновой режим отрисовки, используемый во время взаимодействия с пользователем.
+        Потомки могут рисовать в нем упрощенное изображение.
+        """
 
     @abstractmethod
     def draw(self, painter: QPainter):
         pass
 
+    def bounds(self) -> QRectF:
+        """
+        Оценка области, которую займет фигура при отрисовке.
+        Ограничивающий параллелепипед фигуры вычисляется при первом вызове.
+        """
+
+        if self.__corners is None:
+            self.__corners = box_corners(*bounding_box(
+                point for polygon in self.figure.polygons for point in polygon.points
+            ))
+
+        return projected_bounds(self.__corners, self.projection, self.transformation)
+
     @property
     @abstractmethod
     def figure(self) -> AbstractFigure:
@@ -70,87 +172,598 @@ class AbstractFigureImage(ABC):
 class FigureFrameworkImage(AbstractFigureImage):
     """
     Образ, выполняющий отрисовку каркаса фигуры.
+    Образ хранит снимок фигуры, поэтому последующие изменения фигуры его не затрагивают.
     """
 
     def __init__(self,
                  figure: AbstractFigure,
                  projection: Projection,
                  transformation: Transformation,
-                 pen: Optional[QPen] = None):
+                 pen: Optional[QPen] = None,
+                 transformed: bool = False):
+        """
+        :param transformed: Рисовать ли каркас с преобразованием образа и пером pen.
+        По умолчанию каркас рисуется без преобразования текущим пером рисовальщика.
+        """
+
         super().__init__(projection, transformation)
 
+        figure = figure.snapshot()
         self.__figure = figure
         self.__pen = pen
+        self.__transformed = transformed
+        self.__wireframe = Wireframe(figure)
 
     @property
     def figure(self) -> AbstractFigure:
         return self.__figure
 
     def draw(self, painter: QPainter):
-        for polygon in self.__figure.polygons:
-            connect_points([self.projection(point) for point in polygon], painter)
+        if not self.__transformed:
+            self.__wireframe.draw(painter, self.projection)
+            return
+
+        if self.__pen is not None:
+            painter.setPen(self.__pen)
+
+        self.__wireframe.draw(painter, self.projection, self.transformation)
+
+
+class QPainterCanvas(Canvas):
+    """
+    Холст модуля graphics.output, рисующий средствами QPainter.
+    Позволяет выводить на виджеты и QImage то же, что выводится в SVG или буфер RGBA.
+    Начало координат холста - текущее начало координат отрисовщика.
+    """
+
+    def __init__(self, painter: QPainter, width: int, height: int):
+        super().__init__(width, height)
+        self.__painter = painter
+        self.__polygon = QPolygonF()
+
+    def set_style(self, style: Style) -> None:
+        if style.stroke is None:
+            self.__painter.setPen(Qt.NoPen)
+        else:
+            self.__painter.setPen(QPen(self.__color(style.stroke), style.stroke_width))
+
+        if style.fill is None:
+            self.__painter.setBrush(Qt.NoBrush)
+        else:
+            self.__painter.setBrush(QBrush(self.__color(style.fill)))
+
+    def polygon(self, points: Sequence[float]) -> None:
+        polygon = self.__polygon
+        polygon.clear()
+
+        for i in range(0, len(points), 2):
+            polygon.append(QPointF(points[i], points[i + 1]))
+
+        self.__painter.drawPolygon(polygon)
+
+    def lines(self, segments: Sequence[float]) -> None:
+        self.__painter.drawLines([
+            QLineF(segments[i], segments[i + 1], segments[i + 2], segments[i + 3])
+            for i in range(0, len(segments), 4)
+        ])
+
+    @staticmethod
+    def __color(color: Color) -> QColor:
+        return QColor(*color)
 
 
 class Texture:
+    SHADE_LEVELS = 32
+    """Количество уровней освещенности, для которых создаются кисти"""
+
     def __init__(self, pen: QPen, brush: QBrush):
         self.__pen = pen
         self.__brush = brush
+        self.__shaded_brushes: List[Optional[QBrush]] = [None] * (self.SHADE_LEVELS + 1)
+
+    @property
+    def pen(self) -> QPen:
+        return self.__pen
+
+    @property
+    def is_opaque(self) -> bool:
+        """Закрывает ли заливка то, что нарисовано за ней"""
+
+        return self.__brush.color().alpha() == 255
+
+    def draw(self, polygon: BasePolygon, painter: QPainter, projection: Projection,
+             intensity: Optional[float] = None):
+        """
+        :param intensity: Освещенность многоугольника от 0 до 1. Если не задана, заливка не затеняется.
+        """
 
-    def draw(self, polygon: BasePolygon, painter: QPainter, projection: Projection):
         painter.setPen(self.__pen)
         connect_points([
             projection(point) for point in polygon
-        ], painter, self.__brush)
+        ], painter, self.brush(intensity))
+
+    def brush(self, intensity: Optional[float] = None) -> QBrush:
+        """
+        Возвращает кисть, затененную до ближайшего уровня освещенности.
+        Кисти создаются один раз для каждого уровня.
+
+        :param intensity: Освещенность от 0 до 1. Если не задана, возвращается исходная кисть.
+        """
+
+        if intensity is None:
+            return self.__brush
+
+        level = round(intensity * self.SHADE_LEVELS)
+        brush = self.__shaded_brushes[level]
+
+        if brush is None:
+            color = self.__brush.color()
+            k = level / self.SHADE_LEVELS
+            brush = self.__shaded_brushes[level] = QBrush(QColor(
+                round(color.red() * k), round(color.green() * k), round(color.blue() * k), color.alpha()
+            ))
+
+        return brush
 
 
 class PolygonImage:
+    """
+    Образ многоугольника. Хранит индексы своих вершин в буферах образа фигуры
+    и многоугольник QPolygonF, точки которого перезаписываются на каждом кадре.
+    """
+
+    def __init__(self, indices: Sequence[int], texture: Texture, outline: Optional[Sequence[bool]] = None):
+        """
+        :param outline: Признаки обводки ребер (ребро j - от вершины j к j + 1).
+        Если не заданы, обводятся все ребра.
+        """
 
-    def __init__(self, polygon: BasePolygon, texture: Texture):
-        self.__polygon_link = polygon
+        self.__indices = tuple(indices)
         self.__texture = texture
-        self.__transformed_polygon: BasePolygon = None
+        self.__polygon = QPolygonF([QPointF() for _ in self.__indices])
+        self.intensity: Optional[float] = None
 
-    def transform(self, transformation: Transformation):
-        self.__transformed_polygon = BasePolygon([
-            transformation(point) for point in self.__polygon_link
-        ])
+        # Ломаные обводки, если обводятся не все ребра. Хранят номера вершин многоугольника
+        self.__runs: Optional[List[Tuple[Tuple[int, ...], QPolygonF]]] = None
+
+        if outline is not None and not all(outline):
+            self.__runs = [
+                (run, QPolygonF([QPointF() for _ in run]))
+                for run in outline_runs(outline)
+            ]
 
     @property
-    def polygon(self) -> BasePolygon:
-        return self.__transformed_polygon
+    def indices(self) -> Tuple[int, ...]:
+        return self.__indices
+
+    @property
+    def texture(self) -> Texture:
+        return self.__texture
+
+    @property
+    def polygon(self) -> QPolygonF:
+        return self.__polygon
+
+    def depth(self, coords: array, axis: int) -> float:
+        """Координата центра многоугольника вдоль оси axis"""
+
+        s = 0
+        for i in self.__indices:
+            s += coords[3 * i + axis]
+
+        return s / len(self.__indices)
+
+    def update(self, screen: array, point: QPointF) -> None:
+        """
+        Переносит экранные координаты вершин в многоугольник.
+
+        :param screen: Плоский массив экранных координат вершин фигуры.
+        :param point: Вспомогательная точка, переиспользуемая между вызовами.
+        """
 
-    def draw(self, painter: QPainter, projection: Projection):
-        self.__texture.draw(self.polygon, painter, projection)
+        polygon = self.__polygon
+        j = 0
+
+        for i in self.__indices:
+            point.setX(screen[2 * i])
+            point.setY(screen[2 * i + 1])
+            polygon.replace(j, point)
+            j += 1
+
+        if self.__runs is not None:
+            for run, polyline in self.__runs:
+                for k, j in enumerate(run):
+                    polyline.replace(k, polygon.at(j))
+
+    def stroke(self, painter: QPainter) -> None:
+        """Обводит ребра многоугольника текущим пером. Кисть должна быть Qt.NoBrush"""
+
+        if self.__runs is None:
+            painter.drawPolygon(self.__polygon)
+            return
+
+        for _, polyline in self.__runs:
+            painter.drawPolyline(polyline)
 
 
 class SpruceImage(AbstractFigureImage):
+    """
+    Образ ели. Вершины ели хранятся в плоских буферах, которые перезаписываются
+    на каждом кадре, поэтому после первого кадра отрисовка не создает
+    объектов пропорционально числу многоугольников.
+
+    Образ строится по снимку ели и может отрисовываться в потоке отрисовки,
+    пока сама ель изменяется в потоке интерфейса.
+    """
+
     CONE_TEXTURE = Texture(QPen(Qt.black, 3), QBrush(QColor(0, 172, 0, 230)))
     LEG_TEXTURE = Texture(QPen(Qt.red, 3), QBrush(QColor(101, 48, 12, 210)))
+    DRAFT_PEN = QPen(QColor(0, 120, 0), 1)
+
+    def __init__(self, spruce: 'Spruce', projection: Projection, transformation: Transformation,
+                 lighting: Optional[Lighting] = None, use_bsp: bool = False,
+                 draft_figure: Optional[AbstractFigure] = None,
+                 textures: Optional[Tuple[Texture, Texture]] = None):
+        """
+        :param lighting: Модель освещения. Если не задана, многоугольники заливаются без затенения.
+        :param use_bsp: Определять ли порядок отрисовки обходом BSP-дерева вместо сортировки
+        по центрам многоугольников. Дерево строится один раз и дает верный порядок
+        для любого преобразования, в том числе для пересекающихся частей ели.
+        :param draft_figure: Упрощенная фигура, каркас которой рисуется в черновом режиме.
+        Если не задана, в черновом режиме рисуется каркас самой ели.
+        :param textures: Текстуры кроны и ножки. По умолчанию CONE_TEXTURE и LEG_TEXTURE.
+        """
 
-    def __init__(self, spruce: Spruce, projection: Projection, transformation: Transformation):
         super().__init__(projection, transformation)
+        spruce = spruce.snapshot()
         self.__spruce = spruce
-
+        self.__lighting = lighting
+        self.__draft_figure = draft_figure.snapshot() if draft_figure is not None else spruce
+        self.__draft_wireframe: Optional[Wireframe] = None
+        self.__textures = textures if textures is not None else (self.CONE_TEXTURE, self.LEG_TEXTURE)
+
+        self.__coords = array('d')
+        faces: List[Tuple[int, ...]] = []
+        textures: List[Texture] = []
+        parts = array('b')
+
+        for part, (mesh, texture) in enumerate(zip((spruce.cone, spruce.leg), self.__textures)):
+            offset = len(self.__coords) // 3
+
+            self.__coords.extend(mesh.vertices)
+            faces += [tuple(offset + i for i in face) for face in mesh.iter_faces()]
+            textures += [texture] * mesh.faces_count
+            parts.extend([part] * mesh.faces_count)
+
+        normals = face_normals(spruce.cone.polygons + spruce.leg.polygons)
+
+        self.__bsp: Optional[BSPTree] = None
+        outlines: List[Optional[Tuple[bool, ...]]] = [None] * len(faces)
+
+        if use_bsp:
+            self.__bsp = BSPTree(self.__coords, faces)
+            self.__coords = self.__bsp.vertices
+            faces = self.__bsp.faces
+            # Линии разреза лежат внутри исходных многоугольников и не обводятся
+            outlines = self.__bsp.outlines
+
+            # Части разрезанных многоугольников наследуют текстуру, часть ели и нормаль исходного
+            textures = [textures[source] for source in self.__bsp.sources]
+            parts = array('b', [parts[source] for source in self.__bsp.sources])
+            normals = array('d', [
+                normals[3 * source + k]
+                for source in self.__bsp.sources
+                for k in range(3)
+            ])
+
+        self.__normals = normals
+        self.__parts = parts
         self.__polygons_images = [
-                                     PolygonImage(polygon, self.CONE_TEXTURE)
-                                     for polygon in self.__spruce.cone
-                                 ] + [
-                                     PolygonImage(polygon, self.LEG_TEXTURE)
-                                     for polygon in self.__spruce.leg
-                                 ]
+            PolygonImage(face, texture, outline)
+            for face, texture, outline in zip(faces, textures, outlines)
+        ]
+
+        # Многоугольники в плоском виде для вычисления глубин одним ядром
+        self.__faces = array('i', [i for face in faces for i in face])
+        self.__face_starts = array('i', accumulate((len(face) for face in faces), initial=0))
+
+        # Буферы, перезаписываемые на каждом кадре
+        self.__transformed = array('d', self.__coords)
+        self.__screen = array('d', bytes(8 * 2 * (len(self.__coords) // 3)))
+        self.__depths = array('d', bytes(8 * len(self.__polygons_images)))
+        self.__intensities = array('d', bytes(8 * len(self.__polygons_images)))
+        self.__order = list(range(len(self.__polygons_images)))
+        self.__point = QPointF()
 
     @property
     def figure(self) -> AbstractFigure:
         return self.__spruce
 
+    @property
+    def parts(self) -> Tuple[Mesh, Mesh]:
+        """Части ели в порядке номеров, используемых в draw_parts: крона и ножка"""
+
+        return self.__spruce.cone, self.__spruce.leg
+
+    @property
+    def textures(self) -> Tuple[Texture, Texture]:
+        """Текстуры частей ели в том же порядке, что и parts"""
+
+        return self.__textures
+
     def draw(self, painter: QPainter):
-        # Обновление положения образов многоугольников
-        for polygon_image in self.__polygons_images:
-            polygon_image.transform(self.transformation)
+        self.draw_parts(painter)
+
+    def draw_parts(self, painter: QPainter, visible: Optional[Sequence[bool]] = None) -> int:
+        """
+        Отрисовывает только видимые части ели.
+
+        :param visible: Признаки видимости частей в порядке parts. Если не заданы, рисуются все части.
+        :return: Количество нарисованных многоугольников.
+        """
+
+        if self.draft:
+            self.__draw_draft(painter)
+            return 0
+
+        images = self.__polygons_images
+        matrix = self.transformation.to_affine_matrix()
+
+        # Обновление положения вершин
+        transform_coords(matrix, self.__coords, self.__transformed)
+        self.projection.project_coords(self.__transformed, self.__screen)
+
+        if self.__lighting is not None:
+            self.__lighting.shade(self.__normals, matrix, self.__intensities)
+
+        if self.__bsp is not None:
+            # Порядок от дальних к ближним относительно наблюдателя в системе координат ели
+            viewer, at_infinity = self.projection.viewer()
+            self.__bsp.back_to_front(self.transformation.inverse(viewer, at_infinity), at_infinity, self.__order)
+        else:
+            # Сортировка образов по глубине
+            axis = 'xyz'.index(self.projection.axle)
+            depths = face_depths(self.__transformed, self.__faces, self.__face_starts, axis, self.__depths)
+
+            self.__order.sort(key=depths.__getitem__, reverse=True)
+
+        order = self.__order
+        if visible is not None and not all(visible):
+            parts = self.__parts
+            order = [i for i in order if visible[parts[i]]]
+
+        # Отрисовка образов. Как и в connect_points, сначала рисуется обводка,
+        # а полупрозрачная заливка накладывается поверх нее
+        for i in order:
+            polygon_image = images[i]
+            polygon_image.update(self.__screen, self.__point)
+            texture = polygon_image.texture
+
+            painter.setPen(texture.pen)
+            painter.setBrush(Qt.NoBrush)
+            polygon_image.stroke(painter)
+
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(texture.brush(self.__intensities[i] if self.__lighting is not None else None))
+            painter.drawPolygon(polygon_image.polygon)
+
+        return len(order)
+
+    def __draw_draft(self, painter: QPainter):
+        """Отрисовка каркаса без заливки, освещения и сортировки"""
+
+        if self.__draft_wireframe is None:
+            self.__draft_wireframe = Wireframe(self.__draft_figure)
+
+        painter.setPen(self.DRAFT_PEN)
+        self.__draft_wireframe.draw(painter, self.projection, self.transformation)
+
+
+class SceneImage(AbstractFigureImage):
+    """
+    Образ нескольких елей с отсечением закрытых частей.
+
+    Перед отрисовкой кадра вписанные цилиндры ближайших елей заносятся в буфер
+    перекрытия низкого разрешения, после чего каждая часть ели (крона и ножка)
+    проверяется по прямоугольнику, ограничивающему проекцию ее параллелепипеда.
+    Закрытые части не сортируются и не рисуются. Ели рисуются от дальних к ближним.
+
+    По умолчанию ели сцены заливаются непрозрачно, и отсечение не меняет изображения.
+    Части с полупрозрачной заливкой (например, с текстурами SpruceImage по умолчанию)
+    показывают ели за ними, поэтому они не заслоняют, если не задан translucent_occluders.
+    С ним отсечение приблизительное: ели, едва просвечивающие сквозь ближние, не рисуются.
+    """
+
+    CONE_TEXTURE = Texture(SpruceImage.CONE_TEXTURE.pen, QBrush(QColor(0, 172, 0)))
+    LEG_TEXTURE = Texture(SpruceImage.LEG_TEXTURE.pen, QBrush(QColor(101, 48, 12)))
+
+    OCCLUDERS_COUNT = 16
+    """Количество ближайших елей, вписанные цилиндры которых заносятся в буфер перекрытия"""
+
+    def __init__(self, spruces: Sequence['Spruce'], projection: Projection, transformation: Transformation,
+                 lighting: Optional[Lighting] = None, use_bsp: bool = False, culling: bool = True,
+                 cells: int = OcclusionBuffer.CELLS, occluders_count: int = OCCLUDERS_COUNT,
+                 translucent_occluders: bool = False, textures: Optional[Tuple[Texture, Texture]] = None):
+        """
+        :param culling: Отсекать ли закрытые части. Без отсечения рисуются все ели целиком.
+        :param cells: Разрешение буфера перекрытия по каждой стороне, степень двойки.
+        :param occluders_count: Количество ближайших елей, закрывающих остальные.
+        :param translucent_occluders: Заслоняют ли части с полупрозрачной заливкой.
+        :param textures: Текстуры кроны и ножки всех елей. По умолчанию непрозрачные
+        CONE_TEXTURE и LEG_TEXTURE.
+        """
+
+        super().__init__(projection, transformation)
+
+        if not spruces:
+            raise ValueError("Сцена должна содержать хотя бы одну ель!")
+
+        if textures is None:
+            textures = self.CONE_TEXTURE, self.LEG_TEXTURE
+
+        self.__images = [
+            SpruceImage(spruce, projection, transformation, lighting, use_bsp, textures=textures)
+            for spruce in spruces
+        ]
+        self.__group = FigureGroup(image.figure for image in self.__images)
+        self.__cells = cells
+        self.__occluders_count = occluders_count
+        self.culling = culling
+        self.viewport: Optional[QRectF] = None
+        """
+        Область вывода в координатах образа. Если задана, буфер перекрытия покрывает
+        только ее, а части елей вне области вывода также отсекаются.
+        """
+
+        # Углы параллелепипедов частей елей, по 8 точек на часть
+        self.__corners = array('d')
+        for image in self.__images:
+            for part in image.parts:
+                for corner in box_corners(*bounding_box(part.vertex(i) for i in range(part.vertices_count))):
+                    self.__corners.extend(corner.coords())
+
+        # Оси (нижний и верхний центры) и радиусы вписанных цилиндров и номера елей, которым они принадлежат
+        self.__occluder_axes = array('d')
+        self.__occluder_radii = array('d')
+        self.__occluder_owners = array('i')
+        for i, image in enumerate(self.__images):
+            for occluders, texture in zip(image.figure.part_occluders(), image.textures):
+                if not texture.is_opaque and not translucent_occluders:
+                    continue
+
+                for occluder in occluders:
+                    self.__occluder_axes.extend(occluder.bottom.coords() + occluder.top.coords())
+                    self.__occluder_radii.append(occluder.radius)
+                    self.__occluder_owners.append(i)
+
+        # Буферы, перезаписываемые на каждом кадре
+        count = len(self.__occluder_radii)
+        self.__transformed_corners = array('d', self.__corners)
+        self.__screen_corners = array('d', bytes(8 * 2 * (len(self.__corners) // 3)))
+        self.__transformed_occluders = array('d', bytes(8 * 9 * count))
+        self.__screen_occluders = array('d', bytes(8 * 6 * count))
+
+        self.drawn_polygons = 0
+        """Количество многоугольников, нарисованных в последнем кадре"""
+        self.culled_parts = 0
+        """Количество частей елей, отсеченных в последнем кадре"""
+
+    @property
+    def figure(self) -> FigureGroup:
+        return self.__group
+
+    @property
+    def images(self) -> List[SpruceImage]:
+        return self.__images
+
+    def draw(self, painter: QPainter):
+        images = self.__images
+        axis = SCREEN_AXES[self.projection.axle][2]
+
+        transform_coords(self.transformation.to_affine_matrix(), self.__corners, self.__transformed_corners)
+        self.projection.project_coords(self.__transformed_corners, self.__screen_corners)
+
+        # Прямоугольник проекции и ближайшая глубина каждой части
+        transformed, screen = self.__transformed_corners, self.__screen_corners
+        rects = []
+        nearest = array('d', bytes(8 * 2 * len(images)))
+
+        for i in range(len(nearest)):
+            xs = screen[16 * i:16 * i + 16:2]
+            ys = screen[16 * i + 1:16 * i + 16:2]
+            rects.append((min(xs), min(ys), max(xs), max(ys)))
+            nearest[i] = min(transformed[24 * i + axis:24 * i + 24:3])
+
+        visible = [[True, True] for _ in images]
+        if self.culling:
+            self.__cull(rects, nearest, visible)
+
+        self.drawn_polygons = self.culled_parts = 0
+
+        # Ели рисуются от дальних к ближним по ближайшей точке
+        for i in sorted(range(len(images)), key=lambda j: min(nearest[2 * j], nearest[2 * j + 1]), reverse=True):
+            image = images[i]
+            image.draft = self.draft
+
+            self.culled_parts += visible[i].count(False)
+
+            if any(visible[i]):
+                self.drawn_polygons += image.draw_parts(painter, visible[i])
+
+    def __cull(self, rects: List[Tuple[float, float, float, float]], nearest: array,
+               visible: List[List[bool]]) -> None:
+        left = min(rect[0] for rect in rects)
+        top = min(rect[1] for rect in rects)
+        right = max(rect[2] for rect in rects)
+        bottom = max(rect[3] for rect in rects)
+
+        if self.viewport is not None:
+            left, top = max(left, self.viewport.left()), max(top, self.viewport.top())
+            right, bottom = min(right, self.viewport.right()), min(bottom, self.viewport.bottom())
+
+        width, height = right - left, bottom - top
+
+        if width <= 0 or height <= 0:
+            if self.viewport is not None:
+                # Все ели вне области вывода
+                for parts in visible:
+                    parts[:] = [False, False]
+
+            return
+
+        buffer = OcclusionBuffer(left, top, width, height, self.__cells)
+        occluding = set(sorted(
+            range(len(self.__images)), key=lambda j: min(nearest[2 * j], nearest[2 * j + 1])
+        )[:self.__occluders_count])
+
+        self.__add_occluders(buffer, occluding)
+
+        for i, rect in enumerate(rects):
+            if buffer.is_occluded(*rect, nearest[i]):
+                visible[i // 2][i % 2] = False
+
+    def __add_occluders(self, buffer: OcclusionBuffer, occluding: Set[int]) -> None:
+        """
+        Заносит в буфер вписанные цилиндры елей из occluding.
+
+        Проекция цилиндра содержит полосу вдоль проекции его оси, половина ширины которой
+        равна проекции радиуса на глубине дальнего конца оси. В буфер заносится
+        прямоугольник, вписанный в эту полосу, с глубиной дальнего конца оси.
+        """
+
+        radii = self.__occluder_radii
+        count = len(radii)
+
+        if count == 0:
+            return
+
+        u, _, depth = SCREEN_AXES[self.projection.axle]
+        scale = self.transformation.scale
+        axes = transform_coords(self.transformation.to_affine_matrix(), self.__occluder_axes)
+
+        # Концы осей и дальние концы, смещенные на радиус вдоль экранной оси
+        points = self.__transformed_occluders
+        points[:6 * count] = axes
+        for i in range(count):
+            far = 6 * i if axes[6 * i + depth] > axes[6 * i + 3 + depth] else 6 * i + 3
+            points[6 * count + 3 * i:6 * count + 3 * i + 3] = axes[far:far + 3]
+            points[6 * count + 3 * i + u] += radii[i] * scale
+
+        screen = self.projection.project_coords(points, self.__screen_occluders)
+
+        for i in range(count):
+            if self.__occluder_owners[i] not in occluding:
+                continue
+
+            xa, ya, xb, yb = screen[4 * i:4 * i + 4]
+            far = 4 * i if axes[6 * i + depth] > axes[6 * i + 3 + depth] else 4 * i + 2
+            half = abs(screen[4 * count + 2 * i] - screen[far])
 
-        # Сортировка образов по глубине
-        self.__polygons_images.sort(key=lambda p: -p.polygon.center[self.projection.axle])
+            # Концы полосы срезаны наклоном оси
+            length = sqrt((xb - xa) ** 2 + (yb - ya) ** 2)
+            cut = half * abs(xb - xa) / length if length > 0 else half
 
-        # Отрисовка образов
-        for polygon_image in self.__polygons_images:
-            polygon_image.draw(painter, self.projection)
+            buffer.add_occluder(
+                max(xa, xb) - half, min(ya, yb) + cut, min(xa, xb) + half, max(ya, yb) - cut,
+                max(axes[6 * i + depth], axes[6 * i + 3 + depth])
+            )
@@ -2,11 +2,12 @@
 Модуль реализующий проекцию трехмерных точек пакет graphics в двумерные точки QPointF
 """
 from abc import ABC, abstractmethod
-from typing import Optional
+from array import array
+from typing import Optional, Sequence, List, Tuple
 
 from PyQt5.QtCore import QPointF
 
-from graphics import projections
+from graphics import projections, accel
 from graphics.types import Point3D, Matrix, Axle
 from graphics.transformation import Transformation
 
@@ -35,26 +36,58 @@ class Projection(ABC):
 
         pass
 
+    @abstractmethod
+    def project_coords(self, coords: Sequence[float], out: Optional[array] = None) -> array:
+        """
+        Проецирует массив точек целиком.
+
+        :param coords: Плоский массив координат точек (x0, y0, z0, x1, ...).
+        :param out: Массив для записи результата. Если не задан, создается новый массив.
+        :return: Плоский массив экранных координат (u0, v0, u1, v1, ...).
+        """
+
+        pass
+
+    def to_points(self, coords: Sequence[float]) -> List[QPointF]:
+        """Проецирует массив точек и возвращает точки на плоскости"""
+
+        screen = self.project_coords(coords)
+        return [QPointF(screen[i], screen[i + 1]) for i in range(0, len(screen), 2)]
+
     @property
     def axle(self) -> Axle:
         return self._axle
 
+    @abstractmethod
+    def viewer(self) -> Tuple[Point3D, bool]:
+        """
+        Положение наблюдателя в пространстве перед проекцией.
+
+        :return: Точка наблюдения и признак того, что наблюдатель находится в бесконечности
+        (в этом случае точка задает направление на наблюдателя).
+        """
+
+        pass
+
 
 class OrthographicProjection(Projection):
 
     def __init__(self, axle: Axle, transformation: Optional[Transformation] = None):
         super().__init__(projections.orthographic(axle), axle, transformation)
+        self._u, self._v, self._depth = projections.SCREEN_AXES[axle]
 
     def __call__(self, point: Point3D) -> QPointF:
-        transformed_point = point.apply_modification(self._projection_matrix)
+        # Умножение на матрицу проекции лишь обнуляет координату, которая затем отбрасывается
+        coords = point.coords()
+        return QPointF(coords[self._u], -coords[self._v])
+
+    def project_coords(self, coords: Sequence[float], out: Optional[array] = None) -> array:
+        return projections.orthographic_coords(coords, self._axle, out)
 
-        match self.axle:
-            case 'x':
-                return QPointF(transformed_point.z, -transformed_point.y)
-            case 'y':
-                return QPointF(transformed_point.x, -transformed_point.z)
-            case 'z':
-                return QPointF(transformed_point.x, -transformed_point.y)
+    def viewer(self) -> Tuple[Point3D, bool]:
+        direction = [0, 0, 0]
+        direction[self._depth] = -1
+        return Point3D(*direction), True
 
     @staticmethod
     def __new_point(point: Point3D, center: Point3D) -> Point3D:
@@ -71,3 +104,22 @@ class CentralProjection(OrthographicProjection):
 
     def set_distance(self, distance_from_screen):
         self._projection_matrix = projections.central(self._axle, distance_from_screen)
+        self._distance = distance_from_screen
+
+    def __call__(self, point: Point3D) -> QPointF:
+        coords = point.coords()
+        w = 1 + coords[self._depth] / self._distance
+        return QPointF(coords[self._u] / w, -coords[self._v] / w)
+
+    def project_coords(self, coords: Sequence[float], out: Optional[array] = None) -> array:
+        return accel.central_coords(coords, self._axle, self._distance, out)
+
+    def viewer(self) -> Tuple[Point3D, bool]:
+        # Центр проекции - точка, в которой однородная координата обращается в ноль
+        position = [0, 0, 0]
+        position[self._depth] = -self._distance
+        return Point3D(*position), False
+
+    @property
+    def distance(self) -> float:
+        return self._distance
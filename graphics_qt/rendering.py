@@ -0,0 +1,140 @@
+"""
+Модуль реализующий отрисовку образов фигур в отдельном потоке.
+
+Поток отрисовки владеет собственным образом фигуры и рисует его в QImage,
+который можно безопасно создавать вне потока интерфейса. Поток всегда
+отрисовывает только последнее запрошенное состояние: запросы, поступившие
+во время отрисовки кадра, заменяют друг друга.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Callable
+
+from PyQt5.QtCore import QThread, pyqtSignal, Qt
+from PyQt5.QtGui import QImage, QPainter
+
+from graphics.budget import FrameBudget
+from graphics.transformation import Transformation
+from graphics_qt.images import AbstractFigureImage
+
+
+def render_frame(image: AbstractFigureImage, width: int, height: int,
+                 resolution_scale: float = 1, antialiasing: bool = True,
+                 out: Optional[QImage] = None) -> QImage:
+    """
+    Отрисовывает образ фигуры в QImage с началом координат в центре кадра.
+
+    :param width: Ширина области вывода.
+    :param height: Высота области вывода.
+    :param resolution_scale: Доля разрешения области вывода, в которой рисуется кадр.
+    При значении меньше 1 кадр получается меньше области вывода и растягивается при выводе.
+    :param out: Изображение для повторного использования, если его размер подходит.
+    """
+
+    frame_width = max(round(width * resolution_scale), 1)
+    frame_height = max(round(height * resolution_scale), 1)
+
+    if out is None or out.width() != frame_width or out.height() != frame_height:
+        out = QImage(frame_width, frame_height, QImage.Format_ARGB32_Premultiplied)
+
+    out.fill(Qt.transparent)
+
+    painter = QPainter(out)
+    painter.setRenderHint(QPainter.Antialiasing, antialiasing)
+    painter.translate(frame_width / 2, frame_height / 2)
+    painter.scale(frame_width / max(width, 1), frame_height / max(height, 1))
+    image.draw(painter)
+    painter.end()
+
+    return out
+
+
+@dataclass(frozen=True)
+class FrameRequest:
+    """Снимок состояния, необходимого для отрисовки кадра"""
+
+    transformation: Transformation
+    width: int
+    height: int
+    draft: bool = False
+
+
+class RenderWorker(QThread):
+    """Поток, отрисовывающий образ фигуры в QImage"""
+
+    frame_ready = pyqtSignal(QImage)
+
+    def __init__(self, image_factory: Callable[[], AbstractFigureImage],
+                 budget: Optional[FrameBudget] = None, *args, **kwargs):
+        """
+        :param image_factory: Функция, создающая образ фигуры. Вызывается в потоке отрисовки
+        перед первым кадром, поэтому построение геометрии не задерживает поток интерфейса.
+        Созданный образ используется только этим потоком, его фигура не должна изменяться.
+        :param budget: Регулятор качества. Если задан, разрешение кадров и сглаживание
+        выбираются по времени отрисовки предыдущих кадров, и кадр может оказаться
+        меньше запрошенного размера.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        self.__image_factory = image_factory
+        self.__image: Optional[AbstractFigureImage] = None
+        self.__budget = budget
+        self.__condition = threading.Condition()
+        self.__request: Optional[FrameRequest] = None
+        self.__is_stopped = False
+
+    def request(self, transformation: Transformation, width: int, height: int, draft: bool = False) -> None:
+        """
+        Запрашивает отрисовку кадра. Состояние преобразования копируется,
+        поэтому его можно изменять сразу после вызова.
+
+        :param draft: Отрисовать ли кадр в черновом режиме (без сглаживания и с упрощенным образом).
+        """
+
+        with self.__condition:
+            self.__request = FrameRequest(transformation.copy(), width, height, draft)
+            self.__condition.notify()
+
+    def stop(self) -> None:
+        with self.__condition:
+            self.__is_stopped = True
+            self.__condition.notify()
+
+        self.wait()
+
+    def run(self) -> None:
+        while True:
+            with self.__condition:
+                while self.__request is None and not self.__is_stopped:
+                    self.__condition.wait()
+
+                if self.__is_stopped:
+                    return
+
+                request, self.__request = self.__request, None
+
+            self.frame_ready.emit(self.render(request))
+
+    def render(self, request: FrameRequest) -> QImage:
+        if self.__image is None:
+            self.__image = self.__image_factory()
+
+        self.__image.transformation.assign(request.transformation)
+        self.__image.draft = request.draft
+
+        budget = self.__budget
+
+        if budget is None:
+            return render_frame(self.__image, request.width, request.height, antialiasing=not request.draft)
+
+        started_at = time.perf_counter()
+        frame = render_frame(
+            self.__image, request.width, request.height,
+            budget.resolution_scale, budget.antialiasing and not request.draft
+        )
+        budget.record(time.perf_counter() - started_at)
+
+        return frame
@@ -1,7 +1,7 @@
 from typing import List, Callable
 
 from PyQt5 import QtGui
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtWidgets import (
     QWidget, QApplication,
     QVBoxLayout, QHBoxLayout,
@@ -85,8 +85,9 @@ class MainWidget(QWidget):
         self.setWindowTitle(title)
         self.setMinimumSize(min_width, min_height)
 
+        # Фигура строится после первой отрисовки окна
         self.projections_container = FigureProjectionsContainer(
-            figure=Spruce(Point3D(0, 0, 0), 150, 75, 3),
+            figure=None,
             transformaion=Transformation(45, 45, 1),
             parent=self
         )
@@ -99,6 +100,11 @@ class MainWidget(QWidget):
 
         self.__init_layout()
 
+        QTimer.singleShot(0, self.__create_figure)
+
+    def __create_figure(self) -> None:
+        self.projections_container.figure = Spruce(Point3D(0, 0, 0), 150, 75, 3)
+
     def wheelEvent(self, event: QtGui.QWheelEvent) -> None:
         is_wheel_up = event.angleDelta().y() > 0
         increace = self.SCALE_INCREACE if is_wheel_up else -self.SCALE_INCREACE
@@ -1,3 +1,5 @@
+from typing import Callable
+
 from PyQt5 import QtGui
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtWidgets import (
@@ -5,32 +7,47 @@ from PyQt5.QtWidgets import (
     QVBoxLayout, )
 
 from figures import Spruce
+from graphics.animation import AnimationClip, AnimationPlayer
+from graphics.budget import FrameBudget
+from graphics.lighting import Lighting, DirectionalLight
 from graphics.transformation import Transformation
 from graphics.types import Point3D
 from graphics_qt.images import SpruceImage
 from graphics_qt.projections import CentralProjection
-from widgets.views import FigureImageView
+from widgets.views import AsyncFigureImageView
 
 
 class MainWidget(QWidget):
     ROTATION_INCREACE = 1
     SCALE_INCREACE = 0.05
 
+    FRAME_INTERVAL_MS = 30
+    # Один оборот с той же скоростью, что и поворот на ROTATION_INCREACE за каждый кадр
+    TURN_DURATION = 360 / ROTATION_INCREACE * FRAME_INTERVAL_MS / 1000
+
     def __init__(self, title: str, min_width: int, min_height: int, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.setWindowTitle(title)
         self.setMinimumSize(min_width, min_height)
 
-        self.__figure = Spruce(Point3D(0, 0, 0), self.width() / 3, self.width() / 6, 3)
+        self.__transformation = Transformation(-10, 45, 1)
 
-        image = SpruceImage(self.__figure, CentralProjection('z', 400), Transformation(-10, 45, 1))
-
-        self.__image_view = FigureImageView(image, parent=self)
+        self.__image_view = AsyncFigureImageView(
+            self.__create_image_factory(self.width()),
+            self.__transformation,
+            # Качество кадров снижается, если отрисовка не укладывается в интервал анимации
+            budget=FrameBudget(self.FRAME_INTERVAL_MS / 1000),
+            parent=self
+        )
 
         self.__is_animation_active = True
+        self.__animation: AnimationPlayer = None
+        self.__is_clip_outdated = False
+        self.__restart_animation()
+
         self.__timer = QTimer()
         self.__timer.timeout.connect(self._animation)
-        self.__timer.start(30)
+        self.__timer.start(self.FRAME_INTERVAL_MS)
 
         self.__init_layout()
 
@@ -40,6 +57,8 @@ class MainWidget(QWidget):
         self.__image_view.scale_on(increace)
 
     def keyPressEvent(self, event: QtGui.QKeyEvent) -> None:
+        orientation = self.__transformation.orientation
+
         match event.key():
             case Qt.Key_Left:
                 self.__image_view.rotate_y(MainWidget.ROTATION_INCREACE)
@@ -52,9 +71,55 @@ class MainWidget(QWidget):
             case Qt.Key_S:
                 self.__is_animation_active = not self.__is_animation_active
 
+                if self.__is_animation_active:
+                    self.__restart_animation()
+
+        # Анимация продолжается с положения, выбранного пользователем. Клип строится
+        # заново один раз после окончания поворота, а не при каждом нажатии и автоповторе
+        if self.__is_animation_active and self.__transformation.orientation != orientation:
+            self.__is_clip_outdated = True
+
     def _animation(self):
-        if self.__is_animation_active:
-            self.__image_view.rotate_y(MainWidget.ROTATION_INCREACE)
+        if not self.__is_animation_active:
+            return
+
+        if self.__is_clip_outdated:
+            if self.__image_view.is_interacting:
+                return
+
+            self.__restart_animation()
+
+        if self.__animation.apply(self.__transformation):
+            self.__image_view.redraw()
+
+    @staticmethod
+    def __create_image_factory(size: float) -> Callable[[Transformation], SpruceImage]:
+        """
+        Возвращает функцию создания образа ели. Геометрия строится при первом кадре
+        в потоке отрисовки, поэтому окно появляется, не дожидаясь построения ели.
+        """
+
+        def create_image(transformation: Transformation) -> SpruceImage:
+            figure = Spruce(Point3D(0, 0, 0), size / 3, size / 6, 3)
+            # Ель без промежуточных уровней кроны для отрисовки во время вращения
+            draft_figure = Spruce(Point3D(0, 0, 0), size / 3, size / 6, 0)
+
+            return SpruceImage(
+                figure, CentralProjection('z', 400), transformation,
+                Lighting([DirectionalLight(Point3D(1, -1, 1))]),
+                use_bsp=True,
+                draft_figure=draft_figure
+            )
+
+        return create_image
+
+    def __restart_animation(self):
+        clip = AnimationClip.turntable(
+            self.__transformation, self.TURN_DURATION,
+            fps=1000 / self.FRAME_INTERVAL_MS
+        )
+        self.__animation = AnimationPlayer(clip)
+        self.__is_clip_outdated = False
 
     def __init_layout(self):
         layout = QVBoxLayout()
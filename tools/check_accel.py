@@ -0,0 +1,100 @@
+"""
+Сверка и замер ядер graphics.accel.
+
+Каждое ядро запускается в текущем режиме (JIT, если установлен Numba) и в
+режиме чистого Python, результаты сравниваются с допуском, время выводится
+для обоих режимов. Первый вызов JIT-ядра (компиляция) в замер не входит.
+
+Пример:
+    python tools/check_accel.py --sides 500 --levels 200
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from array import array
+from typing import Callable, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from figures import Cone
+from graphics import accel, affine, projections
+from graphics.transformation import Transformation
+from graphics.types import Point3D
+
+TOLERANCE = 1e-9
+
+
+def best_time(function: Callable[[], Sequence], repeat: int) -> float:
+    function()
+    times = []
+
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started_at)
+
+    return min(times)
+
+
+def same(first: Sequence, second: Sequence) -> bool:
+    return len(first) == len(second) and all(
+        math.isclose(a, b, rel_tol=TOLERANCE, abs_tol=TOLERANCE) for a, b in zip(first, second)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sides', type=int, default=200)
+    parser.add_argument('--levels', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    mesh = Cone(Point3D(0, 0, 0), 100, 300, args.levels, args.sides)
+    coords, faces, starts = mesh.vertices, mesh.faces, mesh.face_starts
+    matrix = Transformation(0.3, 0.7, 1.5).to_affine_matrix()
+    transformed = affine.transform_coords(matrix, coords)
+    faces_count = mesh.faces_count
+
+    kernels = {
+        'transform_coords': (
+            lambda: accel.transform_coords(matrix, coords),
+            lambda: affine.transform_coords(matrix, coords),
+        ),
+        'central_coords': (
+            lambda: accel.central_coords(transformed, 'z', 1000),
+            lambda: projections.central_coords(transformed, 'z', 1000),
+        ),
+        'face_depths': (
+            lambda: accel.face_depths(transformed, faces, starts, 2),
+            lambda: accel._face_depths_python(transformed, faces, starts, 2, array('d', bytes(8 * faces_count))),
+        ),
+        'face_centroids': (
+            lambda: accel.face_centroids(coords, faces, starts),
+            lambda: accel._face_centroids_python(coords, faces, starts, array('d', bytes(24 * faces_count))),
+        ),
+        'unique_edges': (
+            lambda: accel.unique_edges(faces, starts),
+            lambda: accel._unique_edges_python(faces, starts),
+        ),
+    }
+
+    print(f"Вершин: {mesh.vertices_count}, многоугольников: {faces_count}, "
+          f"JIT: {'включен' if accel.JIT_ENABLED else 'выключен'}")
+
+    failed = False
+    for name, (current, reference) in kernels.items():
+        matches = same(current(), reference())
+        failed |= not matches
+
+        print(f"{name:>18}: {best_time(current, args.repeat) * 1000:8.2f} ms, "
+              f"Python {best_time(reference, args.repeat) * 1000:8.2f} ms, "
+              f"{'совпадает' if matches else 'РАСХОДИТСЯ'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
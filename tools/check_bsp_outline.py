@@ -0,0 +1,123 @@
+"""
+Проверка обводки многоугольников, разрезанных BSP-деревом (graphics.bsp).
+
+При сортировке по центрам (SpruceImage без use_bsp) обводятся ребра исходных
+многоугольников. При обходе BSP-дерева рисуются части многоугольников, и обводиться
+должны только их ребра, лежащие на ребрах исходных, иначе на изображении появляются
+линии разреза. Проверка сравнивает обводки без отрисовки: ломаные обводки частей
+(outline_runs) каждого исходного многоугольника должны покрывать ровно его ребра -
+каждый отрезок лежит на ребре исходного многоугольника, а суммарная длина отрезков
+на ребре равна длине ребра.
+
+Пример:
+    python tools/check_bsp_outline.py
+"""
+
+import os
+import sys
+from array import array
+from math import dist
+from typing import List, Tuple, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from figures import Spruce
+from graphics.bsp import BSPTree, outline_runs
+from graphics.types import Point3D
+
+TOLERANCE = 1e-6
+
+Point = Tuple[float, float, float]
+
+
+def spruce_faces(spruces: Sequence[Spruce]) -> Tuple[array, List[Tuple[int, ...]]]:
+    """Вершины и многоугольники елей в том же порядке, что и в SpruceImage"""
+
+    coords = array('d')
+    faces: List[Tuple[int, ...]] = []
+
+    for spruce in spruces:
+        for mesh in (spruce.cone, spruce.leg):
+            offset = len(coords) // 3
+            coords.extend(mesh.vertices)
+            faces += [tuple(offset + i for i in face) for face in mesh.iter_faces()]
+
+    return coords, faces
+
+
+def point(coords: Sequence[float], i: int) -> Point:
+    return coords[3 * i], coords[3 * i + 1], coords[3 * i + 2]
+
+
+def on_segment(p: Point, a: Point, b: Point) -> bool:
+    """Лежит ли точка p на отрезке ab"""
+
+    length = dist(a, b)
+    return abs(dist(a, p) + dist(p, b) - length) <= TOLERANCE * max(length, 1)
+
+
+def check(spruces: Sequence[Spruce]) -> Tuple[bool, int, int]:
+    """
+    :return: Совпадают ли обводки, количество исходных многоугольников и частей в дереве.
+    """
+
+    coords, faces = spruce_faces(spruces)
+    tree = BSPTree(coords, faces)
+    vertices = tree.vertices
+
+    # Отрезки обводки частей, сгруппированные по исходным многоугольникам
+    segments: List[List[Tuple[Point, Point]]] = [[] for _ in faces]
+
+    for face, source, outline in zip(tree.faces, tree.sources, tree.outlines):
+        for run in outline_runs(outline):
+            for j, k in zip(run, run[1:]):
+                segments[source].append((point(vertices, face[j]), point(vertices, face[k])))
+
+    for source, face in enumerate(faces):
+        edges = [
+            (point(coords, face[j]), point(coords, face[j + 1 - len(face)]))
+            for j in range(len(face))
+        ]
+        covered = [0.0] * len(edges)
+
+        for a, b in segments[source]:
+            edge = next((
+                e for e, (p, q) in enumerate(edges)
+                if on_segment(a, p, q) and on_segment(b, p, q)
+            ), None)
+
+            # Линия разреза внутри исходного многоугольника
+            if edge is None:
+                return False, len(faces), len(tree.faces)
+
+            covered[edge] += dist(a, b)
+
+        if any(abs(length - dist(p, q)) > TOLERANCE * max(dist(p, q), 1)
+               for length, (p, q) in zip(covered, edges)):
+            return False, len(faces), len(tree.faces)
+
+    return True, len(faces), len(tree.faces)
+
+
+def main() -> None:
+    scenes = {
+        'одна ель': [Spruce(Point3D(0, 0, 0), 150, 75, 3)],
+        'пересекающиеся ели': [
+            Spruce(Point3D(0, 0, 0), 150, 75, 3),
+            Spruce(Point3D(40, 10, 30), 120, 60, 4),
+            Spruce(Point3D(-30, -20, 15), 180, 50, 2),
+        ],
+    }
+
+    failed = False
+    for name, spruces in scenes.items():
+        passed, sources, fragments = check(spruces)
+        failed |= not passed
+        print(f"{name:>20}: многоугольников {sources}, частей {fragments}, "
+              f"обводка {'совпадает' if passed else 'НЕ СОВПАДАЕТ'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Проверка чтения и записи сеток (graphics.mesh_io) на корректных и испорченных файлах.
+
+Корректные файлы создаются сохранением фигуры и должны читаться без потери
+геометрии. Испорченные файлы OBJ и PLY (ascii и двоичный) должны вызывать
+ошибку с номером строки или грани, а не приводить к сетке с неверными индексами.
+
+Пример:
+    python tools/check_mesh_io.py
+"""
+
+import os
+import struct
+import sys
+import tempfile
+from typing import Callable, Type
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from figures import Cone
+from graphics.mesh_io import load_obj, load_ply, save_mesh, load_mesh
+from graphics.types import Point3D
+
+PLY_HEADER = '''ply
+format {format} 1.0
+element vertex 3
+property float x
+property float y
+property float z
+element face 2
+property list uchar int vertex_indices
+end_header
+'''
+
+OBJ_WHITESPACE = 'v 0 0 0\nv 1 0 0\n  v 0 0 1\nv\t0 1 0\nf\t1\t2\t4\nf 1 2 3\r\n# комментарий\nvn 0 0 1\n'
+
+
+def expect_error(load: Callable[[str], object], path: str, error: Type[Exception], text: str) -> bool:
+    try:
+        load(path)
+    except error as e:
+        return text in str(e)
+
+    return False
+
+
+def main() -> None:
+    directory = tempfile.mkdtemp()
+
+    def write(name: str, data: bytes) -> str:
+        path = os.path.join(directory, name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    cone = Cone(Point3D(0, 0, 0), 75, 150, 2, 12)
+    checks = {}
+
+    for name in ('cone.obj', 'cone.ply'):
+        path = os.path.join(directory, name)
+        save_mesh(cone, path)
+        mesh = load_mesh(path)
+        checks[f'{name} без потерь'] = \
+            list(mesh.faces) == list(cone.faces) and list(mesh.vertices) == list(cone.vertices)
+
+    mesh = load_obj(write('whitespace.obj', OBJ_WHITESPACE.encode()))
+    checks['OBJ с отступами и табуляцией'] = \
+        (mesh.vertices_count, mesh.faces_count, list(mesh.faces)) == (4, 2, [0, 1, 3, 0, 1, 2])
+
+    checks['OBJ: индекс вне диапазона'] = expect_error(
+        load_obj, write('bad.obj', b'v 0 0 0\nv 1 0 0\nf 1 2 5\n'), IndexError, 'Строка 3'
+    )
+    checks['OBJ: нулевой индекс'] = expect_error(
+        load_obj, write('zero.obj', b'v 0 0 0\nv 1 0 0\nv 0 1 0\nf 0 1 2\n'), IndexError, 'Строка 4'
+    )
+
+    ascii_ply = PLY_HEADER.format(format='ascii') + '0 0 0\n1 0 0\n0 1 0\n3 0 1 2\n3 0 1 7\n'
+    checks['PLY ascii: индекс вне диапазона'] = expect_error(
+        load_ply, write('bad_ascii.ply', ascii_ply.encode('ascii')), IndexError, 'Грань 1'
+    )
+
+    negative_ply = PLY_HEADER.format(format='ascii') + '0 0 0\n1 0 0\n0 1 0\n3 0 -1 2\n3 0 1 2\n'
+    checks['PLY ascii: отрицательный индекс'] = expect_error(
+        load_ply, write('negative_ascii.ply', negative_ply.encode('ascii')), IndexError, 'Грань 0'
+    )
+
+    binary_ply = PLY_HEADER.format(format='binary_little_endian').encode('ascii') \
+        + struct.pack('<9f', 0, 0, 0, 1, 0, 0, 0, 1, 0) \
+        + struct.pack('<B3i', 3, 0, 1, 2) + struct.pack('<B3i', 3, 0, 3, 2)
+    checks['PLY binary: индекс вне диапазона'] = expect_error(
+        load_ply, write('bad_binary.ply', binary_ply), IndexError, 'Грань 1'
+    )
+
+    failed = False
+    for name, passed in checks.items():
+        failed |= not passed
+        print(f"{name:>36}: {'да' if passed else 'НЕТ'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Замер памяти, занимаемой фигурами и их отрисовкой.
+
+figures - для каждой фигуры выводит оценку memory_usage с разбивкой,
+число байт на вершину и пиковый объем памяти при построении (tracemalloc).
+Кэш фигур очищается перед каждой фигурой, поэтому построение выполняется полностью.
+
+forest - оценивает память на одну ель в наборе из count елей с общим кэшем
+фигур и количество елей, помещающихся в заданный объем памяти.
+
+frame - выделения памяти при отрисовке кадров SpruceImage.draw без экрана
+(платформа Qt offscreen): пик и остаток после кадра.
+
+Примеры:
+    python tools/memory_benchmark.py figures
+    python tools/memory_benchmark.py forest --count 1000 --limit-mb 512
+    python tools/memory_benchmark.py frame --frames 50 --bsp
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tracemalloc
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from figures import Spruce, Cone, Cylinder, TieredCone, Leg, Parrallelepiped
+from graphics.cache import figure_cache
+from graphics.figures import AbstractFigure
+from graphics.memory import MemoryUsage
+from graphics.mesh import Mesh
+from graphics.types import Point3D
+
+FIGURES: Dict[str, Callable[[], AbstractFigure]] = {
+    'Spruce': lambda: Spruce(Point3D(0, 0, 0), 150, 75, 3),
+    'Cone': lambda: Cone(Point3D(0, 0, 0), 75, 150, 3),
+    'Cylinder': lambda: Cylinder(Point3D(0, 0, 0), 20, 40),
+    'TieredCone': lambda: TieredCone(Point3D(0, 0, 0), 75, 150),
+    'Leg': lambda: Leg(Point3D(0, 0, 0), 40),
+    'Parrallelepiped': lambda: Parrallelepiped(Point3D(0, 0, 0), 10, 40, 10),
+}
+
+
+def vertices_count(figure: AbstractFigure) -> int:
+    """Количество различных вершин фигуры"""
+
+    if isinstance(figure, Mesh):
+        return figure.vertices_count
+
+    return Mesh.from_figure(figure).vertices_count
+
+
+def report_figures() -> None:
+    print(f"{'фигура':>16} {'вершин':>7} {'всего, B':>9} {'вершины':>8} {'многоуг.':>8} "
+          f"{'кэши':>6} {'B/вершину':>9} {'пик построения, B':>17}")
+
+    for name, create in FIGURES.items():
+        figure_cache.clear()
+
+        tracemalloc.start()
+        figure = create()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        usage = figure.memory_usage()
+        count = vertices_count(figure)
+
+        print(f"{name:>16} {count:>7} {usage.total:>9} {usage.vertices:>8} {usage.polygons:>8} "
+              f"{usage.caches:>6} {usage.total / count:>9.1f} {peak:>17}")
+
+
+def report_forest(count: int, limit_mb: float) -> None:
+    figure_cache.clear()
+
+    tracemalloc.start()
+    spruces = [Spruce(Point3D(10 * i, 0, 0), 150, 75, 3) for i in range(count)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seen = set()
+    usage = sum((spruce.memory_usage(seen) for spruce in spruces), MemoryUsage())
+    per_spruce = usage.total / count
+
+    print(f"Елей: {count}, memory_usage: {usage}")
+    print(f"На одну ель: {per_spruce:.0f} B (tracemalloc: {current / count:.0f} B, пик построения {peak} B)")
+    print(f"В {limit_mb:g} MB помещается около {int(limit_mb * 2 ** 20 / per_spruce)} елей")
+
+
+def report_frames(frames: int, size: int, use_bsp: bool) -> None:
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QGuiApplication, QImage, QPainter
+
+    from graphics.lighting import Lighting, DirectionalLight
+    from graphics.transformation import Transformation
+    from graphics_qt.images import SpruceImage
+    from graphics_qt.projections import CentralProjection
+
+    app = QGuiApplication(sys.argv)
+
+    image = SpruceImage(
+        Spruce(Point3D(0, 0, 0), size / 3, size / 6, 3), CentralProjection('z', 400),
+        Transformation(0, 0, 1), Lighting([DirectionalLight(Point3D(1, -1, 1))]), use_bsp
+    )
+    frame = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+
+    peaks: List[int] = []
+    retained: List[int] = []
+
+    tracemalloc.start()
+
+    # Первый кадр создает буферы образа и в замер не входит
+    for i in range(frames + 1):
+        frame.fill(Qt.transparent)
+        painter = QPainter(frame)
+        painter.translate(size / 2, size / 2)
+
+        image.transformation.increase_y_rotation(360 / frames)
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+
+        image.draw(painter)
+
+        after, peak = tracemalloc.get_traced_memory()
+        painter.end()
+
+        if i > 0:
+            peaks.append(peak - before)
+            retained.append(after - before)
+
+    tracemalloc.stop()
+    app.quit()
+
+    print(f"Кадров: {frames}, BSP: {'да' if use_bsp else 'нет'}, размер образа: {image.figure.memory_usage()}")
+    print(f"Пик выделений за кадр: медиана {statistics.median(peaks):.0f} B, максимум {max(peaks)} B")
+    print(f"Остается после кадра: медиана {statistics.median(retained):.0f} B, всего {sum(retained)} B")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('figures', help='память отдельных фигур')
+
+    forest_parser = commands.add_parser('forest', help='память на одну ель в большом наборе')
+    forest_parser.add_argument('--count', type=int, default=500)
+    forest_parser.add_argument('--limit-mb', type=float, default=1024, help='объем памяти для оценки числа елей')
+
+    frame_parser = commands.add_parser('frame', help='выделения памяти при отрисовке кадров')
+    frame_parser.add_argument('--frames', type=int, default=30)
+    frame_parser.add_argument('--size', type=int, default=600, help='размер кадра в пикселях')
+    frame_parser.add_argument('--bsp', action='store_true', help='порядок отрисовки по BSP-дереву')
+
+    args = parser.parse_args()
+
+    match args.command:
+        case 'figures':
+            report_figures()
+        case 'forest':
+            report_forest(args.count, args.limit_mb)
+        case 'frame':
+            report_frames(args.frames, args.size, args.bsp)
+
+
+if __name__ == '__main__':
+    main()
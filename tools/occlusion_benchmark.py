@@ -0,0 +1,83 @@
+"""
+Замер отсечения закрытых елей в сцене SceneImage.
+
+Строится случайный лес, кадры рисуются без экрана (платформа Qt offscreen)
+с отсечением и без него при нескольких поворотах сцены. Для каждого поворота
+выводятся количество нарисованных многоугольников, количество отсеченных
+частей елей и время кадра. По умолчанию ели заливаются непрозрачными текстурами
+SceneImage. С --translucent используются полупрозрачные текстуры SpruceImage, которые
+не заслоняют (отсекаются только части вне кадра), если не задан --translucent-occluders.
+
+Пример:
+    python tools/occlusion_benchmark.py --count 400 --rotations -5 -10 -20
+    python tools/occlusion_benchmark.py --translucent --translucent-occluders
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QGuiApplication, QImage, QPainter
+
+from figures import Spruce
+from graphics.occlusion import OcclusionBuffer
+from graphics.transformation import Transformation
+from graphics.types import Point3D
+from graphics_qt.images import SceneImage, SpruceImage
+from graphics_qt.projections import CentralProjection
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=200, help='количество елей')
+    parser.add_argument('--rotations', type=float, nargs='+', default=[-5, -10, -20], help='повороты вокруг оси X')
+    parser.add_argument('--size', type=int, default=800, help='размер кадра в пикселях')
+    parser.add_argument('--cells', type=int, default=OcclusionBuffer.CELLS, help='разрешение буфера перекрытия')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--translucent', action='store_true', help='полупрозрачные текстуры SpruceImage')
+    parser.add_argument('--translucent-occluders', action='store_true',
+                        help='заслонять и полупрозрачными частями (приблизительное отсечение)')
+    args = parser.parse_args()
+
+    app = QGuiApplication(sys.argv)
+
+    rng = random.Random(args.seed)
+    spruces = [
+        Spruce(Point3D(rng.uniform(-500, 500), 0, rng.uniform(-100, 2000)), 150, 75, 3)
+        for _ in range(args.count)
+    ]
+    frame = QImage(args.size, args.size, QImage.Format_ARGB32_Premultiplied)
+    textures = (SpruceImage.CONE_TEXTURE, SpruceImage.LEG_TEXTURE) if args.translucent else None
+
+    for rotation in args.rotations:
+        for culling in (False, True):
+            image = SceneImage(spruces, CentralProjection('z', 400), Transformation(rotation, 0, 1),
+                               culling=culling, cells=args.cells,
+                               translucent_occluders=args.translucent_occluders, textures=textures)
+            image.viewport = QRectF(-args.size / 2, -args.size / 2, args.size, args.size)
+
+            frame.fill(Qt.white)
+            painter = QPainter(frame)
+            painter.translate(args.size / 2, args.size / 2)
+
+            started_at = time.perf_counter()
+            image.draw(painter)
+            elapsed = time.perf_counter() - started_at
+            painter.end()
+
+            print(f"поворот {rotation:>6g}, отсечение {'да ' if culling else 'нет'}: "
+                  f"многоугольников {image.drawn_polygons:>7}, отсечено частей {image.culled_parts:>5}, "
+                  f"{elapsed * 1000:.0f} ms")
+
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
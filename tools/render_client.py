@@ -0,0 +1,57 @@
+"""
+Клиент сервиса отрисовки tools/render_service.py.
+
+Модуль не зависит от Qt и геометрии фигур, поэтому его могут использовать процессы,
+которым нужны только готовые кадры. Описание протокола и формата запроса -
+в tools/render_service.py.
+
+Пример:
+    python tools/render_client.py --socket /tmp/cg4-render.sock --out frame.png '{"width": 128, "height": 128}'
+"""
+
+import argparse
+import json
+import socket
+from typing import Dict, Any
+
+
+def request_frame(path: str, request: Dict[str, Any]) -> bytes:
+    """Запрашивает у сервиса кадр и возвращает его PNG"""
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(path)
+        connection.sendall(json.dumps(request).encode() + b'\n')
+
+        stream = connection.makefile('rb')
+        line = stream.readline()
+
+        if not line:
+            raise ConnectionError("Сервис закрыл соединение, не ответив на запрос!")
+
+        header = json.loads(line)
+
+        if not header['ok']:
+            raise ValueError(header['error'])
+
+        return stream.read(header['size'])
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--socket', required=True)
+    parser.add_argument('--out', required=True)
+    parser.add_argument('request', help='запрос в формате JSON')
+
+
+def render(args: argparse.Namespace) -> None:
+    with open(args.out, 'wb') as file:
+        file.write(request_frame(args.socket, json.loads(args.request)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    render(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
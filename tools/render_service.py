@@ -0,0 +1,342 @@
+"""
+Локальный сервис отрисовки кадров фигур.
+
+Сервис принимает запросы через Unix-сокет и возвращает кадры в формате PNG,
+поэтому другим процессам не нужно самим загружать Qt. Клиент находится
+в модуле tools/render_client.py, не зависящем от Qt. Модуль сервиса тоже
+загружает Qt только при отрисовке, так что проверку запросов (normalize_request)
+можно использовать без Qt. Протокол построчный:
+клиент отправляет запрос - объект JSON в одной строке, сервис отвечает строкой
+JSON с заголовком ({"ok": true, "size": N, "cached": ...} или {"ok": false, "error": ...}),
+за которой в случае успеха следуют N байт изображения.
+
+Пример запроса:
+    {"figure": {"type": "spruce", "height": 150, "radius": 75, "levels": 3},
+     "transformation": {"x_rotation": -10, "y_rotation": 45, "scale": 1},
+     "projection": {"type": "central", "axle": "z", "distance": 400},
+     "width": 256, "height": 256}
+
+Кадры отрисовываются пулом потоков. Одинаковые запросы, поступившие во время
+отрисовки, ожидают один и тот же кадр, а готовые кадры хранятся в LRU-кэше,
+поэтому повторные запросы (превью вращения, миниатюры) отдаются без отрисовки.
+
+Запуск сервиса и запрос кадра:
+    python tools/render_service.py serve --socket /tmp/cg4-render.sock
+    python tools/render_service.py render --socket /tmp/cg4-render.sock --out frame.png '{"width": 128, "height": 128}'
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple, Any, TYPE_CHECKING
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from figures import Spruce, Cone, Cylinder, TieredCone, Leg
+from graphics.cache import figure_cache
+from graphics.lighting import Lighting, DirectionalLight
+from graphics.transformation import Transformation
+from graphics.types import Point3D
+from tools import render_client
+
+if TYPE_CHECKING:
+    from graphics_qt.images import AbstractFigureImage
+    from graphics_qt.projections import Projection
+
+FIGURES = {
+    'spruce': (Spruce, {'height': 150.0, 'radius': 75.0, 'levels': 3, 'sides_count': Cone.SIDES_COUNT}),
+    'cone': (Cone, {'radius': 75.0, 'height': 150.0, 'levels_count': 0, 'sides_count': Cone.SIDES_COUNT}),
+    'cylinder': (Cylinder, {'radius': 50.0, 'height': 150.0, 'sides_count': Cylinder.SIDES_COUNT}),
+    'tiered_cone': (TieredCone, {'radius': 75.0, 'height': 150.0, 'tiers_count': 3,
+                                 'sides_count': TieredCone.SIDES_COUNT}),
+    'leg': (Leg, {'height': 40.0, 'detail': 0}),
+}
+"""Тип фигуры -> (класс, параметры конструктора по умолчанию). Фигуры строятся в начале координат."""
+
+PROJECTIONS = {
+    'central': {'axle': 'z', 'distance': 400.0},
+    'orthographic': {'axle': 'z'},
+}
+
+TRANSFORMATION_DEFAULTS = {'x_rotation': 0.0, 'y_rotation': 0.0, 'scale': 1.0}
+
+MAX_FRAME_SIDE = 4096
+
+LIGHT = DirectionalLight(Point3D(1, -1, 1))
+
+
+def _with_defaults(spec: Dict[str, Any], defaults: Dict[str, Any], what: str) -> Dict[str, Any]:
+    """
+    Дополняет параметры значениями по умолчанию. Тип каждого параметра задается
+    его значением по умолчанию, целые числа в дробных параметрах приводятся к float,
+    чтобы 1 и 1.0 давали один ключ кэша.
+    """
+
+    unknown = set(spec) - set(defaults)
+
+    if unknown:
+        raise ValueError(f"Неизвестные параметры {what}: {', '.join(sorted(unknown))}!")
+
+    result = dict(defaults)
+
+    for name, value in spec.items():
+        default = defaults[name]
+
+        if isinstance(value, bool):
+            raise TypeError(f"Неверный тип параметра {what} {name}!")
+
+        if isinstance(default, float) and isinstance(value, (int, float)):
+            result[name] = float(value)
+        elif type(value) is type(default):
+            result[name] = value
+        else:
+            raise TypeError(f"Неверный тип параметра {what} {name}!")
+
+    return result
+
+
+def normalize_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Проверяет запрос и дополняет его значениями по умолчанию"""
+
+    if not isinstance(request, dict):
+        raise TypeError("Запрос должен быть объектом JSON!")
+
+    figure = dict(request.get('figure', {}))
+    figure_type = figure.pop('type', 'spruce')
+
+    if figure_type not in FIGURES:
+        raise ValueError(f"Неизвестный тип фигуры {figure_type}!")
+
+    projection = dict(request.get('projection', {}))
+    projection_type = projection.pop('type', 'central')
+
+    if projection_type not in PROJECTIONS:
+        raise ValueError(f"Неизвестный тип проекции {projection_type}!")
+
+    transformation = _with_defaults(request.get('transformation', {}), TRANSFORMATION_DEFAULTS, 'преобразования')
+
+    width, height = request.get('width', 256), request.get('height', 256)
+
+    if not all(isinstance(side, int) and 0 < side <= MAX_FRAME_SIDE for side in (width, height)):
+        raise ValueError(f"Размеры кадра должны быть целыми числами от 1 до {MAX_FRAME_SIDE}!")
+
+    return {
+        'figure': {'type': figure_type, **_with_defaults(figure, FIGURES[figure_type][1], 'фигуры')},
+        'projection': {'type': projection_type, **_with_defaults(projection, PROJECTIONS[projection_type], 'проекции')},
+        'transformation': transformation,
+        'width': width,
+        'height': height,
+        'lighting': bool(request.get('lighting', True)),
+    }
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """Ключ нормализованного запроса для кэша и объединения одинаковых запросов"""
+
+    return json.dumps(request, sort_keys=True, separators=(',', ':'))
+
+
+def _create_projection(spec: Dict[str, Any]) -> 'Projection':
+    from graphics_qt.projections import CentralProjection, OrthographicProjection
+
+    match spec['type']:
+        case 'central':
+            return CentralProjection(spec['axle'], spec['distance'])
+        case 'orthographic':
+            return OrthographicProjection(spec['axle'])
+
+
+def _create_image(request: Dict[str, Any]) -> 'AbstractFigureImage':
+    from graphics_qt.images import SpruceImage, FigureFrameworkImage
+
+    spec = dict(request['figure'])
+    figure_class, _ = FIGURES[spec.pop('type')]
+    projection = _create_projection(request['projection'])
+    transformation = Transformation(0, 0, 1)
+
+    if figure_class is Spruce:
+        lighting = Lighting([LIGHT]) if request['lighting'] else None
+        return SpruceImage(Spruce(Point3D(0, 0, 0), **spec), projection, transformation, lighting, use_bsp=True)
+
+    return FigureFrameworkImage(
+        figure_cache.get(figure_class, Point3D(0, 0, 0), **spec), projection, transformation, transformed=True
+    )
+
+
+class _ImagePool(threading.local):
+    """
+    Образы фигур, созданные потоком пула. Образ хранит буферы отрисовки,
+    поэтому у каждого потока свои образы, а геометрия берется из общего кэша фигур.
+    """
+
+    MAX_SIZE = 8
+
+    def __init__(self):
+        self.images: 'OrderedDict[str, AbstractFigureImage]' = OrderedDict()
+
+    def get(self, request: Dict[str, Any]) -> 'AbstractFigureImage':
+        key = request_key({name: request[name] for name in ('figure', 'projection', 'lighting')})
+        image = self.images.get(key)
+
+        if image is None:
+            image = self.images[key] = _create_image(request)
+
+            if len(self.images) > self.MAX_SIZE:
+                self.images.popitem(last=False)
+        else:
+            self.images.move_to_end(key)
+
+        return image
+
+
+_images = _ImagePool()
+
+
+def render_png(request: Dict[str, Any]) -> bytes:
+    """Отрисовывает нормализованный запрос и кодирует кадр в PNG"""
+
+    from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+    from graphics_qt.rendering import render_frame
+
+    image = _images.get(request)
+    image.transformation.assign(Transformation(**request['transformation']))
+
+    frame = render_frame(image, request['width'], request['height'])
+
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    frame.save(buffer, 'PNG')
+    buffer.close()
+
+    return bytes(data)
+
+
+class RenderService:
+    """Сервис отрисовки с объединением одинаковых запросов и LRU-кэшем кадров"""
+
+    def __init__(self, workers: int = os.cpu_count() or 1, cache_size: int = 256):
+        if cache_size < 0:
+            raise ValueError("Размер кэша не может быть отрицательным!")
+
+        self.__executor = ThreadPoolExecutor(workers, thread_name_prefix='render')
+        self.__cache: 'OrderedDict[str, bytes]' = OrderedDict()
+        self.__cache_size = cache_size
+        self.__in_flight: Dict[str, asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0
+        """Количество запросов, дождавшихся кадра, который уже отрисовывался для другого запроса"""
+
+    async def render(self, request: Dict[str, Any]) -> Tuple[bytes, bool]:
+        """
+        :return: Кадр в формате PNG и признак того, что он взят из кэша.
+        """
+
+        request = normalize_request(request)
+        key = request_key(request)
+
+        frame = self.__cache.get(key)
+
+        if frame is not None:
+            self.__cache.move_to_end(key)
+            self.hits += 1
+            return frame, True
+
+        future = self.__in_flight.get(key)
+
+        if future is not None:
+            self.joined += 1
+            # Отмена одного ожидающего клиента не должна отменять отрисовку для остальных
+            return await asyncio.shield(future), False
+
+        self.misses += 1
+        future = asyncio.get_running_loop().run_in_executor(self.__executor, render_png, request)
+        self.__in_flight[key] = future
+
+        try:
+            frame = await asyncio.shield(future)
+        finally:
+            del self.__in_flight[key]
+
+        if self.__cache_size > 0:
+            self.__cache[key] = frame
+
+            while len(self.__cache) > self.__cache_size:
+                self.__cache.popitem(last=False)
+
+        return frame, False
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    frame, cached = await self.render(json.loads(line))
+                except Exception as error:
+                    # Ошибка отрисовки не должна закрывать соединение без ответа
+                    writer.write(json.dumps({'ok': False, 'error': str(error)}, ensure_ascii=False).encode() + b'\n')
+                else:
+                    writer.write(json.dumps({'ok': True, 'size': len(frame), 'cached': cached}).encode() + b'\n')
+                    writer.write(frame)
+
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, path: str) -> None:
+        if os.path.exists(path):
+            os.unlink(path)
+
+        server = await asyncio.start_unix_server(self.handle_client, path)
+
+        async with server:
+            await server.serve_forever()
+
+    def shutdown(self) -> None:
+        self.__executor.shutdown(wait=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help='запустить сервис')
+    serve_parser.add_argument('--socket', required=True)
+    serve_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    serve_parser.add_argument('--cache-size', type=int, default=256)
+
+    render_parser = commands.add_parser('render', help='запросить кадр у запущенного сервиса')
+    render_client.add_arguments(render_parser)
+
+    args = parser.parse_args()
+
+    match args.command:
+        case 'serve':
+            os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+            from PyQt5.QtGui import QGuiApplication
+
+            # Объект приложения нужен Qt для работы с изображениями и шрифтами
+            app = QGuiApplication.instance() or QGuiApplication([])
+            service = RenderService(args.workers, args.cache_size)
+
+            try:
+                asyncio.run(service.serve(args.socket))
+            except KeyboardInterrupt:
+                pass
+            finally:
+                service.shutdown()
+                del app
+        case 'render':
+            render_client.render(args)
+
+
+if __name__ == '__main__':
+    main()
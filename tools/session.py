@@ -0,0 +1,328 @@
+"""
+Запись сеансов работы с окнами лабораторных работ и их воспроизведение без экрана.
+
+record - запускает окно лабораторной работы и записывает в файл события ввода,
+которые обрабатывает главный виджет: нажатия клавиш (включая автоповтор),
+прокрутку колеса и выбор в выпадающих списках (тип проекции в lab4). После каждого
+события записывается состояние преобразований всех виджетов вида, если оно изменилось.
+
+replay - создает то же окно без экрана (платформа Qt offscreen) и отправляет ему
+записанные события в те же моменты времени. Время кадра - время от момента, когда
+событие должно было произойти, до окончания первой после него перерисовки виджета
+вида, поэтому в него входит и ожидание обработки предыдущих событий. Кадр, не
+уложившийся в бюджет, считается пропустившим ceil(время / бюджет) - 1 кадров.
+
+Файл сеанса - JSON Lines: первая строка описывает окно, остальные - события
+с временем t в секундах от начала записи.
+
+Примеры:
+    python tools/session.py record lab4 rotate.jsonl
+    python tools/session.py replay rotate.jsonl --speed 2
+    python tools/session.py replay lab5.jsonl --budget-ms 30
+"""
+
+import argparse
+import importlib
+import json
+import math
+import os
+import sys
+import time
+from typing import List, Dict, Optional, TextIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graphics.transformation import Transformation
+
+MODULES = ('lab4', 'lab5')
+WINDOW_SIZE = 800
+
+SESSION_VERSION = 1
+FINISH_TIMEOUT_MS = 2000
+TOLERANCE = 1e-6
+
+
+def transformation_state(transformation: Optional[Transformation]) -> Optional[Dict]:
+    if transformation is None:
+        return None
+
+    orientation = transformation.orientation
+
+    return {
+        'x_rotation': transformation.x_rotation,
+        'y_rotation': transformation.y_rotation,
+        'scale': transformation.scale,
+        'orientation': [orientation.w, orientation.x, orientation.y, orientation.z],
+    }
+
+
+def same_states(first: List[Optional[Dict]], second: List[Optional[Dict]]) -> bool:
+    def values(states):
+        for state in states:
+            if state is not None:
+                yield state['x_rotation']
+                yield state['y_rotation']
+                yield state['scale']
+                yield from state['orientation']
+
+    if [state is None for state in first] != [state is None for state in second]:
+        return False
+
+    return all(math.isclose(a, b, abs_tol=TOLERANCE) for a, b in zip(values(first), values(second)))
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Процентиль по методу ближайшего ранга"""
+
+    ordered = sorted(values)
+    return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+
+def create_window(module: str):
+    lab = importlib.import_module(module)
+    window = lab.MainWidget(f'Сеанс {module}', WINDOW_SIZE, WINDOW_SIZE)
+    window.show()
+
+    return lab, window
+
+
+def record(module: str, path: str) -> None:
+    from PyQt5.QtCore import QObject, QEvent, QTimer
+    from PyQt5.QtWidgets import QApplication, QComboBox
+
+    from widgets.views import AbstractViewWidget
+
+    class Recorder(QObject):
+        """Записывает события, доставленные главному виджету"""
+
+        def __init__(self, window, output: TextIO):
+            super().__init__()
+
+            self.__window = window
+            self.__output = output
+            self.__started_at = time.perf_counter()
+            self.__views = window.findChildren(AbstractViewWidget)
+            self.__last_state = self.__state()
+
+            for i, combo_box in enumerate(window.findChildren(QComboBox)):
+                combo_box.currentTextChanged.connect(
+                    lambda text, i=i: self.__write({'type': 'select', 'index': i, 'text': text})
+                )
+
+            self.__write({
+                'type': 'session', 'version': SESSION_VERSION, 'module': module,
+                'width': window.width(), 'height': window.height(),
+            }, with_time=False)
+
+        def eventFilter(self, obj, event) -> bool:
+            # Событие, не обработанное дочерним виджетом, доставляется каждому его родителю,
+            # поэтому записывается только доставка главному виджету
+            if obj is not self.__window:
+                return False
+
+            match event.type():
+                case QEvent.KeyPress:
+                    self.__write({
+                        'type': 'key', 'key': event.key(), 'modifiers': int(event.modifiers()),
+                        'text': event.text(), 'autorepeat': event.isAutoRepeat(),
+                    })
+                case QEvent.Wheel:
+                    self.__write({
+                        'type': 'wheel', 'x': event.position().x(), 'y': event.position().y(),
+                        'delta_x': event.angleDelta().x(), 'delta_y': event.angleDelta().y(),
+                        'modifiers': int(event.modifiers()),
+                    })
+
+            return False
+
+        def __write(self, entry: Dict, with_time: bool = True) -> None:
+            if with_time:
+                entry = {'t': round(time.perf_counter() - self.__started_at, 6), **entry}
+                # Преобразование изменяется обработчиком события, то есть после фильтра
+                QTimer.singleShot(0, self.__write_state)
+
+            self.__output.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+        def __write_state(self) -> None:
+            state = self.__state()
+
+            if state != self.__last_state:
+                self.__last_state = state
+                self.__output.write(json.dumps({
+                    't': round(time.perf_counter() - self.__started_at, 6),
+                    'type': 'transformation', 'views': state,
+                }) + '\n')
+
+        def __state(self) -> List[Optional[Dict]]:
+            return [transformation_state(view.transformation) for view in self.__views]
+
+    app = QApplication(sys.argv)
+    _, window = create_window(module)
+
+    with open(path, 'w', encoding='utf-8') as output:
+        recorder = Recorder(window, output)
+        app.installEventFilter(recorder)
+        app.exec_()
+
+    print(f"Сеанс записан в {path}")
+
+
+def replay(path: str, speed: float, budget_ms: Optional[float], warmup: float) -> None:
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    from PyQt5.QtCore import Qt, QEvent, QTimer, QPoint, QPointF
+    from PyQt5.QtGui import QKeyEvent, QWheelEvent
+    from PyQt5.QtWidgets import QApplication, QComboBox
+
+    from widgets.views import AbstractViewWidget
+
+    if speed <= 0:
+        raise ValueError("Скорость воспроизведения должна быть положительной!")
+
+    with open(path, encoding='utf-8') as file:
+        entries = [json.loads(line) for line in file if line.strip()]
+
+    if not entries or entries[0].get('type') != 'session':
+        raise ValueError(f"Файл {path} не является записью сеанса!")
+
+    header, entries = entries[0], entries[1:]
+
+    if header.get('version') != SESSION_VERSION:
+        raise ValueError(f"Неподдерживаемая версия записи сеанса {header.get('version')}!")
+
+    inputs = [entry for entry in entries if entry['type'] != 'transformation']
+    states = [entry['views'] for entry in entries if entry['type'] == 'transformation']
+
+    if not inputs:
+        raise ValueError("В записи сеанса нет событий ввода!")
+
+    app = QApplication(sys.argv)
+    lab, window = create_window(header['module'])
+    window.resize(header['width'], header['height'])
+
+    if budget_ms is None:
+        budget_ms = getattr(lab.MainWidget, 'FRAME_INTERVAL_MS', 1000 / 60)
+
+    views = window.findChildren(AbstractViewWidget)
+    combo_boxes = window.findChildren(QComboBox)
+
+    # Моменты, в которые должны были произойти события, еще не показанные на экране
+    pending: List[float] = []
+    frame_times: List[float] = []
+    paint_times: List[float] = []
+    started_at = 0.0
+
+    def timed_paint(paint_event):
+        def wrapper(event) -> None:
+            paint_started_at = time.perf_counter()
+            paint_event(event)
+            finished_at = time.perf_counter()
+
+            if started_at > 0:
+                paint_times.append(finished_at - paint_started_at)
+                frame_times.extend(finished_at - due for due in pending)
+                pending.clear()
+
+        return wrapper
+
+    for view in views:
+        # PyQt вызывает переопределенный у экземпляра метод вместо метода класса
+        view.paintEvent = timed_paint(view.paintEvent)
+
+    def dispatch(entry: Dict) -> None:
+        match entry['type']:
+            case 'key':
+                event = QKeyEvent(
+                    QEvent.KeyPress, entry['key'], Qt.KeyboardModifiers(entry['modifiers']),
+                    entry['text'], entry['autorepeat']
+                )
+                QApplication.sendEvent(window, event)
+            case 'wheel':
+                position = QPointF(entry['x'], entry['y'])
+                event = QWheelEvent(
+                    position, QPointF(window.mapToGlobal(position.toPoint())), QPoint(),
+                    QPoint(entry['delta_x'], entry['delta_y']), Qt.NoButton,
+                    Qt.KeyboardModifiers(entry['modifiers']), Qt.NoScrollPhase, False
+                )
+                QApplication.sendEvent(window, event)
+            case 'select':
+                combo_boxes[entry['index']].setCurrentText(entry['text'])
+            case _:
+                raise ValueError(f"Неизвестный тип события {entry['type']}!")
+
+    def delay(entry: Dict) -> float:
+        """Время события в секундах от начала воспроизведения"""
+
+        return (entry['t'] - inputs[0]['t']) / speed
+
+    def send(entry: Dict) -> None:
+        pending.append(started_at + delay(entry))
+        dispatch(entry)
+
+        if entry is inputs[-1]:
+            QTimer.singleShot(FINISH_TIMEOUT_MS, app.quit)
+
+    def start() -> None:
+        nonlocal started_at
+        started_at = time.perf_counter()
+
+        for entry in inputs:
+            QTimer.singleShot(round(delay(entry) * 1000), Qt.PreciseTimer, lambda entry=entry: send(entry))
+
+    # Ожидание построения фигуры и первого кадра
+    QTimer.singleShot(round(warmup * 1000), start)
+    app.exec_()
+
+    duration = time.perf_counter() - started_at
+    replayed_state = [transformation_state(view.transformation) for view in views]
+
+    print(f"Сеанс {header['module']}: событий {len(inputs)}, длительность {duration:.2f} s, "
+          f"скорость x{speed:g}, бюджет кадра {budget_ms:g} ms")
+
+    if not frame_times:
+        print("Ни одно событие не привело к перерисовке")
+        return
+
+    budget = budget_ms / 1000
+    dropped = sum(max(math.ceil(frame_time / budget) - 1, 0) for frame_time in frame_times)
+
+    print(f"Время кадра, ms: p50 {percentile(frame_times, 50) * 1000:.1f}, "
+          f"p95 {percentile(frame_times, 95) * 1000:.1f}, p99 {percentile(frame_times, 99) * 1000:.1f}, "
+          f"максимум {max(frame_times) * 1000:.1f}")
+    print(f"Время перерисовки, ms: p50 {percentile(paint_times, 50) * 1000:.1f}, "
+          f"p95 {percentile(paint_times, 95) * 1000:.1f}, p99 {percentile(paint_times, 99) * 1000:.1f}, "
+          f"перерисовок {len(paint_times)}")
+    print(f"Пропущено кадров: {dropped}, событий без кадра: {len(pending)}")
+
+    if states:
+        # В lab5 преобразование меняет и анимация, поэтому расхождение там ожидаемо
+        print(f"Итоговое преобразование: {'совпадает' if same_states(states[-1], replayed_state) else 'расходится'} "
+              f"с записанным")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help='запись сеанса в окне лабораторной работы')
+    record_parser.add_argument('module', choices=MODULES)
+    record_parser.add_argument('path', help='файл записи сеанса')
+
+    replay_parser = commands.add_parser('replay', help='воспроизведение сеанса без экрана')
+    replay_parser.add_argument('path', help='файл записи сеанса')
+    replay_parser.add_argument('--speed', type=float, default=1, help='множитель скорости воспроизведения')
+    replay_parser.add_argument('--budget-ms', type=float,
+                               help='бюджет кадра, по умолчанию интервал анимации окна или 1000/60')
+    replay_parser.add_argument('--warmup', type=float, default=2, help='ожидание перед первым событием, s')
+
+    args = parser.parse_args()
+
+    match args.command:
+        case 'record':
+            record(args.module, args.path)
+        case 'replay':
+            replay(args.path, args.speed, args.budget_ms, args.warmup)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Замер времени запуска: импорта модулей и появления первого кадра.
+
+Время импорта берется из отчета интерпретатора `python -X importtime`,
+время первого кадра - по окончании первой отрисовки виджета вида, у которого
+уже есть изображение фигуры (окно лабораторной работы запускается без экрана,
+платформа Qt offscreen). Отрисовки пустого окна до построения фигуры не учитываются. Каждый замер выполняется
+в новом процессе, поэтому кэш импорта не влияет на результат.
+
+Примеры:
+    python tools/startup_time.py import graphics.mesh figures graphics_qt.images
+    python tools/startup_time.py first-frame lab4 lab5 --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QT_MODULE = 'PyQt5'
+
+FIRST_FRAME_SCRIPT = '''
+import time
+started_at = time.perf_counter()
+
+import sys
+from PyQt5.QtCore import QObject, QEvent, QTimer
+from PyQt5.QtWidgets import QApplication
+import {module} as lab
+from widgets.views import AbstractViewWidget
+
+imported_at = time.perf_counter()
+
+
+def finish():
+    # Вызывается после обработки события отрисовки, поэтому время включает саму отрисовку
+    print(imported_at - started_at, time.perf_counter() - started_at, flush=True)
+    app.quit()
+
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and isinstance(obj, AbstractViewWidget) and obj.has_figure:
+            app.removeEventFilter(self)
+            QTimer.singleShot(0, finish)
+        return False
+
+
+app = QApplication([])
+first_paint = FirstPaint()
+app.installEventFilter(first_paint)
+window = lab.MainWidget('startup', 800, 800)
+window.show()
+app.exec_()
+sys.exit(0)
+'''
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def _environment() -> dict:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return env
+
+
+def parse_importtime(report: str) -> List[ImportRecord]:
+    """Разбирает отчет `-X importtime` (строки вида 'import time: self | cumulative | module')"""
+
+    records = []
+
+    for line in report.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us), depth))
+
+    return records
+
+
+def measure_import(module: str) -> List[ImportRecord]:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env=_environment(), capture_output=True, text=True
+    )
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Не удалось импортировать {module}:\n{result.stderr}")
+
+    return parse_importtime(result.stderr)
+
+
+def measure_first_frame(module: str) -> List[float]:
+    """Возвращает время импорта модуля и время до первого кадра с фигурой в секундах"""
+
+    result = subprocess.run(
+        [sys.executable, '-c', FIRST_FRAME_SCRIPT.format(module=module)],
+        cwd=ROOT, env=_environment(), capture_output=True, text=True, timeout=60
+    )
+
+    if result.returncode != 0 or not result.stdout.strip():
+        raise RuntimeError(f"Не удалось запустить {module}:\n{result.stderr}")
+
+    return [float(value) for value in result.stdout.split()]
+
+
+def report_import(modules: List[str], top: int) -> None:
+    for module in modules:
+        records = measure_import(module)
+        total = next((r for r in records if r.module == module), records[-1])
+        loads_qt = any(r.module == QT_MODULE or r.module.startswith(QT_MODULE + '.') for r in records)
+
+        print(f"{module}: {total.cumulative_us / 1000:.1f} ms, модулей {len(records)}, "
+              f"{'загружает' if loads_qt else 'не загружает'} {QT_MODULE}")
+
+        for record in sorted(records, key=lambda r: r.self_us, reverse=True)[:top]:
+            print(f"    {record.self_us / 1000:8.2f} ms  {record.module}")
+
+
+def report_first_frame(modules: List[str], repeat: int) -> None:
+    for module in modules:
+        imports, frames = [], []
+
+        for _ in range(repeat):
+            imported, painted = measure_first_frame(module)
+            imports.append(imported)
+            frames.append(painted)
+
+        print(f"{module}: импорт {statistics.median(imports) * 1000:.1f} ms, "
+              f"первый кадр {statistics.median(frames) * 1000:.1f} ms (медиана из {repeat})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help='время импорта модулей')
+    import_parser.add_argument('modules', nargs='+')
+    import_parser.add_argument('--top', type=int, default=5, help='количество самых медленных модулей в отчете')
+
+    frame_parser = commands.add_parser('first-frame', help='время до первого кадра с фигурой')
+    frame_parser.add_argument('modules', nargs='+', help='модули с классом MainWidget, например lab4')
+    frame_parser.add_argument('--repeat', type=int, default=3)
+
+    args = parser.parse_args()
+
+    match args.command:
+        case 'import':
+            report_import(args.modules, args.top)
+        case 'first-frame':
+            report_first_frame(args.modules, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,9 @@
-import copy
 from enum import Enum, auto
-from typing import Dict
+from typing import Dict, Optional
 
 from PyQt5.QtWidgets import QWidget, QGridLayout, QSizePolicy
 
-from graphics.figures import BaseFigure
+from graphics.figures import AbstractFigure
 from graphics_qt.projections import OrthographicProjection, CentralProjection, Projection
 from graphics.transformation import Transformation
 from widgets.views import FigureProjectionView
@@ -16,11 +15,19 @@ class ProjectionType(Enum):
 
 
 class FigureProjectionsContainer(QWidget):
+    """
+    Четыре проекции одной фигуры.
+
+    Виджеты проекций рисуют общий неизменяемый снимок фигуры, поэтому фигуру
+    можно изменять, не нарушая согласованность проекций, а после изменения
+    показать ее новое состояние вызовом update_figure.
+    """
+
     C = 200
 
     def __init__(
             self,
-            figure: BaseFigure,
+            figure: Optional[AbstractFigure],
             transformaion: Transformation = Transformation(0, 0, 1),
             *args, **kwargs
     ):
@@ -28,11 +35,14 @@ class FigureProjectionsContainer(QWidget):
 
         self.__projections: Dict[ProjectionType, Projection] = {
             ProjectionType.ORTHOGRAPHIC: OrthographicProjection('z', transformaion),
-            ProjectionType.CENTRAL: CentralProjection('z', self.C, copy.deepcopy(transformaion))
+            ProjectionType.CENTRAL: CentralProjection('z', self.C, transformaion.copy())
         }
 
         self.__current_projection_type = ProjectionType.CENTRAL
 
+        self.__figure = figure
+        figure = figure.snapshot() if figure is not None else None
+
         self.__views = [
             FigureProjectionView(figure, OrthographicProjection('z')),
             FigureProjectionView(figure, OrthographicProjection('x')),
@@ -45,6 +55,23 @@ class FigureProjectionsContainer(QWidget):
 
         self.__init_layout()
 
+    @property
+    def figure(self) -> Optional[AbstractFigure]:
+        return self.__figure
+
+    @figure.setter
+    def figure(self, value: Optional[AbstractFigure]):
+        self.__figure = value
+        self.update_figure()
+
+    def update_figure(self) -> None:
+        """Передает виджетам проекций снимок текущего состояния фигуры"""
+
+        snapshot = self.__figure.snapshot() if self.__figure is not None else None
+
+        for view in self.__views:
+            view.figure = snapshot
+
     @property
     def current_projection_type(self) -> ProjectionType:
         return self.__current_projection_type
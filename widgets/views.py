@@ -1,38 +1,128 @@
 from abc import abstractmethod
-from typing import Tuple, Optional
+import time
+from typing import Tuple, Optional, Callable
 
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPen, QPainter
-from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QRectF, QTimer
+from PyQt5.QtGui import QPen, QPainter, QImage, QPixmap
+from PyQt5.QtWidgets import QWidget, QApplication
 
+from graphics.budget import FrameBudget
 from graphics.figures import AbstractFigure
-from graphics.types import Point3D
-from graphics_qt.images import connect_points
-from graphics_qt.images import AbstractFigureImage
+from graphics_qt.images import AbstractFigureImage, Wireframe
 
 from graphics_qt.projections import Projection
+from graphics_qt.rendering import RenderWorker, render_frame
 from graphics.transformation import Transformation
 
 
 class AbstractViewWidget(QWidget):
+    """
+    Виджет, отображающий фигуру с изменяемым преобразованием.
+
+    Пока пользователь вращает или масштабирует фигуру, виджет находится в режиме
+    взаимодействия и может рисовать упрощенное изображение. Через refine_delay_ms
+    миллисекунд после последнего действия виджет один раз перерисовывается в полном качестве.
+    """
+
+    DIRTY_MARGIN = 4
+    """Запас вокруг области фигуры, учитывающий толщину пера и сглаживание"""
+
+    REFINE_DELAY_MS = 250
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__figure_bounds: Optional[QRectF] = None
+
+        self.__is_interacting = False
+        self.__refine_timer = QTimer(self)
+        self.__refine_timer.setSingleShot(True)
+        self.__refine_timer.setInterval(self.REFINE_DELAY_MS)
+        self.__refine_timer.timeout.connect(self.__refine)
+
+    @property
+    def is_interacting(self) -> bool:
+        return self.__is_interacting
+
+    @property
+    def refine_delay_ms(self) -> int:
+        return self.__refine_timer.interval()
+
+    @refine_delay_ms.setter
+    def refine_delay_ms(self, value: int):
+        self.__refine_timer.setInterval(value)
 
     @property
     @abstractmethod
     def _transformation(self) -> Transformation:
         pass
 
+    @property
+    def has_figure(self) -> bool:
+        """Есть ли у виджета изображение фигуры, выводимое при отрисовке"""
+
+        return True
+
+    @property
+    def transformation(self) -> Optional[Transformation]:
+        """Преобразование, изменяемое виджетом. Только для чтения состояния"""
+
+        return self._transformation
+
     def scale_on(self, scale_increase: float):
         if self._transformation.scale + scale_increase > 0:
             self._transformation.scale += scale_increase
-            self.repaint()
+            self.__interact()
 
     def rotate_x(self, rotation_in_degrees: float):
         self._transformation.increase_x_rotation(rotation_in_degrees)
-        self.repaint()
+        self.__interact()
 
     def rotate_y(self, rotation_in_degrees: float):
         self._transformation.increase_y_rotation(rotation_in_degrees)
-        self.repaint()
+        self.__interact()
+
+    def __interact(self):
+        self.__is_interacting = True
+        self.__refine_timer.start()
+        self.redraw()
+
+    def __refine(self):
+        self.__is_interacting = False
+        self._refine()
+
+    def _refine(self):
+        """Перерисовка в полном качестве после окончания взаимодействия"""
+
+        self.update()
+
+    def redraw(self):
+        """
+        Перерисовывает виджет после изменения преобразования.
+        Если известны границы фигуры, перерисовывается только объединение
+        ее предыдущей и новой областей.
+        """
+
+        bounds = self._figure_bounds()
+        previous, self.__figure_bounds = self.__figure_bounds, bounds
+
+        if bounds is None or previous is None:
+            self.update()
+            return
+
+        m = self.DIRTY_MARGIN
+        self.update(
+            bounds.united(previous).toAlignedRect()
+            .translated(self.width() // 2, self.height() // 2)
+            .adjusted(-m, -m, m, m)
+        )
+
+    def _figure_bounds(self) -> Optional[QRectF]:
+        """
+        Оценка области фигуры в системе координат с началом в центре виджета.
+        None, если оценка невозможна.
+        """
+
+        return None
 
     @abstractmethod
     def paintEvent(self, event) -> None:
@@ -47,18 +137,39 @@ class FigureProjectionView(AbstractViewWidget):
     FIGURE_PEN = QPen(Qt.black, 2, Qt.SolidLine)
 
     def __init__(self,
-                 figure: AbstractFigure,
+                 figure: Optional[AbstractFigure],
                  projection: Projection,
                  transformation: Optional[Transformation] = None,
                  show_axis: Optional[Tuple[bool, bool]] = (True, True),
                  *args, **kwargs):
+        """
+        :param figure: Отображаемая фигура. Может быть задана позже, например,
+        после первой отрисовки окна, если ее построение занимает заметное время.
+        """
+
         super().__init__(*args, **kwargs)
 
         self.__figure = figure
+        self.__wireframe = Wireframe(figure) if figure is not None else None
         self.__projection = projection
         self.__transformation = transformation
         self.__painter = QPainter()
         self.__show_axis = show_axis
+        self.__working_space: Optional[QPixmap] = None
+
+    @property
+    def figure(self) -> Optional[AbstractFigure]:
+        return self.__figure
+
+    @figure.setter
+    def figure(self, value: Optional[AbstractFigure]):
+        self.__figure = value
+        self.__wireframe = Wireframe(value) if value is not None else None
+        self.update()
+
+    @property
+    def has_figure(self) -> bool:
+        return self.__wireframe is not None
 
     @property
     def projection(self) -> Projection:
@@ -67,18 +178,19 @@ class FigureProjectionView(AbstractViewWidget):
     @projection.setter
     def projection(self, value: Projection):
         self.__projection = value
-        self.repaint()
+        self.redraw()
 
     def paintEvent(self, event) -> None:
         self.__painter.begin(self)
-        self.__painter.setRenderHint(QPainter.Antialiasing)
-
-        self.__draw_working_space(event)
+        self.__painter.setClipRect(event.rect())
+        self.__painter.drawPixmap(event.rect(), self.__get_working_space(), event.rect())
 
+        self.__painter.setRenderHint(QPainter.Antialiasing, not self.is_interacting)
         self.__painter.translate(self.width() // 2, self.height() // 2)
 
-        self.__painter.setPen(self.FIGURE_PEN)
-        self.__draw_figure_with_projection()
+        if self.__wireframe is not None:
+            self.__painter.setPen(self.FIGURE_PEN)
+            self.__draw_figure_with_projection()
 
         self.__painter.end()
 
@@ -86,41 +198,54 @@ class FigureProjectionView(AbstractViewWidget):
     def _transformation(self) -> Transformation:
         return self.__transformation
 
+    def _figure_bounds(self) -> Optional[QRectF]:
+        if self.__wireframe is None:
+            return None
+
+        return self.__wireframe.bounds(self.__projection, self._transformation)
+
     def __draw_figure_with_projection(self) -> None:
         """
         Отрисовывает трехмерную фигуру на плоскости с учетом проекции.
         """
-        def proxy_point(point: Point3D):
-            if self._transformation is None:
-                return point
-            else:
-                return self._transformation(point)
 
-        for polygon in self.__figure.polygons:
+        self.__wireframe.draw(self.__painter, self.__projection, self._transformation)
+
+    def __get_working_space(self) -> QPixmap:
+        """
+        Возвращает изображение рабочей области(границ и осей).
+        Изображение создается заново только при изменении размеров виджета.
+        """
 
-            connect_points([
-                self.__projection(proxy_point(point))
-                for point in polygon.points
-            ], self.__painter)
+        if self.__working_space is None or self.__working_space.size() != self.size():
+            self.__working_space = QPixmap(self.size())
+            self.__working_space.fill(Qt.transparent)
 
-    def __draw_working_space(self, event):
+            painter = QPainter(self.__working_space)
+            painter.setRenderHint(QPainter.Antialiasing)
+            self.__draw_working_space(painter)
+            painter.end()
+
+        return self.__working_space
+
+    def __draw_working_space(self, painter: QPainter):
         """Выполняет отрисовку рабочей области(границ и осей)"""
 
-        self.__painter.setPen(self.BORDER_PEN)
-        self.__painter.drawRect(event.rect())
+        painter.setPen(self.BORDER_PEN)
+        painter.drawRect(self.rect())
 
-        self.__painter.setPen(self.AXIS_PEN)
+        painter.setPen(self.AXIS_PEN)
         if self.__show_axis[0]:
             height_half = self.height() // 2
 
-            self.__painter.drawLine(
+            painter.drawLine(
                 0, height_half,
                 self.width(), height_half
             )
 
         if self.__show_axis[1]:
             width_half = self.width() // 2
-            self.__painter.drawLine(
+            painter.drawLine(
                 width_half, 0,
                 width_half, self.height()
             )
@@ -129,20 +254,128 @@ class FigureProjectionView(AbstractViewWidget):
 class FigureImageView(AbstractViewWidget):
     """Виджет отрисовывающий образ фигуры"""
 
-    def __init__(self, image: AbstractFigureImage, *args, **kwargs):
+    def __init__(self, image: AbstractFigureImage, budget: Optional[FrameBudget] = None, *args, **kwargs):
+        """
+        :param budget: Регулятор качества. Если задан, при превышении бюджета времени
+        образ рисуется без сглаживания и в уменьшенное изображение, растягиваемое на виджет.
+        """
+
         super().__init__(*args, **kwargs)
         self.__image = image
+        self.__budget = budget
         self.__painter = QPainter()
+        self.__frame: Optional[QImage] = None
+
+    @property
+    def budget(self) -> Optional[FrameBudget]:
+        return self.__budget
 
     def paintEvent(self, event) -> None:
+        self.__image.draft = self.is_interacting
+        budget = self.__budget
+
+        if budget is None:
+            self.__draw(not self.is_interacting)
+            return
+
+        started_at = time.perf_counter()
+        self.__draw(budget.antialiasing and not self.is_interacting, budget.resolution_scale)
+        budget.record(time.perf_counter() - started_at)
+
+    def __draw(self, antialiasing: bool, resolution_scale: float = 1) -> None:
         self.__painter.begin(self)
-        self.__painter.setRenderHint(QPainter.Antialiasing)
-        self.__painter.translate(self.width() // 2, self.height() // 2)
 
-        self.__image.draw(self.__painter)
+        if resolution_scale < 1:
+            self.__frame = render_frame(
+                self.__image, self.width(), self.height(),
+                resolution_scale, antialiasing, self.__frame
+            )
+            self.__painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            self.__painter.drawImage(self.rect(), self.__frame)
+        else:
+            self.__frame = None
+            self.__painter.setRenderHint(QPainter.Antialiasing, antialiasing)
+            self.__painter.translate(self.width() // 2, self.height() // 2)
+            self.__image.draw(self.__painter)
 
         self.__painter.end()
 
     @property
     def _transformation(self) -> Transformation:
         return self.__image.transformation
+
+    def _figure_bounds(self) -> Optional[QRectF]:
+        return self.__image.bounds()
+
+
+class AsyncFigureImageView(AbstractViewWidget):
+    """
+    Виджет отрисовывающий образ фигуры в отдельном потоке.
+    В потоке интерфейса выполняется только вывод готового кадра.
+    """
+
+    def __init__(self,
+                 image_factory: Callable[[Transformation], AbstractFigureImage],
+                 transformation: Transformation,
+                 budget: Optional[FrameBudget] = None,
+                 *args, **kwargs):
+        """
+        :param image_factory: Функция, создающая образ фигуры с заданным преобразованием.
+        Вызывается в потоке отрисовки, созданный образ используется только им.
+        :param transformation: Преобразование, изменяемое виджетом.
+        :param budget: Регулятор качества, используемый потоком отрисовки.
+        Кадры, отрисованные в уменьшенном разрешении, растягиваются на весь виджет.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        self.__transformation = transformation
+        self.__frame: Optional[QImage] = None
+        self.__painter = QPainter()
+
+        # Поток принадлежит виджету и останавливается до его удаления:
+        # уничтожение работающего QThread аварийно завершает приложение
+        self.__worker = RenderWorker(lambda: image_factory(Transformation(0, 0, 1)), budget, parent=self)
+        self.__worker.frame_ready.connect(self.__on_frame_ready)
+        self.destroyed.connect(self.__worker.stop)
+        self.__worker.start()
+
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.__worker.stop)
+
+    @property
+    def has_figure(self) -> bool:
+        return self.__frame is not None
+
+    def redraw(self):
+        self.__worker.request(self.__transformation, self.width(), self.height(), self.is_interacting)
+
+    def _refine(self):
+        self.redraw()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self.redraw()
+
+    def paintEvent(self, event) -> None:
+        if self.__frame is None:
+            return
+
+        self.__painter.begin(self)
+
+        if self.__frame.size() == self.size():
+            self.__painter.drawImage(0, 0, self.__frame)
+        else:
+            self.__painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            self.__painter.drawImage(self.rect(), self.__frame)
+
+        self.__painter.end()
+
+    def __on_frame_ready(self, frame: QImage) -> None:
+        self.__frame = frame
+        self.update()
+
+    @property
+    def _transformation(self) -> Transformation:
+        return self.__transformation